@@ -0,0 +1,11 @@
+from .schemas import (
+    RouteRequest, RouteResponse, ViaCheckRequest, ViaCheckResponse,
+    TraceRequest, TraceResponse, TraceInfo,
+    AutoRouteRequest, AutoRouteSegmentResponse, AutoRouteViaResponse, AutoRouteResponse
+)
+
+__all__ = [
+    "RouteRequest", "RouteResponse", "ViaCheckRequest", "ViaCheckResponse",
+    "TraceRequest", "TraceResponse", "TraceInfo",
+    "AutoRouteRequest", "AutoRouteSegmentResponse", "AutoRouteViaResponse", "AutoRouteResponse"
+]
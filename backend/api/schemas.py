@@ -0,0 +1,95 @@
+"""Request and response models for the PCB viewer API."""
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class RouteRequest(BaseModel):
+    """Request model for trace routing."""
+    start_x: float
+    start_y: float
+    end_x: float
+    end_y: float
+    layer: str
+    width: float
+    net_id: Optional[int] = None
+    skip_endpoint_check: bool = False  # Skip endpoint net validation
+
+
+class RouteResponse(BaseModel):
+    """Response model for trace routing."""
+    success: bool
+    path: list[list[float]]
+    message: str = ""
+
+
+class ViaCheckRequest(BaseModel):
+    """Request model for via placement validation."""
+    x: float
+    y: float
+    size: float = 0.8  # Default via outer diameter
+    drill: float = 0.4  # Default drill size
+    net_id: Optional[int] = None  # Net ID to allow crossing
+
+
+class ViaCheckResponse(BaseModel):
+    """Response model for via validation."""
+    valid: bool
+    message: str = ""
+
+
+class TraceRequest(BaseModel):
+    """Request model for registering a user trace."""
+    id: str
+    segments: list[list[float]]  # List of [x, y] points
+    width: float
+    layer: str
+    net_id: Optional[int] = None
+
+
+class TraceResponse(BaseModel):
+    """Response model for trace operations."""
+    success: bool
+    message: str = ""
+
+
+class TraceInfo(BaseModel):
+    """Info model for a single trace."""
+    id: str
+    layer: str
+    width: float
+    net_id: Optional[int]
+    segment_count: int
+
+
+class AutoRouteRequest(BaseModel):
+    """Request model for auto-routing with via placement."""
+    start_x: float
+    start_y: float
+    end_x: float
+    end_y: float
+    preferred_layer: str
+    width: float
+    net_id: Optional[int] = None
+    via_size: float = 0.8
+
+
+class AutoRouteSegmentResponse(BaseModel):
+    """A single segment in an auto-route response."""
+    path: list[list[float]]
+    layer: str
+
+
+class AutoRouteViaResponse(BaseModel):
+    """A via in an auto-route response."""
+    x: float
+    y: float
+    size: float
+
+
+class AutoRouteResponse(BaseModel):
+    """Response model for auto-routing."""
+    success: bool
+    segments: list[AutoRouteSegmentResponse]
+    vias: list[AutoRouteViaResponse]
+    message: str = ""
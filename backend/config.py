@@ -8,6 +8,9 @@ PROJECT_ROOT = Path(__file__).parent.parent
 # Default PCB file
 DEFAULT_PCB_FILE = PROJECT_ROOT / "BLDriver.kicad_pcb"
 
+# Pickled parser state, keyed by PCB file contents
+PARSER_CACHE_DIR = Path.home() / ".cache" / "semiroute"
+
 # Frontend static files directory
 FRONTEND_DIR = PROJECT_ROOT / "frontend"
 
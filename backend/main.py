@@ -7,110 +7,26 @@ from fastapi.staticfiles import StaticFiles
 from kiutils.board import Board
 from kiutils.items.brditems import Segment
 from kiutils.items.common import Position
-from pydantic import BaseModel
-from typing import Optional
 
-from .config import DEFAULT_PCB_FILE, DEFAULT_PORT, FRONTEND_DIR, PROJECT_ROOT
+from .api.schemas import (
+    RouteRequest, RouteResponse, ViaCheckRequest, ViaCheckResponse,
+    TraceRequest, TraceResponse, TraceInfo,
+    AutoRouteRequest, AutoRouteSegmentResponse, AutoRouteViaResponse, AutoRouteResponse
+)
+from .config import DEFAULT_PCB_FILE, DEFAULT_PORT, FRONTEND_DIR, PARSER_CACHE_DIR, PROJECT_ROOT
 from .pcb import PCBParser
+from .pcb.trace_path import build_connected_path
 from .svg import SVGGenerator
 from .routing import TraceRouter, AutoRouter
+from .routing.hulls import warm_up_contacts_kernel
+from .routing.pathfinding import warm_up_kernel
 
 app = FastAPI(title="SemiRouter PCB Viewer", version="0.1.0")
 
-
-class RouteRequest(BaseModel):
-    """Request model for trace routing."""
-    start_x: float
-    start_y: float
-    end_x: float
-    end_y: float
-    layer: str
-    width: float
-    net_id: Optional[int] = None
-    skip_endpoint_check: bool = False  # Skip endpoint net validation
-
-
-class RouteResponse(BaseModel):
-    """Response model for trace routing."""
-    success: bool
-    path: list[list[float]]
-    message: str = ""
-
-
-class ViaCheckRequest(BaseModel):
-    """Request model for via placement validation."""
-    x: float
-    y: float
-    size: float = 0.8  # Default via outer diameter
-    drill: float = 0.4  # Default drill size
-    net_id: Optional[int] = None  # Net ID to allow crossing
-
-
-class ViaCheckResponse(BaseModel):
-    """Response model for via validation."""
-    valid: bool
-    message: str = ""
-
-
-class TraceRequest(BaseModel):
-    """Request model for registering a user trace."""
-    id: str
-    segments: list[list[float]]  # List of [x, y] points
-    width: float
-    layer: str
-    net_id: Optional[int] = None
-
-
-class TraceResponse(BaseModel):
-    """Response model for trace operations."""
-    success: bool
-    message: str = ""
-
-
-class TraceInfo(BaseModel):
-    """Info model for a single trace."""
-    id: str
-    layer: str
-    width: float
-    net_id: Optional[int]
-    segment_count: int
-
-
-class AutoRouteRequest(BaseModel):
-    """Request model for auto-routing with via placement."""
-    start_x: float
-    start_y: float
-    end_x: float
-    end_y: float
-    preferred_layer: str
-    width: float
-    net_id: Optional[int] = None
-    via_size: float = 0.8
-
-
-class AutoRouteSegmentResponse(BaseModel):
-    """A single segment in an auto-route response."""
-    path: list[list[float]]
-    layer: str
-
-
-class AutoRouteViaResponse(BaseModel):
-    """A via in an auto-route response."""
-    x: float
-    y: float
-    size: float
-
-
-class AutoRouteResponse(BaseModel):
-    """Response model for auto-routing."""
-    success: bool
-    segments: list[AutoRouteSegmentResponse]
-    vias: list[AutoRouteViaResponse]
-    message: str = ""
-
-
 # Load PCB once at startup
-pcb_parser = PCBParser(DEFAULT_PCB_FILE)
+pcb_parser = PCBParser(DEFAULT_PCB_FILE, cache_dir=PARSER_CACHE_DIR)
+# Index trace endpoints for every net up front so trace-path requests are cache hits
+pcb_parser.build_all_layer_indexes()
 svg_generator = SVGGenerator(pcb_parser)
 
 # Create router with cached obstacle maps at startup
@@ -122,10 +38,14 @@ trace_router = TraceRouter(
     pending_traces_file=PROJECT_ROOT / "pending_traces.json"
 )
 
-# Pre-expand blocked cells for common trace widths to avoid slow first request
+# Pre-expand blocked grids for common trace widths to avoid slow first request
 # 0.125mm radius = 0.25mm trace width (most common)
 for obs_map in trace_router._obstacle_cache.values():
-    obs_map.get_expanded_blocked(0.125)
+    obs_map.get_expanded_columns(0.125)
+
+# Compile (or load from cache) the A* and hull contacts kernels before the first request
+warm_up_kernel()
+warm_up_contacts_kernel()
 
 # Create auto-router using the trace router
 auto_router = AutoRouter(trace_router)
@@ -239,6 +159,11 @@ async def route_trace(request: RouteRequest):
     The routing respects clearances to obstacles and only moves in
     0°, 45°, 90°, 135°, 180°, 225°, 270°, 315° directions.
     """
+    return _route_trace(request)
+
+
+def _route_trace(request: RouteRequest) -> RouteResponse:
+    """Body of route_trace; it never awaits, so tests call it directly."""
     # Try to find net ID at start point if not provided
     net_id = request.net_id
     if net_id is None:
@@ -425,116 +350,26 @@ async def get_trace_path(
     starting from the nearest point to (x, y).
     """
     # Get all traces on this net and layer
-    traces = [t for t in pcb_parser.get_traces_by_layer(layer) if t.net_id == net_id]
+    endpoint_index = pcb_parser.get_trace_endpoint_index(layer, net_id)
+    traces = endpoint_index.table.traces
 
     if not traces:
         return {"success": False, "path": [], "width": 0.25, "message": "No traces found"}
 
     # Find the trace segment closest to the starting point
-    best_trace = None
-    best_dist = float('inf')
-
-    for trace in traces:
-        # Check distance to both endpoints
-        dist_start = ((trace.start_x - x) ** 2 + (trace.start_y - y) ** 2) ** 0.5
-        dist_end = ((trace.end_x - x) ** 2 + (trace.end_y - y) ** 2) ** 0.5
-        min_dist = min(dist_start, dist_end)
-
-        if min_dist < best_dist:
-            best_dist = min_dist
-            best_trace = trace
+    best_trace, _ = endpoint_index.closest(x, y)
 
     if not best_trace:
         return {"success": False, "path": [], "width": 0.25, "message": "No trace found near point"}
 
     # Build connected path starting from best_trace
-    path = []
-    visited = set()
-    width = best_trace.width
-
-    def add_trace_to_path(trace, start_from_start=True):
-        """Add trace segment to path, avoiding duplicates."""
-        trace_id = id(trace)
-        if trace_id in visited:
-            return
-        visited.add(trace_id)
-
-        if start_from_start:
-            if not path or (path[-1][0] != trace.start_x or path[-1][1] != trace.start_y):
-                path.append([trace.start_x, trace.start_y])
-            path.append([trace.end_x, trace.end_y])
-        else:
-            if not path or (path[-1][0] != trace.end_x or path[-1][1] != trace.end_y):
-                path.append([trace.end_x, trace.end_y])
-            path.append([trace.start_x, trace.start_y])
-
-    def find_connected_traces(end_x, end_y, tolerance=0.01):
-        """Find traces that connect to the given endpoint."""
-        connected = []
-        for trace in traces:
-            if id(trace) in visited:
-                continue
-            # Check if trace starts or ends at this point
-            if abs(trace.start_x - end_x) < tolerance and abs(trace.start_y - end_y) < tolerance:
-                connected.append((trace, True))  # Start from start
-            elif abs(trace.end_x - end_x) < tolerance and abs(trace.end_y - end_y) < tolerance:
-                connected.append((trace, False))  # Start from end
-        return connected
-
-    # Start with the best trace
-    add_trace_to_path(best_trace, True)
-
-    # Walk forward from end
-    current_x, current_y = best_trace.end_x, best_trace.end_y
-    while True:
-        connected = find_connected_traces(current_x, current_y)
-        if not connected:
-            break
-        next_trace, from_start = connected[0]
-        add_trace_to_path(next_trace, from_start)
-        if from_start:
-            current_x, current_y = next_trace.end_x, next_trace.end_y
-        else:
-            current_x, current_y = next_trace.start_x, next_trace.start_y
-
-    # Walk backward from start (prepend to path)
-    visited.clear()
-    visited.add(id(best_trace))
-    backward_path = []
-
-    current_x, current_y = best_trace.start_x, best_trace.start_y
-    while True:
-        connected = find_connected_traces(current_x, current_y)
-        if not connected:
-            break
-        next_trace, from_start = connected[0]
-        visited.add(id(next_trace))
-        if from_start:
-            backward_path.insert(0, [next_trace.start_x, next_trace.start_y])
-            current_x, current_y = next_trace.start_x, next_trace.start_y
-            # Actually we need the other end
-            backward_path.insert(0, [next_trace.end_x, next_trace.end_y])
-            current_x, current_y = next_trace.end_x, next_trace.end_y
-        else:
-            backward_path.insert(0, [next_trace.end_x, next_trace.end_y])
-            current_x, current_y = next_trace.end_x, next_trace.end_y
-            backward_path.insert(0, [next_trace.start_x, next_trace.start_y])
-            current_x, current_y = next_trace.start_x, next_trace.start_y
-
-    # Combine backward and forward paths
-    full_path = backward_path + path
-
-    # Remove duplicate consecutive points
-    cleaned_path = []
-    for point in full_path:
-        if not cleaned_path or cleaned_path[-1] != point:
-            cleaned_path.append(point)
+    path = build_connected_path(endpoint_index, best_trace)
 
     return {
         "success": True,
-        "path": cleaned_path,
-        "width": width,
-        "message": f"Found path with {len(cleaned_path)} points"
+        "path": path,
+        "width": best_trace.width,
+        "message": f"Found path with {len(path)} points"
     }
 
 
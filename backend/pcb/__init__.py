@@ -1,10 +1,10 @@
 from .parser import PCBParser
 from .models import (
-    PadInfo, FootprintInfo, BoardInfo,
+    PadInfo, PadTable, FootprintInfo, BoardInfo, TraceInfo, TraceTable,
     GraphicLine, GraphicArc, GraphicRect, GraphicCircle, GraphicPoly
 )
 
 __all__ = [
-    "PCBParser", "PadInfo", "FootprintInfo", "BoardInfo",
+    "PCBParser", "PadInfo", "PadTable", "FootprintInfo", "BoardInfo", "TraceInfo", "TraceTable",
     "GraphicLine", "GraphicArc", "GraphicRect", "GraphicCircle", "GraphicPoly"
 ]
@@ -1,9 +1,11 @@
 """Data models for PCB elements."""
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterator, Optional
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class PadInfo:
     """Information about a single pad."""
     name: str  # Pad number/name (e.g., "1", "2", "A1")
@@ -26,6 +28,46 @@ class PadInfo:
         return f"{self.footprint_ref}_{self.name}"
 
 
+@dataclass
+class PadTable:
+    """
+    Column-oriented (structure of arrays) view of pads.
+
+    Row i of every column describes pads[i]. Bit k of layer_mask is set
+    when the pad is on layers[k].
+    """
+    pads: list[PadInfo]
+    layers: tuple[str, ...]
+    x: np.ndarray  # float64
+    y: np.ndarray  # float64
+    net_id: np.ndarray  # int32
+    layer_mask: np.ndarray  # int64
+
+    @classmethod
+    def from_pads(cls, pads: list[PadInfo], layers: list[str]) -> "PadTable":
+        """Build a table from a list of pads, with one mask bit per layer."""
+        n = len(pads)
+        bits = {layer: 1 << i for i, layer in enumerate(layers)}
+        return cls(
+            pads=list(pads),
+            layers=tuple(layers),
+            x=np.fromiter((p.x for p in pads), dtype=np.float64, count=n),
+            y=np.fromiter((p.y for p in pads), dtype=np.float64, count=n),
+            net_id=np.fromiter((p.net_id for p in pads), dtype=np.int32, count=n),
+            layer_mask=np.fromiter(
+                (sum(bits.get(layer, 0) for layer in set(p.layers)) for p in pads),
+                dtype=np.int64, count=n
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.pads)
+
+    def layer_bit(self, layer: str) -> int:
+        """Mask bit of a layer (0 for layers the table does not track)."""
+        return 1 << self.layers.index(layer) if layer in self.layers else 0
+
+
 @dataclass
 class FootprintInfo:
     """Information about a footprint."""
@@ -94,7 +136,7 @@ class GraphicPoly:
     fill: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class TraceInfo:
     """A copper trace segment."""
     start_x: float
@@ -108,6 +150,62 @@ class TraceInfo:
 
 
 @dataclass
+class TraceTable:
+    """
+    Column-oriented (structure of arrays) view of trace segments.
+
+    Row i of every column describes traces[i]. Used by hot paths that scan
+    many traces at once; the TraceInfo records stay available for callers
+    that need objects.
+    """
+    traces: list[TraceInfo]
+    start_x: np.ndarray  # float64
+    start_y: np.ndarray  # float64
+    end_x: np.ndarray  # float64
+    end_y: np.ndarray  # float64
+    width: np.ndarray  # float64
+    net_id: np.ndarray  # int32
+
+    @classmethod
+    def from_traces(cls, traces: list[TraceInfo]) -> "TraceTable":
+        """Build a table from a list of TraceInfo-like objects."""
+        n = len(traces)
+
+        def column(attr: str, dtype) -> np.ndarray:
+            return np.fromiter((getattr(t, attr) for t in traces), dtype=dtype, count=n)
+
+        return cls(
+            traces=list(traces),
+            start_x=column('start_x', np.float64),
+            start_y=column('start_y', np.float64),
+            end_x=column('end_x', np.float64),
+            end_y=column('end_y', np.float64),
+            width=column('width', np.float64),
+            net_id=column('net_id', np.int32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.traces)
+
+    def select(self, rows: np.ndarray) -> "TraceTable":
+        """Sub-table for a boolean mask or an index array."""
+        indices = np.flatnonzero(rows) if rows.dtype == np.bool_ else rows
+        return TraceTable(
+            traces=[self.traces[i] for i in indices],
+            start_x=self.start_x[indices],
+            start_y=self.start_y[indices],
+            end_x=self.end_x[indices],
+            end_y=self.end_y[indices],
+            width=self.width[indices],
+            net_id=self.net_id[indices],
+        )
+
+    def iter_records(self) -> Iterator[TraceInfo]:
+        """Iterate over the underlying TraceInfo records."""
+        return iter(self.traces)
+
+
+@dataclass(slots=True)
 class ViaInfo:
     """A via connecting copper layers."""
     x: float
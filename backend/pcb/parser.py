@@ -1,16 +1,24 @@
 """KiCad PCB file parser using kiutils."""
+import hashlib
 import math
+import os
+import pickle
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
+import numpy as np
 from kiutils.board import Board
+from scipy.spatial import cKDTree
 
 from .models import (
     BoardInfo, FootprintInfo, GraphicArc, GraphicLine,
-    GraphicRect, GraphicCircle, GraphicPoly, PadInfo,
-    TraceInfo, ViaInfo
+    GraphicRect, GraphicCircle, GraphicPoly, PadInfo, PadTable,
+    TraceInfo, TraceTable, ViaInfo
 )
-from .transform import transform_pad_position, rotate_point
+from .trace_path import TraceEndpointIndex
+from .transform import pad_visual_angle, rotate_point, transform_pad_positions
 
 # Type alias for all graphic types
 GraphicItem = Union[GraphicLine, GraphicArc, GraphicRect, GraphicCircle, GraphicPoly]
@@ -30,27 +38,102 @@ class PCBParser:
         "F.SilkS", "F.Fab", "F.CrtYd",
     ]
 
-    def __init__(self, pcb_path: str | Path):
-        """Load and parse a KiCad PCB file."""
+    # Bump when the parsed attributes change, so on-disk caches are rebuilt
+    CACHE_VERSION = 2
+
+    def __init__(self, pcb_path: str | Path, cache_dir: Optional[Path] = None):
+        """
+        Load and parse a KiCad PCB file.
+
+        Args:
+            pcb_path: Path to the .kicad_pcb file
+            cache_dir: Optional directory for a pickled copy of the parsed
+                board, keyed by a hash of the file contents and CACHE_VERSION.
+                Later loads of the same file skip parsing.
+        """
         self.pcb_path = Path(pcb_path)
+
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = self._cache_path(Path(cache_dir))
+            if self._load_cache(cache_path):
+                return
+
+        self._parse()
+
+        if cache_path is not None:
+            self._save_cache(cache_path)
+
+    def _cache_path(self, cache_dir: Path) -> Path:
+        """Cache file for the current contents of pcb_path."""
+        digest = hashlib.blake2b(self.pcb_path.read_bytes(), digest_size=16).hexdigest()
+        return cache_dir / f"{digest}-v{self.CACHE_VERSION}.pkl"
+
+    def _load_cache(self, cache_path: Path) -> bool:
+        """Restore the parsed state from cache_path; False if unavailable."""
+        try:
+            with open(cache_path, "rb") as f:
+                state = pickle.load(f)
+        except Exception:
+            return False  # Missing or unreadable: parse instead
+        # Keep the path this parser was opened with (the cache is by content)
+        state["pcb_path"] = self.pcb_path
+        self.__dict__.update(state)
+        return True
+
+    def _save_cache(self, cache_path: Path) -> None:
+        """Write the parsed state to cache_path (best effort)."""
+        tmp_path = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # A temp file unique to this process, so parallel test workers
+            # building the same cache never write to or rename each other's file
+            fd, tmp_path = tempfile.mkstemp(
+                dir=cache_path.parent, prefix=f"{cache_path.stem}-", suffix=".tmp"
+            )
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(self.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            # Don't fail if we can't cache
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def _parse(self) -> None:
+        """Parse the board file and build the lookup tables."""
         self.board = Board.from_file(str(self.pcb_path))
 
-        # Build net lookup
+        # Build net lookups (by ID, and by name with the first ID winning)
         self._net_names: dict[int, str] = {}
+        self._net_ids: dict[str, int] = {}
         for net in self.board.nets:
             self._net_names[net.number] = net.name
+            self._net_ids.setdefault(net.name, net.number)
 
         # Parse elements
         self._footprints: list[FootprintInfo] = []
         self._pads: list[PadInfo] = []
         self._graphics: dict[str, list[GraphicItem]] = {layer: [] for layer in self.ALL_LAYERS}
         self._net_to_pads: dict[int, list[PadInfo]] = {}
+        self._ref_to_pads: dict[str, list[PadInfo]] = {}
+        self._layer_to_pads: dict[str, list[PadInfo]] = {layer: [] for layer in self.COPPER_LAYERS}
         self._traces: dict[str, list[TraceInfo]] = {layer: [] for layer in self.COPPER_LAYERS}
         self._vias: list[ViaInfo] = []
 
         self._parse_footprints()
+        self._pad_table = PadTable.from_pads(self._pads, self.COPPER_LAYERS)
         self._parse_board_graphics()
         self._parse_traces_and_vias()
+        self._trace_tables: dict[str, TraceTable] = {
+            layer: TraceTable.from_traces(traces) for layer, traces in self._traces.items()
+        }
+        self._trace_net_groups: dict[str, dict[int, np.ndarray]] = {}
+        self._trace_endpoint_indexes: dict[tuple[str, int], TraceEndpointIndex] = {}
+        self._pad_trees: dict[str, cKDTree] = {}
+        self._via_tree: Optional[cKDTree] = None
         self._calculate_bounds()
 
     def _expand_layers(self, layers: list[str]) -> list[str]:
@@ -90,17 +173,15 @@ class PCBParser:
                 pads=[]
             )
 
+            # Transform all pad offsets to absolute positions in one pass
+            pad_positions = transform_pad_positions(
+                [(pad.position.X, pad.position.Y) for pad in fp.pads],
+                fp_x, fp_y, fp_angle
+            ).tolist()
+
             # Process pads
-            for pad in fp.pads:
-                pad_x = pad.position.X
-                pad_y = pad.position.Y
-                pad_angle = pad.position.angle or 0.0
-
-                # Transform to absolute position
-                abs_x, abs_y, total_angle = transform_pad_position(
-                    pad_x, pad_y, pad_angle,
-                    fp_x, fp_y, fp_angle
-                )
+            for pad, (abs_x, abs_y) in zip(fp.pads, pad_positions):
+                total_angle = pad_visual_angle(pad.position.angle or 0.0)
 
                 # Get pad size
                 width = pad.size.X
@@ -150,6 +231,13 @@ class PCBParser:
                     self._net_to_pads[net_id] = []
                 self._net_to_pads[net_id].append(pad_info)
 
+                # Add to footprint reference mapping
+                self._ref_to_pads.setdefault(reference, []).append(pad_info)
+
+                # Add to layer mapping (dict.fromkeys drops duplicate layers)
+                for layer in dict.fromkeys(layers):
+                    self._layer_to_pads.setdefault(layer, []).append(pad_info)
+
             # Parse footprint graphics
             self._parse_footprint_graphics(fp, fp_x, fp_y, fp_angle)
 
@@ -212,7 +300,7 @@ class PCBParser:
             elif item_type == 'FpCircle':
                 center_rx, center_ry = rotate_point(item.center.X, item.center.Y, -fp_angle)
                 # Calculate radius from center to end point
-                radius = math.sqrt((item.end.X - item.center.X)**2 + (item.end.Y - item.center.Y)**2)
+                radius = math.hypot(item.end.X - item.center.X, item.end.Y - item.center.Y)
                 self._graphics[layer].append(GraphicCircle(
                     center_x=fp_x + center_rx,
                     center_y=fp_y + center_ry,
@@ -380,13 +468,95 @@ class PCBParser:
         """Get net ID to name mapping."""
         return self._net_names
 
+    def get_net_id(self, net_name: str) -> Optional[int]:
+        """Get the ID of a net by name, or None if there is no such net."""
+        return self._net_ids.get(net_name)
+
     def get_pads_by_net(self, net_id: int) -> list[PadInfo]:
         """Get all pads belonging to a net."""
         return self._net_to_pads.get(net_id, [])
 
     def get_pads_by_layer(self, layer: str) -> list[PadInfo]:
-        """Get all pads on a specific layer."""
-        return [p for p in self._pads if layer in p.layers]
+        """Get all pads on a specific layer (a new list on each call)."""
+        return list(self._layer_to_pads.get(layer, ()))
+
+    def get_pads_by_footprint_ref(self, reference: str) -> list[PadInfo]:
+        """Get all pads of the footprint(s) with a reference designator (a new list on each call)."""
+        return list(self._ref_to_pads.get(reference, ()))
+
+    def get_pad_table(self) -> PadTable:
+        """Get all pads as a column-oriented PadTable (rows in board order)."""
+        return self._pad_table
+
+    def select_pads(
+        self,
+        layer: Optional[str] = None,
+        connected: bool = False
+    ) -> np.ndarray:
+        """
+        Row indices into get_pad_table() of the pads matching all filters.
+
+        Args:
+            layer: Only pads on this copper layer
+            connected: Only pads with a net (net_id > 0)
+        """
+        table = self._pad_table
+        rows = np.ones(len(table), dtype=bool)
+        if layer is not None:
+            rows &= (table.layer_mask & table.layer_bit(layer)) != 0
+        if connected:
+            rows &= table.net_id > 0
+        return np.flatnonzero(rows)
+
+    def get_pads_near(self, x: float, y: float, layer: str, radius: float) -> list[PadInfo]:
+        """
+        Get pads on a layer whose centers lie within radius of (x, y).
+
+        Candidates come from a KD-tree over the layer's pad centers (built
+        on first use); membership is then decided with the same squared
+        distance test as a linear scan. Pads are returned in board order.
+        """
+        pads = self._layer_to_pads.get(layer)
+        if not pads:
+            return []
+        tree = self._pad_trees.get(layer)
+        if tree is None:
+            tree = cKDTree([(pad.x, pad.y) for pad in pads])
+            self._pad_trees[layer] = tree
+
+        # Widen the ball slightly so rounding never drops a boundary pad
+        rows = tree.query_ball_point((x, y), radius * (1 + 1e-9) + 1e-12)
+        radius_sq = radius * radius
+        near = []
+        for row in sorted(rows):
+            pad = pads[row]
+            dx, dy = pad.x - x, pad.y - y
+            if dx * dx + dy * dy <= radius_sq:
+                near.append(pad)
+        return near
+
+    def get_vias_near(self, x: float, y: float, radius: float) -> list[ViaInfo]:
+        """
+        Get vias whose centers lie within radius of (x, y).
+
+        Like get_pads_near, over a KD-tree of all via centers (vias span
+        every layer). Vias are returned in board order.
+        """
+        vias = self._vias
+        if not vias:
+            return []
+        if self._via_tree is None:
+            self._via_tree = cKDTree([(via.x, via.y) for via in vias])
+
+        rows = self._via_tree.query_ball_point((x, y), radius * (1 + 1e-9) + 1e-12)
+        radius_sq = radius * radius
+        near = []
+        for row in sorted(rows):
+            via = vias[row]
+            dx, dy = via.x - x, via.y - y
+            if dx * dx + dy * dy <= radius_sq:
+                near.append(via)
+        return near
 
     @property
     def traces(self) -> dict[str, list[TraceInfo]]:
@@ -397,6 +567,59 @@ class PCBParser:
         """Get traces for a specific layer."""
         return self._traces.get(layer, [])
 
+    def get_trace_table(self, layer: str) -> TraceTable:
+        """Get traces for a specific layer as a column-oriented TraceTable."""
+        table = self._trace_tables.get(layer)
+        if table is None:
+            table = TraceTable.from_traces([])
+        return table
+
+    def group_traces_by_net(self, layer: str) -> dict[int, np.ndarray]:
+        """
+        Group a layer's traces by net.
+
+        Returns a mapping of net ID to row indices into get_trace_table(layer).
+        Built once per layer with a stable argsort, so indices within each
+        group stay in board order.
+        """
+        groups = self._trace_net_groups.get(layer)
+        if groups is None:
+            net_ids = self.get_trace_table(layer).net_id
+            order = np.argsort(net_ids, kind='stable')
+            uniq, starts = np.unique(net_ids[order], return_index=True)
+            groups = {
+                int(net): rows
+                for net, rows in zip(uniq, np.split(order, starts[1:]))
+            }
+            self._trace_net_groups[layer] = groups
+        return groups
+
+    def get_trace_endpoint_index(self, layer: str, net_id: int) -> TraceEndpointIndex:
+        """Get a cached endpoint KD-tree for one net's traces on a layer."""
+        key = (layer, net_id)
+        index = self._trace_endpoint_indexes.get(key)
+        if index is None:
+            rows = self.group_traces_by_net(layer).get(net_id, np.empty(0, dtype=np.intp))
+            index = TraceEndpointIndex(self.get_trace_table(layer).select(rows))
+            self._trace_endpoint_indexes[key] = index
+        return index
+
+    def build_all_layer_indexes(self, n_workers: Optional[int] = None) -> None:
+        """
+        Build the endpoint index of every net on every copper layer.
+
+        Layers are independent, so each one is built on its own worker
+        thread (the KD-tree construction releases the GIL). Afterwards
+        get_trace_endpoint_index is a pure cache hit.
+        """
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            list(pool.map(self._build_layer_indexes, self.COPPER_LAYERS))
+
+    def _build_layer_indexes(self, layer: str) -> None:
+        """Build the endpoint indexes for all nets on one layer."""
+        for net_id in self.group_traces_by_net(layer):
+            self.get_trace_endpoint_index(layer, net_id)
+
     @property
     def vias(self) -> list[ViaInfo]:
         """Get all vias."""
@@ -0,0 +1,188 @@
+"""Trace path reconstruction helpers."""
+import math
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .models import TraceInfo, TraceTable
+
+# KiCad stores coordinates as integer nanometers; snapping back to that grid
+# makes endpoint matching exact integer arithmetic.
+NM_PER_MM = 1_000_000
+
+
+def to_nm(value) -> np.ndarray:
+    """Snap millimeter coordinates to integer nanometers."""
+    return np.rint(np.asarray(value, dtype=np.float64) * NM_PER_MM).astype(np.int64)
+
+
+def _cell_key(cx, cy):
+    """Pack signed cell coordinates (ints or int64 arrays) into one int64 key."""
+    return (cx << 32) | (cy & 0xFFFFFFFF)
+
+
+def find_closest_trace(
+    traces: Union[TraceTable, Sequence[TraceInfo]],
+    x: float,
+    y: float
+) -> tuple[Optional[TraceInfo], float]:
+    """
+    Find the trace whose nearest endpoint is closest to a point.
+
+    Accepts a TraceTable or any sequence of objects with
+    start_x/start_y/end_x/end_y attributes. Distances are compared squared;
+    only the winner's distance is square-rooted.
+
+    Returns:
+        (trace, distance) or (None, inf) if there are no traces
+    """
+    table = traces if isinstance(traces, TraceTable) else TraceTable.from_traces(traces)
+    if len(table) == 0:
+        return None, float('inf')
+
+    d2 = np.minimum(
+        (table.start_x - x) ** 2 + (table.start_y - y) ** 2,
+        (table.end_x - x) ** 2 + (table.end_y - y) ** 2
+    )
+    idx = int(np.argmin(d2))
+    return table.traces[idx], math.sqrt(d2[idx])
+
+
+class TraceEndpointIndex:
+    """
+    Spatial lookups over the start and end points of a set of traces.
+
+    Point k < n is the start of row k of the table, point n + k its end.
+    Nearest-endpoint queries use a KD-tree. Connectivity queries snap
+    endpoints to integer nanometers and bucket them into cells one
+    tolerance wide, so a lookup is a 3x3 dict probe plus integer compares.
+    Buckets are built in one sort over packed cell keys.
+    """
+
+    def __init__(self, table: TraceTable, tolerance: float = 0.01):
+        self.table = table
+        self.tolerance = tolerance
+        n = len(table)
+        self._n = n
+        self._tol_nm = max(1, int(round(tolerance * NM_PER_MM)))
+        self._cells: dict[int, list[int]] = {}
+        if n:
+            points = np.column_stack([
+                np.concatenate([table.start_x, table.end_x]),
+                np.concatenate([table.start_y, table.end_y]),
+            ])
+            self._tree = cKDTree(points)
+            ix = to_nm(points[:, 0])
+            iy = to_nm(points[:, 1])
+            self._ix = ix.tolist()
+            self._iy = iy.tolist()
+
+            # Group point ids by cell: stable sort keeps ids ascending per bucket
+            keys = _cell_key(ix // self._tol_nm, iy // self._tol_nm)
+            order = np.argsort(keys, kind='stable')
+            cell_keys, starts = np.unique(keys[order], return_index=True)
+            buckets = np.split(order, starts[1:])
+            self._cells = {
+                key: bucket.tolist() for key, bucket in zip(cell_keys.tolist(), buckets)
+            }
+        else:
+            self._tree = None
+            self._ix = []
+            self._iy = []
+
+    def closest(self, x: float, y: float) -> tuple[Optional[TraceInfo], float]:
+        """
+        Trace with the endpoint nearest to (x, y), and that distance.
+
+        Ties (e.g. two traces sharing the nearest endpoint) resolve to the
+        first trace in table order, matching find_closest_trace.
+        """
+        if self._tree is None:
+            return None, float('inf')
+        dist, _ = self._tree.query((x, y), k=1)
+        tied = self._tree.query_ball_point((x, y), dist * (1 + 1e-12) + 1e-12)
+        row = min(point % self._n for point in tied)
+        return self.table.traces[row], float(dist)
+
+    def connected(self, x: float, y: float) -> list[tuple[int, bool]]:
+        """
+        Traces with an endpoint strictly within tolerance of (x, y) on both axes.
+
+        Returns (row, from_start) pairs in table order. from_start is True
+        when the trace's start point matched; a trace whose start and end
+        both match is reported once, as a start match.
+        """
+        if not self._cells:
+            return []
+        tol = self._tol_nm
+        qx = int(round(x * NM_PER_MM))
+        qy = int(round(y * NM_PER_MM))
+        cx, cy = qx // tol, qy // tol
+
+        points = []
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for point in self._cells.get(_cell_key(gx, gy), ()):
+                    if abs(self._ix[point] - qx) < tol and abs(self._iy[point] - qy) < tol:
+                        points.append(point)
+
+        matches: dict[int, bool] = {}
+        for point in sorted(points):
+            row = point % self._n
+            if row not in matches:
+                matches[row] = point < self._n
+        return sorted(matches.items())
+
+
+def build_connected_path(
+    index: TraceEndpointIndex,
+    start: TraceInfo
+) -> list[tuple[float, float]]:
+    """
+    Reconstruct the path of traces connected to a starting trace.
+
+    Walks forward from the start trace's end point and backward from its
+    start point, each time following the first unvisited trace connected to
+    the current point. Each walk tracks its own visited set, seeded with the
+    start trace.
+
+    Returns:
+        (x, y) points from the far end of the backward walk to the far end
+        of the forward walk, with consecutive duplicates removed
+    """
+    traces = index.table.traces
+
+    def walk(x: float, y: float) -> list[tuple[float, float]]:
+        """Near/far endpoint pairs of the traces followed from (x, y)."""
+        visited = {id(start)}
+        points = []
+        while True:
+            for row, from_start in index.connected(x, y):
+                trace = traces[row]
+                if id(trace) not in visited:
+                    break
+            else:
+                return points
+            visited.add(id(trace))
+            start_pt = (trace.start_x, trace.start_y)
+            end_pt = (trace.end_x, trace.end_y)
+            near, far = (start_pt, end_pt) if from_start else (end_pt, start_pt)
+            points.append(near)
+            points.append(far)
+            x, y = far
+
+    backward = walk(start.start_x, start.start_y)
+    backward.reverse()
+    forward = walk(start.end_x, start.end_y)
+
+    path: list[tuple[float, float]] = []
+    for point in (
+        *backward,
+        (start.start_x, start.start_y),
+        (start.end_x, start.end_y),
+        *forward,
+    ):
+        if not path or path[-1][0] != point[0] or path[-1][1] != point[1]:
+            path.append(point)
+    return path
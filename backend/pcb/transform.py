@@ -1,6 +1,8 @@
 """Coordinate transformation utilities."""
 import math
 
+import numpy as np
+
 
 def rotate_point(x: float, y: float, angle_deg: float) -> tuple[float, float]:
     """
@@ -56,8 +58,42 @@ def transform_pad_position(
     absolute_x = fp_x + rotated_x
     absolute_y = fp_y + rotated_y
 
+    return absolute_x, absolute_y, pad_visual_angle(pad_angle)
+
+
+def pad_visual_angle(pad_angle: float | None) -> float:
+    """Pad angle for rendering, from the pad's angle in the PCB file."""
     # In KiCad 9 PCB files, pad angles are already absolute (include footprint rotation)
     # Negate to match SVG coordinate system
-    visual_angle = -pad_angle if pad_angle is not None else 0
+    return -pad_angle if pad_angle is not None else 0
+
 
-    return absolute_x, absolute_y, visual_angle
+def transform_pad_positions(
+    offsets: np.ndarray,
+    fp_x: float,
+    fp_y: float,
+    fp_angle: float
+) -> np.ndarray:
+    """
+    Transform all pad offsets of a footprint to board-absolute coordinates.
+
+    Array form of transform_pad_position: the footprint rotation is
+    computed once and applied to every offset, with the same arithmetic
+    as rotate_point so results match the per-pad version exactly.
+
+    Args:
+        offsets: (N, 2) pad offsets from the footprint origin
+        fp_x, fp_y: Footprint position on board
+        fp_angle: Footprint rotation on board (degrees)
+
+    Returns:
+        (N, 2) array of absolute pad positions
+    """
+    offsets = np.asarray(offsets, dtype=np.float64).reshape(-1, 2)
+    x, y = offsets[:, 0], offsets[:, 1]
+    if fp_angle != 0:
+        angle_rad = math.radians(-fp_angle)
+        cos_a = math.cos(angle_rad)
+        sin_a = math.sin(angle_rad)
+        x, y = x * cos_a - y * sin_a, x * sin_a + y * cos_a
+    return np.column_stack((fp_x + x, fp_y + y))
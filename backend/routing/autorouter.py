@@ -111,6 +111,11 @@ class AutoRouter:
         # Strategy 3: Try single via routing
         via_candidates = self._generate_via_candidates(start_x, start_y, end_x, end_y)
 
+        # Check every candidate's placement once, up front
+        xs, ys = zip(*via_candidates)
+        valid, _ = self.trace_router.check_via_placements(xs, ys, via_size / 2, net_id)
+        via_candidates = [c for c, ok in zip(via_candidates, valid) if ok]
+
         for via_x, via_y in via_candidates:
             # Try via from preferred layer to each alternate layer
             for alt_layer in self.COPPER_LAYERS:
@@ -200,20 +205,11 @@ class AutoRouter:
         net_id: Optional[int],
         via_size: float
     ) -> AutoRouteResult:
-        """Attempt to route with a single via between two layers."""
-        # First check if via placement is valid
-        via_radius = via_size / 2
-        valid, msg = self.trace_router.check_via_placement(
-            via_x, via_y, via_radius, net_id
-        )
-        if not valid:
-            return AutoRouteResult(
-                success=False,
-                segments=[],
-                vias=[],
-                message=f"Via blocked: {msg}"
-            )
+        """
+        Attempt to route with a single via between two layers.
 
+        The via position must already have passed check_via_placement.
+        """
         # Try routing start -> via on layer1
         path1 = self.trace_router.route(
             start_x, start_y, via_x, via_y,
@@ -270,32 +266,11 @@ class AutoRouter:
         net_id: Optional[int],
         via_size: float
     ) -> AutoRouteResult:
-        """Attempt to route with two vias (start_layer -> mid_layer -> start_layer)."""
-        via_radius = via_size / 2
-
-        # Check both vias are valid
-        valid1, msg1 = self.trace_router.check_via_placement(
-            via1_x, via1_y, via_radius, net_id
-        )
-        if not valid1:
-            return AutoRouteResult(
-                success=False,
-                segments=[],
-                vias=[],
-                message=f"Via 1 blocked: {msg1}"
-            )
-
-        valid2, msg2 = self.trace_router.check_via_placement(
-            via2_x, via2_y, via_radius, net_id
-        )
-        if not valid2:
-            return AutoRouteResult(
-                success=False,
-                segments=[],
-                vias=[],
-                message=f"Via 2 blocked: {msg2}"
-            )
+        """
+        Attempt to route with two vias (start_layer -> mid_layer -> start_layer).
 
+        Both via positions must already have passed check_via_placement.
+        """
         # Route start -> via1 on start_layer
         path1 = self.trace_router.route(
             start_x, start_y, via1_x, via1_y,
@@ -368,40 +343,31 @@ class AutoRouter:
         Returns points along the direct path at 25%, 50%, 75%,
         plus points offset perpendicular to the path.
         """
-        candidates = []
-
         dx = end_x - start_x
         dy = end_y - start_y
+
         length = (dx * dx + dy * dy) ** 0.5
 
         if length < 0.001:
             # Start and end are same point
             return [(start_x, start_y)]
 
-        # Points along the direct path
-        for t in [0.25, 0.5, 0.75]:
-            x = start_x + t * dx
-            y = start_y + t * dy
-            candidates.append((x, y))
-
         # Perpendicular offset distance (1mm or 10% of length, whichever is larger)
         offset = max(1.0, length * 0.1)
 
-        # Unit perpendicular vector
-        perp_x = -dy / length
-        perp_y = dx / length
-
-        # Add offset points at 50% along path
-        mid_x = start_x + 0.5 * dx
-        mid_y = start_y + 0.5 * dy
-        candidates.append((mid_x + offset * perp_x, mid_y + offset * perp_y))
-        candidates.append((mid_x - offset * perp_x, mid_y - offset * perp_y))
-
-        # Add offset points at 25% and 75%
-        for t in [0.25, 0.75]:
-            px = start_x + t * dx
-            py = start_y + t * dy
-            candidates.append((px + offset * perp_x, py + offset * perp_y))
-            candidates.append((px - offset * perp_x, py - offset * perp_y))
-
-        return candidates
+        # Perpendicular offset vector
+        off_x = offset * (-dy / length)
+        off_y = offset * (dx / length)
+
+        # Points along the direct path at 25%, 50%, 75%
+        qx, qy = start_x + 0.25 * dx, start_y + 0.25 * dy
+        mid_x, mid_y = start_x + 0.5 * dx, start_y + 0.5 * dy
+        tx, ty = start_x + 0.75 * dx, start_y + 0.75 * dy
+
+        # Then offset pairs at 50%, 25% and 75%
+        return [
+            (qx, qy), (mid_x, mid_y), (tx, ty),
+            (mid_x + off_x, mid_y + off_y), (mid_x - off_x, mid_y - off_y),
+            (qx + off_x, qy + off_y), (qx - off_x, qy - off_y),
+            (tx + off_x, ty + off_y), (tx - off_x, ty - off_y),
+        ]
@@ -2,6 +2,8 @@
 import math
 from typing import Union, Optional
 
+import numpy as np
+
 from backend.pcb.models import PadInfo, TraceInfo, ViaInfo
 
 
@@ -36,24 +38,36 @@ class GeometryChecker:
         else:
             local_x, local_y = dx, dy
 
-        # Half dimensions
-        half_w = pad.width / 2
-        half_h = pad.height / 2
+        # Dispatch on shape via lookup table; unknown shapes fall back to rect
+        sdf = _PAD_SDF.get(pad.shape, _pad_sdf_rect)
+        return sdf(local_x, local_y, pad.width / 2, pad.height / 2, pad)
+
+    @staticmethod
+    def points_to_pad_distance(xs: np.ndarray, ys: np.ndarray, pad: PadInfo) -> np.ndarray:
+        """
+        Vectorized point_to_pad_distance for arrays of sample points.
+
+        Returns an array of signed distances with the same shape as xs/ys.
+        """
+        dx = np.asarray(xs, dtype=np.float64) - pad.x
+        dy = np.asarray(ys, dtype=np.float64) - pad.y
+
+        if pad.angle != 0:
+            angle_rad = math.radians(-pad.angle)
+            cos_a = math.cos(angle_rad)
+            sin_a = math.sin(angle_rad)
+            local_x = dx * cos_a - dy * sin_a
+            local_y = dx * sin_a + dy * cos_a
+        else:
+            local_x, local_y = dx, dy
 
-        if pad.shape == 'circle':
-            return GeometryChecker._point_to_circle(local_x, local_y, min(half_w, half_h))
-        elif pad.shape == 'oval':
-            return GeometryChecker._point_to_oval(local_x, local_y, half_w, half_h)
-        elif pad.shape == 'roundrect':
-            corner_radius = min(half_w, half_h) * pad.roundrect_ratio
-            return GeometryChecker._point_to_roundrect(local_x, local_y, half_w, half_h, corner_radius)
-        else:  # rect
-            return GeometryChecker._point_to_rect(local_x, local_y, half_w, half_h)
+        sdf = _PAD_SDF_ARRAY.get(pad.shape, _pad_sdf_rect_array)
+        return sdf(local_x, local_y, pad.width / 2, pad.height / 2, pad)
 
     @staticmethod
     def _point_to_circle(x: float, y: float, radius: float) -> float:
         """Distance from point at (x,y) to circle centered at origin."""
-        return math.sqrt(x * x + y * y) - radius
+        return math.hypot(x, y) - radius
 
     @staticmethod
     def _point_to_rect(x: float, y: float, half_w: float, half_h: float) -> float:
@@ -68,7 +82,7 @@ class GeometryChecker:
         # Outside: find closest point on boundary
         closest_x = max(-half_w, min(half_w, x))
         closest_y = max(-half_h, min(half_h, y))
-        return math.sqrt((x - closest_x) ** 2 + (y - closest_y) ** 2)
+        return math.hypot(x - closest_x, y - closest_y)
 
     @staticmethod
     def _point_to_oval(x: float, y: float, half_w: float, half_h: float) -> float:
@@ -83,10 +97,10 @@ class GeometryChecker:
             cap_offset = half_w - radius
             if x < -cap_offset:
                 # Left semicircle
-                return math.sqrt((x + cap_offset) ** 2 + y ** 2) - radius
+                return math.hypot(x + cap_offset, y) - radius
             elif x > cap_offset:
                 # Right semicircle
-                return math.sqrt((x - cap_offset) ** 2 + y ** 2) - radius
+                return math.hypot(x - cap_offset, y) - radius
             else:
                 # Middle rectangle portion
                 return abs(y) - radius
@@ -95,14 +109,14 @@ class GeometryChecker:
             radius = half_w
             cap_offset = half_h - radius
             if y < -cap_offset:
-                return math.sqrt(x ** 2 + (y + cap_offset) ** 2) - radius
+                return math.hypot(x, y + cap_offset) - radius
             elif y > cap_offset:
-                return math.sqrt(x ** 2 + (y - cap_offset) ** 2) - radius
+                return math.hypot(x, y - cap_offset) - radius
             else:
                 return abs(x) - radius
         else:
             # Equal dimensions = circle
-            return math.sqrt(x * x + y * y) - half_w
+            return math.hypot(x, y) - half_w
 
     @staticmethod
     def _point_to_roundrect(x: float, y: float, half_w: float, half_h: float,
@@ -130,7 +144,7 @@ class GeometryChecker:
             # In a corner region - distance to corner arc
             corner_x = inner_half_w if x > 0 else -inner_half_w
             corner_y = inner_half_h if y > 0 else -inner_half_h
-            return math.sqrt((x - corner_x) ** 2 + (y - corner_y) ** 2) - corner_radius
+            return math.hypot(x - corner_x, y - corner_y) - corner_radius
 
     @staticmethod
     def point_to_trace_distance(px: float, py: float, trace: TraceInfo) -> float:
@@ -151,7 +165,7 @@ class GeometryChecker:
     def point_to_via_distance(px: float, py: float, via: ViaInfo) -> float:
         """Distance from point to via edge (via is a circle)."""
         radius = via.size / 2
-        dist = math.sqrt((px - via.x) ** 2 + (py - via.y) ** 2)
+        dist = math.hypot(px - via.x, py - via.y)
         return dist - radius
 
     @staticmethod
@@ -165,7 +179,7 @@ class GeometryChecker:
 
         if length_sq < 0.000001:
             # Degenerate segment (start == end)
-            return math.sqrt((px - x1) ** 2 + (py - y1) ** 2)
+            return math.hypot(px - x1, py - y1)
 
         # Project point onto line: t = (P-A) dot (B-A) / |B-A|^2
         t = ((px - x1) * dx + (py - y1) * dy) / length_sq
@@ -175,7 +189,93 @@ class GeometryChecker:
         closest_x = x1 + t * dx
         closest_y = y1 + t * dy
 
-        return math.sqrt((px - closest_x) ** 2 + (py - closest_y) ** 2)
+        return math.hypot(px - closest_x, py - closest_y)
+
+
+def _pad_sdf_circle(x: float, y: float, half_w: float, half_h: float,
+                    pad: PadInfo) -> float:
+    return GeometryChecker._point_to_circle(x, y, min(half_w, half_h))
+
+
+def _pad_sdf_oval(x: float, y: float, half_w: float, half_h: float,
+                  pad: PadInfo) -> float:
+    return GeometryChecker._point_to_oval(x, y, half_w, half_h)
+
+
+def _pad_sdf_roundrect(x: float, y: float, half_w: float, half_h: float,
+                       pad: PadInfo) -> float:
+    corner_radius = min(half_w, half_h) * pad.roundrect_ratio
+    return GeometryChecker._point_to_roundrect(x, y, half_w, half_h, corner_radius)
+
+
+def _pad_sdf_rect(x: float, y: float, half_w: float, half_h: float,
+                  pad: PadInfo) -> float:
+    return GeometryChecker._point_to_rect(x, y, half_w, half_h)
+
+
+# Per-shape distance kernels in pad-local coordinates, keyed by PadInfo.shape
+_PAD_SDF = {
+    'circle': _pad_sdf_circle,
+    'oval': _pad_sdf_oval,
+    'roundrect': _pad_sdf_roundrect,
+    'rect': _pad_sdf_rect,
+}
+
+
+def _rect_distance_array(x: np.ndarray, y: np.ndarray,
+                         half_w: float, half_h: float) -> np.ndarray:
+    ax = np.abs(x)
+    ay = np.abs(y)
+    inside = (ax <= half_w) & (ay <= half_h)
+    outside_dist = np.hypot(np.maximum(ax - half_w, 0.0), np.maximum(ay - half_h, 0.0))
+    inside_dist = -np.minimum(half_w - ax, half_h - ay)
+    return np.where(inside, inside_dist, outside_dist)
+
+
+def _pad_sdf_circle_array(x: np.ndarray, y: np.ndarray, half_w: float, half_h: float,
+                          pad: PadInfo) -> np.ndarray:
+    return np.hypot(x, y) - min(half_w, half_h)
+
+
+def _pad_sdf_oval_array(x: np.ndarray, y: np.ndarray, half_w: float, half_h: float,
+                        pad: PadInfo) -> np.ndarray:
+    # Stadium distance: distance to the centerline segment minus the cap radius
+    if half_w >= half_h:
+        cap_offset = half_w - half_h
+        return np.hypot(x - np.clip(x, -cap_offset, cap_offset), y) - half_h
+    cap_offset = half_h - half_w
+    return np.hypot(x, y - np.clip(y, -cap_offset, cap_offset)) - half_w
+
+
+def _pad_sdf_roundrect_array(x: np.ndarray, y: np.ndarray, half_w: float, half_h: float,
+                             pad: PadInfo) -> np.ndarray:
+    corner_radius = min(min(half_w, half_h) * pad.roundrect_ratio, half_w, half_h)
+    if corner_radius <= 0:
+        return _rect_distance_array(x, y, half_w, half_h)
+
+    inner_half_w = half_w - corner_radius
+    inner_half_h = half_h - corner_radius
+    ax = np.abs(x)
+    ay = np.abs(y)
+    corner_dist = np.hypot(ax - inner_half_w, ay - inner_half_h) - corner_radius
+    return np.where(
+        ax <= inner_half_w, ay - half_h,
+        np.where(ay <= inner_half_h, ax - half_w, corner_dist)
+    )
+
+
+def _pad_sdf_rect_array(x: np.ndarray, y: np.ndarray, half_w: float, half_h: float,
+                        pad: PadInfo) -> np.ndarray:
+    return _rect_distance_array(x, y, half_w, half_h)
+
+
+# Array counterparts of _PAD_SDF for points_to_pad_distance
+_PAD_SDF_ARRAY = {
+    'circle': _pad_sdf_circle_array,
+    'oval': _pad_sdf_oval_array,
+    'roundrect': _pad_sdf_roundrect_array,
+    'rect': _pad_sdf_rect_array,
+}
 
 
 def segment_segment_intersection(
@@ -365,3 +465,25 @@ def closest_point_on_segment(
     t = max(0.0, min(1.0, t))
 
     return (ax + dx * t, ay + dy * t, t)
+
+
+def point_to_segments_distance(
+    px: float, py: float,
+    x1: np.ndarray, y1: np.ndarray,
+    x2: np.ndarray, y2: np.ndarray
+) -> np.ndarray:
+    """
+    Distance from one point to each of many segments.
+
+    Segment endpoints are given as parallel arrays. The projection is
+    clamped with np.clip instead of per-segment branches; zero-length
+    segments project onto their start point.
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    length_sq = dx * dx + dy * dy
+
+    t = ((px - x1) * dx + (py - y1) * dy) / np.where(length_sq > 1e-12, length_sq, 1.0)
+    t = np.clip(t, 0.0, 1.0)
+
+    return np.hypot(px - (x1 + t * dx), py - (y1 + t * dy))
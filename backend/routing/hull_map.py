@@ -4,9 +4,13 @@ import math
 from typing import Optional, Iterator
 from dataclasses import dataclass
 
+import numpy as np
+
 from backend.pcb.parser import PCBParser
 from backend.pcb.models import PadInfo, TraceInfo, ViaInfo
-from backend.routing.hulls import Point, LineChain, HullGenerator
+from backend.routing.hulls import (
+    Point, LineChain, HullGenerator, segment_hull_contacts
+)
 
 
 @dataclass(slots=True)
@@ -168,10 +172,7 @@ class HullMap:
         chain.net_id = pad.net_id
 
         # Calculate bounding box
-        min_x = min(p.x for p in chain.points)
-        max_x = max(p.x for p in chain.points)
-        min_y = min(p.y for p in chain.points)
-        max_y = max(p.y for p in chain.points)
+        min_x, min_y, max_x, max_y = chain.bounds()
 
         return IndexedHull(
             hull=chain,
@@ -195,10 +196,7 @@ class HullMap:
         chain.net_id = trace.net_id
 
         # Calculate bounding box
-        min_x = min(p.x for p in chain.points)
-        max_x = max(p.x for p in chain.points)
-        min_y = min(p.y for p in chain.points)
-        max_y = max(p.y for p in chain.points)
+        min_x, min_y, max_x, max_y = chain.bounds()
 
         return IndexedHull(
             hull=chain,
@@ -365,24 +363,35 @@ class HullMap:
         Returns:
             List of (hull, intersection_point, edge_index) sorted by distance from start
         """
+        candidates = list(self.query_segment(start, end, trace_width, net_id))
+        if not candidates:
+            return []
+
         blocking = []
         half_width = trace_width / 2
 
-        for indexed in self.query_segment(start, end, trace_width, net_id):
-            # Check for intersection first
-            intersections = indexed.hull.intersects_segment(start, end)
-            if intersections:
+        # Test the edges of all candidates in one pass
+        edge_arrays = [indexed.hull.edge_arrays for indexed in candidates]
+        counts = np.array([arrays.shape[1] for arrays in edge_arrays])
+        contacts = segment_hull_contacts(start, end, np.concatenate(edge_arrays, axis=1), counts)
+        hit_edge, hit_x, hit_y, near_edge, near_x, near_y, near_dist_sq = (
+            column.tolist() for column in contacts
+        )
+
+        for i, indexed in enumerate(candidates):
+            if hit_edge[i] >= 0:
                 # Use the first (closest) intersection
-                pt, edge_idx = intersections[0]
-                dist_sq = (pt.x - start.x) ** 2 + (pt.y - start.y) ** 2
-                blocking.append((indexed, pt, edge_idx, dist_sq))
+                edge = hit_edge[i]
+                pt = Point(hit_x[i], hit_y[i])
             else:
                 # No intersection - check if segment passes too close
-                dist, closest_pt, edge_idx = indexed.hull.segment_to_boundary_distance(start, end)
-                if dist < half_width:
-                    # Segment is too close - treat the closest point as the blocking point
-                    dist_sq = (closest_pt.x - start.x) ** 2 + (closest_pt.y - start.y) ** 2
-                    blocking.append((indexed, closest_pt, edge_idx, dist_sq))
+                if near_dist_sq[i] ** 0.5 >= half_width:
+                    continue
+                # Segment is too close - treat the closest point as the blocking point
+                edge = near_edge[i]
+                pt = Point(near_x[i], near_y[i])
+            dist_sq = (pt.x - start.x) ** 2 + (pt.y - start.y) ** 2
+            blocking.append((indexed, pt, edge, dist_sq))
 
         # Sort by distance
         blocking.sort(key=lambda x: x[3])
@@ -447,10 +456,7 @@ class HullMap:
             chain.net_id = net_id
 
             # Calculate bounding box
-            min_x = min(p.x for p in chain.points)
-            max_x = max(p.x for p in chain.points)
-            min_y = min(p.y for p in chain.points)
-            max_y = max(p.y for p in chain.points)
+            min_x, min_y, max_x, max_y = chain.bounds()
 
             indexed = IndexedHull(
                 hull=chain,
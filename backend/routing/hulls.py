@@ -2,8 +2,18 @@
 from __future__ import annotations
 import math
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from typing import Optional
 
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    numba = None
+
 
 @dataclass(slots=True)
 class Point:
@@ -31,7 +41,7 @@ class Point:
         return self.x * other.y - self.y * other.x
 
     def length(self) -> float:
-        return math.sqrt(self.x * self.x + self.y * self.y)
+        return math.hypot(self.x, self.y)
 
     def length_sq(self) -> float:
         return self.x * self.x + self.y * self.y
@@ -71,6 +81,48 @@ class LineChain:
     def __len__(self) -> int:
         return len(self.points)
 
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Axis-aligned bounding box as (min_x, min_y, max_x, max_y)."""
+        xs = [p.x for p in self.points]
+        ys = [p.y for p in self.points]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    @cached_property
+    def edge_arrays(self) -> np.ndarray:
+        """Edge endpoints as a (4, n) array of rows x1, y1, x2, y2; edge i runs from point i to i + 1."""
+        start = np.array([(p.x, p.y) for p in self.points], dtype=np.float64).reshape(-1, 2).T
+        return np.concatenate([start, np.roll(start, -1, axis=1)])
+
+    @cached_property
+    def edge_normals(self) -> list[Point]:
+        """Unit outward normal of each edge i (point i to i + 1), computed once per hull."""
+        points = self.points
+        n = len(points)
+        normals = []
+        for i in range(n):
+            # For CCW polygon, outward normal is edge direction rotated 90° clockwise
+            # Rotation: (dx, dy) -> (dy, -dx)
+            d = (points[(i + 1) % n] - points[i]).normalized()
+            normals.append(Point(d.y, -d.x))
+        return normals
+
+    @cached_property
+    def vertex_normals(self) -> list[Point]:
+        """
+        Unit outward direction at each vertex, computed once per hull.
+
+        The average of the outward normals of the edges before and after the
+        vertex; for a straight (180-degree) vertex, the normal of the edge
+        before it.
+        """
+        edge_normals = self.edge_normals
+        normals = []
+        for i in range(len(edge_normals)):
+            n1 = edge_normals[i - 1]  # Edge before vertex
+            outward = (n1 + edge_normals[i]).normalized()
+            normals.append(outward if outward.length() >= 0.01 else n1)
+        return normals
+
     def get_edge(self, i: int) -> tuple[Point, Point]:
         """Get edge from point i to point (i+1) mod n."""
         n = len(self.points)
@@ -117,12 +169,10 @@ class LineChain:
         Returns:
             List of (intersection_point, edge_index) sorted by distance from p1
         """
-        intersections = []
-
-        for i, (e1, e2) in enumerate(self.edges()):
-            pt = segment_segment_intersection(p1, p2, e1, e2)
-            if pt is not None:
-                intersections.append((pt, i))
+        edges, xs, ys = segment_edge_intersections(p1, p2, *self.edge_arrays)
+        intersections = [
+            (Point(x, y), i) for i, x, y in zip(edges.tolist(), xs.tolist(), ys.tolist())
+        ]
 
         # Sort by distance from p1
         intersections.sort(key=lambda x: (x[0] - p1).length_sq())
@@ -161,20 +211,10 @@ class LineChain:
         Returns:
             (min_distance, closest_point_on_hull, edge_index)
         """
-        min_dist_sq = float('inf')
-        closest_point = self.points[0]
-        closest_edge = 0
-
-        # Check distance from segment to each hull edge
-        for i, (e1, e2) in enumerate(self.edges()):
-            # Find minimum distance between segments (p1, p2) and (e1, e2)
-            dist_sq, pt = _segment_segment_distance_sq(p1, p2, e1, e2)
-            if dist_sq < min_dist_sq:
-                min_dist_sq = dist_sq
-                closest_point = pt
-                closest_edge = i
-
-        return (min_dist_sq ** 0.5, closest_point, closest_edge)
+        dist_sq, xs, ys = segment_edge_distances(p1, p2, *self.edge_arrays)
+        # argmin keeps the first minimum, like the per-edge loop did
+        edge = int(np.argmin(dist_sq))
+        return (float(dist_sq[edge]) ** 0.5, Point(float(xs[edge]), float(ys[edge])), edge)
 
     def centroid(self) -> Point:
         """Calculate centroid of the polygon."""
@@ -247,38 +287,266 @@ def point_to_segment_distance(p: Point, a: Point, b: Point) -> float:
     return p.distance_to(closest)
 
 
-def _segment_segment_distance_sq(p1: Point, p2: Point, p3: Point, p4: Point) -> tuple[float, Point]:
+def segment_edge_intersections(
+    p1: Point, p2: Point,
+    x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    segment_segment_intersection of segment p1-p2 with many edges at once.
+
+    Edge endpoints are given as parallel arrays.
+
+    Returns:
+        (edge_indices, xs, ys) of the edges crossed and the crossing points,
+        in edge order
+    """
+    d1x = p2.x - p1.x
+    d1y = p2.y - p1.y
+    d2x = x2 - x1
+    d2y = y2 - y1
+    d3x = x1 - p1.x
+    d3y = y1 - p1.y
+
+    cross = d1x * d2y - d1y * d2x
+    hit = np.abs(cross) >= 1e-10
+    denom = np.where(hit, cross, 1.0)
+    t = (d3x * d2y - d3y * d2x) / denom
+    u = (d3x * d1y - d3y * d1x) / denom
+    hit &= (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+
+    edges = np.flatnonzero(hit)
+    t = t[edges]
+    return (edges, p1.x + d1x * t, p1.y + d1y * t)
+
+
+def segment_edge_distances(
+    p1: Point, p2: Point,
+    x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Squared minimum distance from segment p1-p2 to each of many edges.
+
+    Like the endpoint-based segment distance used for hull clearance: the
+    smallest of the segment's endpoints onto the edge and the edge's
+    endpoints onto the segment (the first, on ties).
+
+    Returns:
+        (dist_sq, xs, ys) per edge, with the closest point on the edge
     """
-    Calculate the squared minimum distance between two line segments.
+    c1x, c1y = _closest_points_on_segments(p1.x, p1.y, x1, y1, x2, y2)
+    c2x, c2y = _closest_points_on_segments(p2.x, p2.y, x1, y1, x2, y2)
+    c3x, c3y = _closest_points_on_segments(x1, y1, p1.x, p1.y, p2.x, p2.y)
+    c4x, c4y = _closest_points_on_segments(x2, y2, p1.x, p1.y, p2.x, p2.y)
+
+    dist_sq = np.stack([
+        (p1.x - c1x) ** 2 + (p1.y - c1y) ** 2,
+        (p2.x - c2x) ** 2 + (p2.y - c2y) ** 2,
+        (x1 - c3x) ** 2 + (y1 - c3y) ** 2,
+        (x2 - c4x) ** 2 + (y2 - c4y) ** 2,
+    ])
+    best = np.argmin(dist_sq, axis=0)
+    edges = np.arange(len(x1))
+    xs = np.stack([c1x, c2x, x1, x2])[best, edges]
+    ys = np.stack([c1y, c2y, y1, y2])[best, edges]
+    return (dist_sq[best, edges], xs, ys)
+
+
+def segment_hull_contacts(
+    p1: Point, p2: Point, edges: np.ndarray, counts: np.ndarray
+) -> tuple[np.ndarray, ...]:
+    """
+    Where segment p1-p2 meets each of several hulls, in one pass.
 
     Args:
-        p1, p2: First segment endpoints
-        p3, p4: Second segment endpoints
+        p1, p2: Segment endpoints
+        edges: (4, total) edge arrays of the hulls side by side, as
+            LineChain.edge_arrays concatenated along axis 1
+        counts: Number of edges of each hull
 
     Returns:
-        (squared_distance, closest_point_on_second_segment)
+        Per hull: (hit_edge, hit_x, hit_y) of the crossing nearest to p1,
+        with hit_edge -1 when the segment does not cross the hull, and
+        (near_edge, near_x, near_y, near_dist_sq) of the closest approach
+        as in segment_edge_distances. Edge indices are per hull and ties
+        go to the lowest edge.
+    """
+    if NUMBA_AVAILABLE:
+        return _segment_hull_contacts_jit(
+            edges[0], edges[1], edges[2], edges[3], counts,
+            float(p1.x), float(p1.y), float(p2.x), float(p2.y)
+        )
+
+    x1, y1, x2, y2 = edges
+    n = len(counts)
+    owner = np.repeat(np.arange(n), counts)
+    first_edge = np.cumsum(counts) - counts
+
+    hit_edge = np.full(n, -1)
+    hit_x = np.zeros(n)
+    hit_y = np.zeros(n)
+    crossed, xs, ys = segment_edge_intersections(p1, p2, x1, y1, x2, y2)
+    order = np.lexsort((crossed, (xs - p1.x) ** 2 + (ys - p1.y) ** 2, owner[crossed]))
+    hulls_hit, first = np.unique(owner[crossed][order], return_index=True)
+    nearest = order[first]
+    hit_edge[hulls_hit] = crossed[nearest] - first_edge[hulls_hit]
+    hit_x[hulls_hit] = xs[nearest]
+    hit_y[hulls_hit] = ys[nearest]
+
+    # Sorted by hull, each hull's edges start at first_edge again
+    dist_sq, xs, ys = segment_edge_distances(p1, p2, x1, y1, x2, y2)
+    closest = np.lexsort((np.arange(len(dist_sq)), dist_sq, owner))[first_edge]
+
+    return (hit_edge, hit_x, hit_y,
+            closest - first_edge, xs[closest], ys[closest], dist_sq[closest])
+
+
+def _segment_hull_contacts_loop(
+    x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray,
+    counts: np.ndarray, sx: float, sy: float, ex: float, ey: float
+) -> tuple[np.ndarray, ...]:
+    """
+    Scalar-loop form of segment_hull_contacts.
+
+    Written in the subset of Python that Numba compiles; used through
+    _segment_hull_contacts_jit when Numba is installed. Mirrors the
+    operations of the array kernels so both give the same results.
+    """
+    n = counts.shape[0]
+    hit_edge = np.full(n, -1)
+    hit_x = np.zeros(n)
+    hit_y = np.zeros(n)
+    near_edge = np.zeros(n, dtype=np.int64)
+    near_x = np.zeros(n)
+    near_y = np.zeros(n)
+    near_dist_sq = np.zeros(n)
+
+    d1x = ex - sx
+    d1y = ey - sy
+    seg_length_sq = d1x * d1x + d1y * d1y
+
+    k = 0
+    for h in range(n):
+        best_hit = np.inf
+        best_near = np.inf
+        for edge in range(counts[h]):
+            ax = x1[k]
+            ay = y1[k]
+            bx = x2[k]
+            by = y2[k]
+            k += 1
+            d2x = bx - ax
+            d2y = by - ay
+
+            # Crossing, as segment_edge_intersections
+            cross = d1x * d2y - d1y * d2x
+            if abs(cross) >= 1e-10:
+                d3x = ax - sx
+                d3y = ay - sy
+                t = (d3x * d2y - d3y * d2x) / cross
+                u = (d3x * d1y - d3y * d1x) / cross
+                if 0 <= t <= 1 and 0 <= u <= 1:
+                    px = sx + d1x * t
+                    py = sy + d1y * t
+                    d = (px - sx) * (px - sx) + (py - sy) * (py - sy)
+                    if d < best_hit:
+                        best_hit = d
+                        hit_edge[h] = edge
+                        hit_x[h] = px
+                        hit_y[h] = py
+
+            # Closest approach, as segment_edge_distances: segment endpoints
+            # onto the edge, then edge endpoints onto the segment
+            edge_length_sq = d2x * d2x + d2y * d2y
+            for c in range(4):
+                if c < 2:
+                    px = sx if c == 0 else ex
+                    py = sy if c == 0 else ey
+                    ox, oy, vx, vy, length_sq = ax, ay, d2x, d2y, edge_length_sq
+                else:
+                    px = ax if c == 2 else bx
+                    py = ay if c == 2 else by
+                    ox, oy, vx, vy, length_sq = sx, sy, d1x, d1y, seg_length_sq
+                t = 0.0
+                if length_sq >= 1e-10:
+                    t = min(max(((px - ox) * vx + (py - oy) * vy) / length_sq, 0.0), 1.0)
+                cx = ox + vx * t
+                cy = oy + vy * t
+                d = (px - cx) * (px - cx) + (py - cy) * (py - cy)
+                if d < best_near:
+                    best_near = d
+                    near_edge[h] = edge
+                    # The closest point on the edge
+                    near_x[h] = cx if c < 2 else px
+                    near_y[h] = cy if c < 2 else py
+                    near_dist_sq[h] = d
+
+    return hit_edge, hit_x, hit_y, near_edge, near_x, near_y, near_dist_sq
+
+
+if NUMBA_AVAILABLE:
+    _segment_hull_contacts_jit = numba.njit(cache=True)(_segment_hull_contacts_loop)
+
+
+def warm_up_contacts_kernel() -> None:
+    """
+    Compile the hull contacts kernel now, or load it from Numba's on-disk cache.
+
+    The kernel is otherwise compiled by the first blocked walkaround. The
+    arguments have the types HullMap.get_blocking_hulls passes, so it is
+    the same specialization. Without Numba this does nothing.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    segment_hull_contacts(Point(0.0, 0.0), Point(1.0, 1.0), np.zeros((4, 3)), np.array([3]))
+
+
+def _closest_points_on_segments(
+    px, py, ax, ay, bx, by
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    closest_point_on_segment for arrays of points and/or segments.
+
+    Arguments broadcast against each other; segments shorter than 1e-5
+    project onto their start point.
     """
-    # Check all four endpoint-to-segment distances
-    candidates = []
+    abx = bx - ax
+    aby = by - ay
+    length_sq = abx * abx + aby * aby
+    degenerate = length_sq < 1e-10
+
+    t = ((px - ax) * abx + (py - ay) * aby) / np.where(degenerate, 1.0, length_sq)
+    t = np.where(degenerate, 0.0, np.minimum(np.maximum(t, 0.0), 1.0))
+
+    return (ax + abx * t, ay + aby * t)
 
-    # p1 to segment (p3, p4)
-    c1, _ = closest_point_on_segment(p1, p3, p4)
-    candidates.append(((p1 - c1).length_sq(), c1))
 
-    # p2 to segment (p3, p4)
-    c2, _ = closest_point_on_segment(p2, p3, p4)
-    candidates.append(((p2 - c2).length_sq(), c2))
+@lru_cache(maxsize=None)
+def _circle_table(num_segments: int) -> tuple[tuple[float, float], ...]:
+    """(cos, sin) of num_segments evenly spaced angles, starting at 0."""
+    return tuple(
+        (math.cos(2 * math.pi * i / num_segments), math.sin(2 * math.pi * i / num_segments))
+        for i in range(num_segments)
+    )
 
-    # p3 to segment (p1, p2)
-    c3, _ = closest_point_on_segment(p3, p1, p2)
-    candidates.append(((p3 - c3).length_sq(), p3))
 
-    # p4 to segment (p1, p2)
-    c4, _ = closest_point_on_segment(p4, p1, p2)
-    candidates.append(((p4 - c4).length_sq(), p4))
+@lru_cache(maxsize=None)
+def _cap_tables(end_segments: int) -> tuple[tuple[tuple[float, float], ...], ...]:
+    """
+    (cos, sin) of the semicircular cap angles used by segment_hull.
 
-    # Return the minimum
-    return min(candidates, key=lambda x: x[0])
+    Returns (end_cap, start_cap), relative to the segment direction.
+    """
+    end_cap = tuple(
+        (math.cos(math.pi / 2 - math.pi * i / end_segments),
+         math.sin(math.pi / 2 - math.pi * i / end_segments))
+        for i in range(1, end_segments + 1)
+    )
+    start_cap = tuple(
+        (math.cos(-math.pi / 2 - math.pi * i / end_segments),
+         math.sin(-math.pi / 2 - math.pi * i / end_segments))
+        for i in range(1, end_segments + 1)
+    )
+    return end_cap, start_cap
 
 
 class HullGenerator:
@@ -359,13 +627,8 @@ class HullGenerator:
             LineChain approximating a circle
         """
         r = radius + clearance
-        points = []
-
-        for i in range(num_segments):
-            angle = 2 * math.pi * i / num_segments
-            x = center.x + r * math.cos(angle)
-            y = center.y + r * math.sin(angle)
-            points.append(Point(x, y))
+        cx, cy = center.x, center.y
+        points = [Point(cx + r * c, cy + r * s) for c, s in _circle_table(num_segments)]
 
         return LineChain(points=points)
 
@@ -417,19 +680,20 @@ class HullGenerator:
         points.append(start + perp * half_width)
         points.append(end + perp * half_width)
 
+        # Cap angles are fixed per end_segments; only the scaling varies
+        end_cap, start_cap = _cap_tables(end_segments)
+
         # End cap (semicircle at end point, going from left to right via front)
-        for i in range(1, end_segments + 1):
-            angle = math.pi / 2 - math.pi * i / end_segments
-            offset = dir_norm * (half_width * math.cos(angle)) + perp * (half_width * math.sin(angle))
+        for c, s in end_cap:
+            offset = dir_norm * (half_width * c) + perp * (half_width * s)
             points.append(end + offset)
 
         # Right side (going from end back to start, offset to the right)
         points.append(start - perp * half_width)
 
         # Start cap (semicircle at start point, going from right to left via back)
-        for i in range(1, end_segments + 1):
-            angle = -math.pi / 2 - math.pi * i / end_segments
-            offset = dir_norm * (half_width * math.cos(angle)) + perp * (half_width * math.sin(angle))
+        for c, s in start_cap:
+            offset = dir_norm * (half_width * c) + perp * (half_width * s)
             points.append(start + offset)
 
         # Remove the last point if it duplicates the first (closing the loop)
@@ -0,0 +1,254 @@
+"""Jump Point Search over the packed A* grid."""
+import heapq
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from .obstacles import ObstacleMap
+from .pathfinding import (
+    DIRECTIONS, HEURISTIC_WEIGHT, SQRT2, TURN_PENALTIES,
+    _blocked_mask, _reconstruct_packed_path, heuristic
+)
+
+# Direction index for each (dx, dy) step
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTIONS)}
+
+
+class _JumpGrid:
+    """
+    Walkable cells of a search box plus lazily built straight-jump tables.
+
+    For each row (or column) and direction, the sorted positions where a
+    straight jump must stop (a blocked cell or a cell with a forced
+    neighbor) are computed once with NumPy. A straight jump is then a
+    bisect instead of a cell-by-cell scan.
+    """
+
+    def __init__(self, walk: np.ndarray, goal: tuple[int, int]):
+        # Pad with a blocked border so neighbor reads never leave the array
+        self._walk = np.pad(walk, 1)
+        self._flat = self._walk.tobytes()
+        self._stride = self._walk.shape[1]
+        self.goal = goal
+        self._goal_walkable = self.walkable(*goal)
+        self._stops: dict[tuple[int, int, int], list[int]] = {}
+
+    def walkable(self, x: int, y: int) -> bool:
+        """Whether box cell (x, y) can be entered."""
+        return self._flat[(x + 1) * self._stride + y + 1] == 1
+
+    def _stop_positions(self, axis: int, line: int, step: int) -> list[int]:
+        """
+        Sorted stop positions along row y=line (axis 0) or column x=line (axis 1).
+
+        A stop is a walkable cell with a forced neighbor, or the first
+        blocked cell after a walkable run. Jumps start from a walkable
+        cell, so the first stop ahead decides the jump.
+        """
+        key = (axis, line, step)
+        stops = self._stops.get(key)
+        if stops is None:
+            w = self._walk
+            i = line + 1
+            if axis == 0:
+                here, side_a, side_b = w[1:-1, i], w[1:-1, i - 1], w[1:-1, i + 1]
+                prev = w[:-2, i] if step > 0 else w[2:, i]
+                behind_a = w[:-2, i - 1] if step > 0 else w[2:, i - 1]
+                behind_b = w[:-2, i + 1] if step > 0 else w[2:, i + 1]
+            else:
+                here, side_a, side_b = w[i, 1:-1], w[i - 1, 1:-1], w[i + 1, 1:-1]
+                prev = w[i, :-2] if step > 0 else w[i, 2:]
+                behind_a = w[i - 1, :-2] if step > 0 else w[i - 1, 2:]
+                behind_b = w[i + 1, :-2] if step > 0 else w[i + 1, 2:]
+            forced = (side_a & ~behind_a) | (side_b & ~behind_b)
+            stops = np.flatnonzero(np.where(here, forced, prev)).tolist()
+            self._stops[key] = stops
+        return stops
+
+    def jump_straight(self, x: int, y: int, dx: int, dy: int) -> tuple[int, int] | None:
+        """Jump point on an orthogonal ray from (x, y), exclusive."""
+        if not self.walkable(x + dx, y + dy):
+            return None
+
+        gx, gy = self.goal
+        if dx:
+            stops = self._stop_positions(0, y, dx)
+            pos, goal_on_line, goal_pos = x, gy == y, gx
+        else:
+            stops = self._stop_positions(1, x, dy)
+            pos, goal_on_line, goal_pos = y, gx == x, gy
+        goal_on_line = goal_on_line and self._goal_walkable
+        step = dx or dy
+
+        if step > 0:
+            i = bisect_right(stops, pos)
+            stop = stops[i] if i < len(stops) else None
+            if goal_on_line and pos < goal_pos and (stop is None or goal_pos <= stop):
+                return self.goal
+        else:
+            i = bisect_left(stops, pos) - 1
+            stop = stops[i] if i >= 0 else None
+            if goal_on_line and goal_pos < pos and (stop is None or goal_pos >= stop):
+                return self.goal
+
+        if stop is None:
+            return None
+        point = (stop, y) if dx else (x, stop)
+        return point if self.walkable(*point) else None
+
+    def jump_diagonal(self, x: int, y: int, dx: int, dy: int) -> tuple[int, int] | None:
+        """Jump point on a diagonal ray from (x, y), exclusive."""
+        gx, gy = self.goal
+        while True:
+            is_goal_next = x + dx == gx and y + dy == gy
+            # No corner cutting (except onto the goal, as in astar_search)
+            if not is_goal_next and not (
+                self.walkable(x + dx, y) and self.walkable(x, y + dy)
+            ):
+                return None
+            x += dx
+            y += dy
+            if not self.walkable(x, y):
+                return None
+            if is_goal_next:
+                return x, y
+            if self.jump_straight(x, y, dx, 0) or self.jump_straight(x, y, 0, dy):
+                return x, y
+
+
+def jps_search(
+    obstacle_map: ObstacleMap,
+    start_x: float, start_y: float,
+    end_x: float, end_y: float,
+    trace_radius: float = 0,
+    allowed_cells: set[tuple[int, int]] | None = None,
+    extra_blocked: set[tuple[int, int]] | None = None,
+    extra_grid: tuple[np.ndarray, tuple[int, int]] | None = None,
+    allowed_grid: tuple[np.ndarray, tuple[int, int]] | None = None
+) -> list[tuple[float, float]]:
+    """
+    Find a path with Jump Point Search (8-direction, no corner cutting).
+
+    Takes the same arguments and blocking rules as astar_search. Instead of
+    pushing every neighbor, each search node jumps along straight or
+    diagonal rays until it reaches the goal, an obstacle, or a cell with a
+    forced neighbor. Symmetric paths are skipped, so far fewer nodes enter
+    the open set. A diagonal step needs both orthogonal neighbors free.
+
+    Turn penalties are charged between consecutive jumps. Every turn in a
+    JPS path happens at a jump point, so each turn is still penalized once.
+
+    Returns:
+        List of (x, y) waypoints in world coordinates, or empty list if no path
+    """
+    resolution = obstacle_map.resolution
+    allowed = allowed_cells or set()
+    extra = extra_blocked or set()
+
+    # Convert to grid coordinates
+    start_gx = int(round(start_x / resolution))
+    start_gy = int(round(start_y / resolution))
+    end_gx = int(round(end_x / resolution))
+    end_gy = int(round(end_y / resolution))
+
+    # Search box, as in astar_search; coordinates below are box-relative
+    min_gx, min_gy, max_gx, max_gy = obstacle_map.get_bounds()
+    box_gx = min(min_gx, start_gx, end_gx)
+    box_gy = min(min_gy, start_gy, end_gy)
+    width = max(max_gx, start_gx, end_gx) - box_gx + 1
+    height = max(max_gy, start_gy, end_gy) - box_gy + 1
+    lo_x, hi_x = min_gx - box_gx, max_gx - box_gx
+    lo_y, hi_y = min_gy - box_gy, max_gy - box_gy
+    end_rx, end_ry = end_gx - box_gx, end_gy - box_gy
+
+    # Walkable cells: unblocked and inside the bounds; the goal always is
+    walk = ~_blocked_mask(
+        obstacle_map, trace_radius, allowed, extra, box_gx, box_gy, width, height,
+        extra_grid, allowed_grid
+    )
+    walk[:lo_x] = False
+    walk[hi_x + 1:] = False
+    walk[:, :lo_y] = False
+    walk[:, hi_y + 1:] = False
+    if lo_x <= end_rx <= hi_x and lo_y <= end_ry <= hi_y:
+        walk[end_rx, end_ry] = True
+    grid = _JumpGrid(walk, (end_rx, end_ry))
+
+    def successor_directions(dx: int, dy: int) -> list[tuple[int, int]]:
+        """Pruned directions to explore from a node reached moving (dx, dy)."""
+        if dx == 0 and dy == 0:
+            return list(DIRECTIONS)
+        if dx and dy:
+            return [(dx, dy), (dx, 0), (0, dy)]
+        if dx:
+            return [(dx, 0), (dx, 1), (dx, -1), (0, 1), (0, -1)]
+        return [(0, dy), (1, dy), (-1, dy), (1, 0), (-1, 0)]
+
+    start_id = (start_gx - box_gx) * height + (start_gy - box_gy)
+    end_id = end_rx * height + end_ry
+
+    # open_set entries: (f_score, g_score, cell_id, direction)
+    open_set: list[tuple[float, float, int, int]] = []
+    closed = bytearray(width * height)
+    g_scores: dict[int, float] = {start_id: 0.0}
+    came_from: dict[int, int] = {}
+
+    start_h = heuristic(start_gx, start_gy, end_gx, end_gy)
+    heapq.heappush(open_set, (start_h * HEURISTIC_WEIGHT, 0.0, start_id, -1))
+
+    iterations = 0
+    max_iterations = 100000
+
+    while open_set and iterations < max_iterations:
+        iterations += 1
+
+        _, g, cid, c_dir = heapq.heappop(open_set)
+
+        if cid == end_id:
+            return _reconstruct_packed_path(
+                came_from, cid, start_id, box_gx, box_gy, height, resolution
+            )
+
+        if closed[cid]:
+            continue
+        closed[cid] = 1
+        cx, cy = divmod(cid, height)
+
+        pdx, pdy = DIRECTIONS[c_dir] if c_dir >= 0 else (0, 0)
+        for dx, dy in successor_directions(pdx, pdy):
+            if dx and dy:
+                point = grid.jump_diagonal(cx, cy, dx, dy)
+            else:
+                point = grid.jump_straight(cx, cy, dx, dy)
+            if point is None:
+                continue
+
+            nx, ny = point
+            nid = nx * height + ny
+            if closed[nid]:
+                continue
+
+            # Jumps are straight or diagonal runs: cost is steps times step length
+            dir_idx = DIRECTION_INDEX[(dx, dy)]
+            steps = max(abs(nx - cx), abs(ny - cy))
+            move_cost = steps * (SQRT2 if dx and dy else 1.0)
+            if c_dir >= 0 and c_dir != dir_idx:
+                dir_diff = abs(dir_idx - c_dir)
+                if dir_diff > 4:
+                    dir_diff = 8 - dir_diff  # Wrap around
+                move_cost += TURN_PENALTIES.get(dir_diff, 0.5)
+
+            new_g = g + move_cost
+
+            old_g = g_scores.get(nid)
+            if old_g is not None and old_g <= new_g:
+                continue
+
+            g_scores[nid] = new_g
+            came_from[nid] = cid
+
+            h = heuristic(nx, ny, end_rx, end_ry)
+            heapq.heappush(open_set, (new_g + h * HEURISTIC_WEIGHT, new_g, nid, dir_idx))
+
+    # No path found
+    return []
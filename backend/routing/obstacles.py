@@ -1,9 +1,12 @@
 """Obstacle map for PCB routing."""
 import math
+import weakref
+from functools import lru_cache
+
 import numpy as np
 from scipy import ndimage
 from dataclasses import dataclass
-from typing import Optional
+from typing import ClassVar, Optional
 
 from backend.pcb.parser import PCBParser
 from backend.pcb.models import PadInfo, TraceInfo, ViaInfo, GraphicLine, GraphicArc
@@ -11,14 +14,114 @@ from backend.routing.geometry import GeometryChecker
 from backend.routing.spatial_index import SpatialIndex, ELEM_PAD, ELEM_TRACE, ELEM_VIA
 
 
+@lru_cache(maxsize=None)
+def disk_structure(grid_radius: int) -> np.ndarray:
+    """
+    Disk-shaped structuring element of the given radius in grid cells.
+
+    Cached per radius and returned read-only, since every dilation by the
+    same trace radius uses the same element.
+    """
+    y, x = np.ogrid[-grid_radius:grid_radius + 1, -grid_radius:grid_radius + 1]
+    disk = x * x + y * y <= grid_radius * grid_radius
+    disk.setflags(write=False)
+    return disk
+
+
+@lru_cache(maxsize=1024)
+def _circle_offsets(
+    r: float, off_x: float, off_y: float, resolution: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Cell offsets, from the nearest grid cell, of a circle of radius r.
+
+    (off_x, off_y) is the circle center relative to that cell. Pads of one
+    footprint (and rotated pads, blocked by their bounding circle) repeat
+    the same radius and offset, so the offsets are cached and read-only.
+    """
+    gr = int(math.ceil(r / resolution)) + 1
+
+    # Distance from each cell center to the circle center (squared),
+    # broadcast from the window's row and column offsets
+    offsets = np.arange(-gr, gr + 1)
+    dist_x = offsets * resolution - off_x
+    dist_y = offsets * resolution - off_y
+    inside = (dist_x * dist_x)[:, None] + (dist_y * dist_y)[None, :] <= r * r
+    ix, iy = np.nonzero(inside)
+    dxs = (ix - gr).astype(np.int32)
+    dys = (iy - gr).astype(np.int32)
+    dxs.setflags(write=False)
+    dys.setflags(write=False)
+    return dxs, dys
+
+
+def dilate_disk(grid: np.ndarray, grid_radius: int) -> np.ndarray:
+    """
+    Dilate a boolean grid by disk_structure(grid_radius).
+
+    Same result as ndimage.binary_dilation with the disk (cells past the
+    edges count as free), but the disk is taken row by row: one running
+    maximum along x per distinct row half-width, ORed into the result at
+    each row offset. That is 2r + 1 array ORs instead of a pass per disk cell.
+    """
+    disk = disk_structure(grid_radius)
+    cells = grid.view(np.uint8)
+    rows = grid.shape[0]
+    dilated = np.zeros_like(grid)
+    runs: dict[int, np.ndarray] = {}
+    for dy, half in enumerate(disk.sum(axis=1) // 2, start=-grid_radius):
+        if abs(dy) >= rows:
+            continue
+        run = runs.get(half)
+        if run is None:
+            run = ndimage.maximum_filter1d(cells, 2 * half + 1, axis=1, mode="constant")
+            run = runs[half] = run.view(bool)
+        if dy >= 0:
+            dilated[dy:] |= run[:rows - dy]
+        else:
+            dilated[:dy] |= run[-dy:]
+    return dilated
+
+
+def _pack_rows(grid: np.ndarray) -> np.ndarray:
+    """
+    Pack a boolean grid into uint64 words, 64 columns per word.
+
+    Bit c % 64 of word c // 64 in a row holds column c.
+    """
+    height, width = grid.shape
+    packed = np.zeros((height, (width + 63) // 64 * 8), dtype=np.uint8)
+    packed[:, :(width + 7) // 8] = np.packbits(grid, axis=1, bitorder='little')
+    return packed.view('<u8')
+
+
 @dataclass
 class ObstacleMap:
     """
     Grid-based obstacle map for routing.
 
-    Uses a sparse representation - only stores blocked cells.
+    Blocked cells are stored as a boolean NumPy grid covering the bounding
+    box of all blocked cells; anything outside that box is free. A
+    bit-packed copy of the grid lets radius checks skip empty windows.
     """
 
+    # Rasterized cells per parser and (layer, clearance, resolution), grouped
+    # by net ID, so maps that only differ in allowed_net_id rasterize the
+    # board once
+    _net_cells_cache: ClassVar[weakref.WeakKeyDictionary] = weakref.WeakKeyDictionary()
+
+    # Rasterized cells of the elements every copper layer has (through-hole
+    # pads, vias, board edges) per parser and (clearance, resolution), as
+    # (pad chunks, via and edge chunks); the layers of a board share them
+    _shared_cells_cache: ClassVar[weakref.WeakKeyDictionary] = weakref.WeakKeyDictionary()
+
+    # Grid columns per strip when rasterizing a line segment
+    LINE_STRIP_CELLS = 32
+
+    # Radius checks to answer by window scans before building the distance
+    # transform (about as long to build as this many scans take)
+    DISTANCE_TRANSFORM_AFTER = 10000
+
     def __init__(
         self,
         parser: PCBParser,
@@ -43,14 +146,27 @@ class ObstacleMap:
         self.resolution = grid_resolution
         self.allowed_net_id = allowed_net_id
 
-        # Blocked cells: set of (grid_x, grid_y) tuples
-        self._blocked: set[tuple[int, int]] = set()
-
-        # Cache for expanded blocked cells by radius (in grid units)
+        # Blocked cells: grid[gy - origin_gy, gx - origin_gx]
+        self._grid = np.zeros((0, 0), dtype=bool)
+        self._grid_origin = (0, 0)
+        # The same cells packed by _pack_rows
+        self._bits = _pack_rows(self._grid)
+        # (net_id, gxs, gys) cell index arrays collected while rasterizing
+        self._cell_chunks: list[tuple[Optional[int], np.ndarray, np.ndarray]] = []
+        # Lazily built set view of the blocked cells
+        self._blocked_set: Optional[set[tuple[int, int]]] = None
+        # Chessboard distance (cells) to the nearest blocked cell, built once
+        # DISTANCE_TRANSFORM_AFTER radius checks have been made
+        self._distance: Optional[np.ndarray] = None
+        self._radius_checks = 0
+
+        # Caches for expanded blocked grids and cell sets by radius (in centiunits)
+        self._expanded_grid_cache: dict[int, tuple[np.ndarray, tuple[int, int]]] = {}
+        self._expanded_columns_cache: dict[int, np.ndarray] = {}
         self._expanded_cache: dict[int, set[tuple[int, int]]] = {}
 
         # Build obstacle map
-        self._build_obstacles()
+        self._build_grid(self._net_cells())
 
     def _to_grid(self, x: float, y: float) -> tuple[int, int]:
         """Convert world coordinates to grid coordinates."""
@@ -63,35 +179,74 @@ class ObstacleMap:
         """Convert grid coordinates to world coordinates."""
         return (gx * self.resolution, gy * self.resolution)
 
-    def _block_circle(self, cx: float, cy: float, radius: float) -> None:
+    def _add_cells(self, gxs: np.ndarray, gys: np.ndarray, net_id: Optional[int]) -> None:
+        """Queue grid cells of an element on the given net to be marked as blocked."""
+        if gxs.size:
+            self._cell_chunks.append((net_id, gxs.astype(np.int32), gys.astype(np.int32)))
+
+    def _net_cells(self) -> dict[Optional[int], tuple[np.ndarray, np.ndarray]]:
+        """
+        Rasterized cells of every obstacle on this layer, by net ID (cached).
+
+        Edge cuts are stored under None.
+        """
+        by_key = self._net_cells_cache.setdefault(self.parser, {})
+        key = (self.layer, self.clearance, self.resolution)
+        cells = by_key.get(key)
+        if cells is None:
+            self._build_obstacles()
+            chunks_by_net: dict[Optional[int], list[tuple[np.ndarray, np.ndarray]]] = {}
+            for net_id, gxs, gys in self._cell_chunks:
+                chunks_by_net.setdefault(net_id, []).append((gxs, gys))
+            self._cell_chunks = []
+            cells = {
+                net_id: (
+                    np.concatenate([c[0] for c in chunks]),
+                    np.concatenate([c[1] for c in chunks]),
+                )
+                for net_id, chunks in chunks_by_net.items()
+            }
+            by_key[key] = cells
+        return cells
+
+    def _build_grid(self, net_cells: dict[Optional[int], tuple[np.ndarray, np.ndarray]]) -> None:
+        """Fold the rasterized cells of all nets but the allowed one into the blocked grid."""
+        kept = [
+            c for net_id, c in net_cells.items()
+            if self.allowed_net_id is None or net_id != self.allowed_net_id
+        ]
+        if not kept:
+            return
+        gxs = np.concatenate([c[0] for c in kept])
+        gys = np.concatenate([c[1] for c in kept])
+
+        min_gx, min_gy = int(gxs.min()), int(gys.min())
+        height = int(gys.max()) - min_gy + 1
+        width = int(gxs.max()) - min_gx + 1
+        self._grid = np.zeros((height, width), dtype=bool)
+        self._grid[gys - min_gy, gxs - min_gx] = True
+        self._grid_origin = (min_gx, min_gy)
+        self._bits = _pack_rows(self._grid)
+
+    def _block_circle(
+        self, cx: float, cy: float, radius: float, net_id: Optional[int] = None
+    ) -> None:
         """Block all grid cells within a circle."""
         # Expand by clearance
         r = radius + self.clearance
-        r_sq = r * r  # Use squared distance to avoid sqrt
-
-        # Grid center and radius
-        gx, gy = self._to_grid(cx, cy)
-        gr = int(math.ceil(r / self.resolution)) + 1
 
         # Offset from grid center to actual center (for accurate distance calc)
+        gx, gy = self._to_grid(cx, cy)
         gcx, gcy = self._to_world(gx, gy)
-        off_x = cx - gcx
-        off_y = cy - gcy
-        res = self.resolution
-
-        for dx in range(-gr, gr + 1):
-            for dy in range(-gr, gr + 1):
-                # Distance from cell center to circle center (squared)
-                dist_x = dx * res - off_x
-                dist_y = dy * res - off_y
-                if dist_x * dist_x + dist_y * dist_y <= r_sq:
-                    self._blocked.add((gx + dx, gy + dy))
+        dxs, dys = _circle_offsets(r, cx - gcx, cy - gcy, self.resolution)
+        self._add_cells(gx + dxs, gy + dys, net_id)
 
     def _block_rect(
         self,
         cx: float, cy: float,
         width: float, height: float,
-        angle: float = 0
+        angle: float = 0,
+        net_id: Optional[int] = None
     ) -> None:
         """Block all grid cells within a rectangle."""
         # Expand by clearance
@@ -101,23 +256,25 @@ class ObstacleMap:
         # For rotated rectangles, use bounding circle approximation
         if angle != 0:
             # Use diagonal as radius
-            radius = math.sqrt(w * w + h * h) / 2
-            self._block_circle(cx, cy, radius - self.clearance)
+            radius = math.hypot(w, h) / 2
+            self._block_circle(cx, cy, radius - self.clearance, net_id)
             return
 
         # Axis-aligned rectangle
         gx1, gy1 = self._to_grid(cx - w / 2, cy - h / 2)
         gx2, gy2 = self._to_grid(cx + w / 2, cy + h / 2)
 
-        for gx in range(gx1, gx2 + 1):
-            for gy in range(gy1, gy2 + 1):
-                self._blocked.add((gx, gy))
+        n_rows = max(gy2 - gy1 + 1, 0)
+        gxs = np.repeat(np.arange(gx1, gx2 + 1), n_rows)
+        gys = np.tile(np.arange(gy1, gy2 + 1), max(gx2 - gx1 + 1, 0))
+        self._add_cells(gxs, gys, net_id)
 
     def _block_line(
         self,
         x1: float, y1: float,
         x2: float, y2: float,
-        width: float
+        width: float,
+        net_id: Optional[int] = None
     ) -> None:
         """Block all grid cells along a line segment with given width."""
         # Expand by clearance
@@ -130,11 +287,9 @@ class ObstacleMap:
         length_sq = dx * dx + dy * dy
 
         if length_sq < 0.000001:
-            self._block_circle(x1, y1, r - self.clearance)
+            self._block_circle(x1, y1, r - self.clearance, net_id)
             return
 
-        length = math.sqrt(length_sq)
-
         # Compute bounding box of the capsule shape
         min_x = min(x1, x2) - r
         max_x = max(x1, x2) + r
@@ -147,76 +302,95 @@ class ObstacleMap:
 
         res = self.resolution
 
-        # Check each cell in bounding box
-        for gx in range(gx1, gx2 + 1):
-            for gy in range(gy1, gy2 + 1):
-                # Cell center in world coordinates
-                px = gx * res
-                py = gy * res
-
-                # Vector from line start to point
-                apx = px - x1
-                apy = py - y1
-
-                # Project point onto line: t = (AP · AB) / |AB|²
-                t = (apx * dx + apy * dy) / length_sq
+        # A long diagonal (board edges) leaves most of its bounding box
+        # empty, so check strips of columns, each only over the rows the
+        # capsule can reach within the strip (one cell of rounding slack).
+        # Horizontal and vertical capsules fill their box: one strip
+        strip = self.LINE_STRIP_CELLS if dx != 0 and dy != 0 else gx2 - gx1 + 1
+        for sx1 in range(gx1, gx2 + 1, strip):
+            sx2 = min(sx1 + strip - 1, gx2)
+            sy1, sy2 = gy1, gy2
+            if dx != 0:
+                ta = min(max((sx1 * res - r - x1) / dx, 0.0), 1.0)
+                tb = min(max((sx2 * res + r - x1) / dx, 0.0), 1.0)
+                ya, yb = y1 + ta * dy, y1 + tb * dy
+                sy1 = max(gy1, self._to_grid(0, min(ya, yb) - r)[1] - 1)
+                sy2 = min(gy2, self._to_grid(0, max(ya, yb) + r)[1] + 1)
+
+            # Check each cell in the strip at once, broadcasting a column
+            # of x terms against a row of y terms
+            # Cell centers in world coordinates
+            px = (np.arange(sx1, sx2 + 1) * res)[:, None]
+            py = (np.arange(sy1, sy2 + 1) * res)[None, :]
+
+            # Project points onto line: t = (AP · AB) / |AB|², clamped to the segment
+            t = np.clip(((px - x1) * dx + (py - y1) * dy) / length_sq, 0, 1)
+
+            # Distance squared from cell to closest point on segment
+            dist_x = px - (x1 + t * dx)
+            dist_y = py - (y1 + t * dy)
+            inside = dist_x * dist_x + dist_y * dist_y <= r_sq
+            ix, iy = np.nonzero(inside)
+            self._add_cells(sx1 + ix, sy1 + iy, net_id)
 
-                # Clamp t to [0, 1] to stay on segment
-                if t < 0:
-                    t = 0
-                elif t > 1:
-                    t = 1
-
-                # Closest point on segment
-                closest_x = x1 + t * dx
-                closest_y = y1 + t * dy
-
-                # Distance squared from cell to closest point
-                dist_x = px - closest_x
-                dist_y = py - closest_y
-                dist_sq = dist_x * dist_x + dist_y * dist_y
+    def _build_obstacles(self) -> None:
+        """
+        Rasterize all PCB elements on this layer into cell chunks.
 
-                if dist_sq <= r_sq:
-                    self._blocked.add((gx, gy))
+        Elements of the allowed net are included too, tagged with their net
+        ID; _build_grid leaves them out. Elements on every copper layer come
+        from _shared_cell_chunks.
+        """
+        copper_layers = self.parser.COPPER_LAYERS
+        on_copper = self.layer in copper_layers
+        pad_chunks, other_chunks = self._shared_cell_chunks()
 
-    def _build_obstacles(self) -> None:
-        """Build obstacle map from PCB elements."""
         # Add pads on this layer
+        if on_copper:
+            self._cell_chunks.extend(pad_chunks)
         for pad in self.parser.pads:
             if self.layer not in pad.layers:
                 continue
-            # Skip pads of allowed net
-            if self.allowed_net_id is not None and pad.net_id == self.allowed_net_id:
+            if on_copper and all(layer in pad.layers for layer in copper_layers):
                 continue
-
-            if pad.shape == 'circle':
-                radius = min(pad.width, pad.height) / 2
-                self._block_circle(pad.x, pad.y, radius)
-            elif pad.shape == 'oval':
-                # Use larger dimension as circle approximation
-                radius = max(pad.width, pad.height) / 2
-                self._block_circle(pad.x, pad.y, radius)
-            else:  # rect, roundrect
-                self._block_rect(pad.x, pad.y, pad.width, pad.height, pad.angle)
+            self._block_pad(pad)
 
         # Add traces on this layer
         for trace in self.parser.get_traces_by_layer(self.layer):
-            # Skip traces of allowed net
-            if self.allowed_net_id is not None and trace.net_id == self.allowed_net_id:
-                continue
             self._block_line(
                 trace.start_x, trace.start_y,
                 trace.end_x, trace.end_y,
-                trace.width
+                trace.width,
+                trace.net_id
             )
 
+        # Vias (they span all layers) and edge cuts
+        self._cell_chunks.extend(other_chunks)
+
+    def _shared_cell_chunks(self) -> tuple[list, list]:
+        """
+        Cell chunks of the pads on every copper layer, and of vias and edge cuts (cached).
+
+        Returns:
+            (pad chunks, via and edge chunks), shared by the maps of all layers
+        """
+        by_key = self._shared_cells_cache.setdefault(self.parser, {})
+        key = (self.clearance, self.resolution)
+        shared = by_key.get(key)
+        if shared is not None:
+            return shared
+
+        own_chunks, self._cell_chunks = self._cell_chunks, []
+        copper_layers = self.parser.COPPER_LAYERS
+        for pad in self.parser.pads:
+            if all(layer in pad.layers for layer in copper_layers):
+                self._block_pad(pad)
+        pad_chunks, self._cell_chunks = self._cell_chunks, []
+
         # Add vias (they span all layers)
         for via in self.parser.vias:
-            # Skip vias of allowed net
-            if self.allowed_net_id is not None and via.net_id == self.allowed_net_id:
-                continue
             radius = via.size / 2
-            self._block_circle(via.x, via.y, radius)
+            self._block_circle(via.x, via.y, radius, via.net_id)
 
         # Add edge cuts (board outline)
         for item in self.parser.edge_cuts:
@@ -227,6 +401,38 @@ class ObstacleMap:
                     item.end_x, item.end_y,
                     item.width + self.clearance * 2
                 )
+        shared = (pad_chunks, self._cell_chunks)
+        self._cell_chunks = own_chunks
+
+        by_key[key] = shared
+        return shared
+
+    def _block_pad(self, pad: PadInfo) -> None:
+        """Block the grid cells of a pad."""
+        if pad.shape == 'circle':
+            radius = min(pad.width, pad.height) / 2
+            self._block_circle(pad.x, pad.y, radius, pad.net_id)
+        elif pad.shape == 'oval':
+            # Use larger dimension as circle approximation
+            radius = max(pad.width, pad.height) / 2
+            self._block_circle(pad.x, pad.y, radius, pad.net_id)
+        else:  # rect, roundrect
+            self._block_rect(
+                pad.x, pad.y, pad.width, pad.height, pad.angle, pad.net_id
+            )
+
+    @property
+    def _blocked(self) -> set[tuple[int, int]]:
+        """Blocked cells as a set of (grid_x, grid_y) tuples (built on first use)."""
+        if self._blocked_set is None:
+            self._blocked_set = self._grid_to_cells(self._grid, self._grid_origin)
+        return self._blocked_set
+
+    @staticmethod
+    def _grid_to_cells(grid: np.ndarray, origin: tuple[int, int]) -> set[tuple[int, int]]:
+        """Convert a blocked grid back to a set of (grid_x, grid_y) tuples."""
+        gys, gxs = np.nonzero(grid)
+        return set(zip((gxs + origin[0]).tolist(), (gys + origin[1]).tolist()))
 
     def is_blocked(self, x: float, y: float, radius: float = 0, net_id=None) -> bool:
         """
@@ -244,7 +450,7 @@ class ObstacleMap:
         gx, gy = self._to_grid(x, y)
 
         if radius <= 0:
-            return (gx, gy) in self._blocked
+            return self.is_grid_blocked(gx, gy)
 
         # Check cells within radius (using squared distance)
         radius_sq = radius * radius
@@ -256,19 +462,61 @@ class ObstacleMap:
         off_x = x - gcx
         off_y = y - gcy
 
-        for dx in range(-gr, gr + 1):
-            for dy in range(-gr, gr + 1):
-                if (gx + dx, gy + dy) in self._blocked:
-                    # Check actual distance (squared)
-                    dist_x = dx * res - off_x
-                    dist_y = dy * res - off_y
-                    if dist_x * dist_x + dist_y * dist_y <= radius_sq:
-                        return True
-        return False
+        # The cell under the point decides most checks inside obstacles
+        if off_x * off_x + off_y * off_y <= radius_sq and self.is_grid_blocked(gx, gy):
+            return True
+
+        # A nearest blocked cell D cells away (chessboard distance) is
+        # between D and sqrt(2) * D cells away; off the cell center, the
+        # query point may be up to its offset closer or farther
+        ox, oy = self._grid_origin
+        height, width = self._grid.shape
+        row, col = gy - oy, gx - ox
+        if self._distance is None:
+            self._radius_checks += 1
+            if self._radius_checks > self.DISTANCE_TRANSFORM_AFTER:
+                self._distance = self._distance_transform()
+        if self._distance is not None and 0 <= row < height and 0 <= col < width:
+            dist = int(self._distance[row, col]) * res
+            slack = math.sqrt(off_x * off_x + off_y * off_y) + 1e-9
+            if dist > radius + slack:
+                return False
+            if dist * math.sqrt(2) < radius - slack:
+                return True
+
+        # Window around (gx, gy), clipped to the grid
+        row0, row1 = max(gy - gr - oy, 0), min(gy + gr + 1 - oy, height)
+        col0, col1 = max(gx - gr - ox, 0), min(gx + gr + 1 - ox, width)
+        if row0 >= row1 or col0 >= col1 or not self._any_in_window(row0, row1, col0, col1):
+            return False
+
+        # Check actual distance (squared) to the blocked cells in the window
+        rows, cols = np.nonzero(self._grid[row0:row1, col0:col1])
+        dist_x = (cols + (col0 + ox - gx)) * res - off_x
+        dist_y = (rows + (row0 + oy - gy)) * res - off_y
+        return bool(np.any(dist_x * dist_x + dist_y * dist_y <= radius_sq))
+
+    def _distance_transform(self) -> np.ndarray:
+        """Chessboard distance (in cells) from each grid cell to the nearest blocked one."""
+        if not self._grid.any():
+            return np.full(self._grid.shape, np.iinfo(np.int32).max, dtype=np.int32)
+        return ndimage.distance_transform_cdt(~self._grid, metric="chessboard")
+
+    def _any_in_window(self, row0: int, row1: int, col0: int, col1: int) -> bool:
+        """Check if any cell in grid rows [row0, row1) and columns [col0, col1) is blocked."""
+        # OR the rows together word by word, then mask the partial end words
+        w0, w1 = col0 >> 6, (col1 - 1) >> 6
+        words = np.bitwise_or.reduce(self._bits[row0:row1, w0:w1 + 1], axis=0).tolist()
+        words[0] &= ~((1 << (col0 & 63)) - 1)
+        words[-1] &= (1 << (col1 - (w1 << 6))) - 1
+        return any(words)
 
     def is_grid_blocked(self, gx: int, gy: int) -> bool:
         """Check if a grid cell is blocked."""
-        return (gx, gy) in self._blocked
+        col = gx - self._grid_origin[0]
+        row = gy - self._grid_origin[1]
+        height, width = self._grid.shape
+        return 0 <= row < height and 0 <= col < width and bool(self._grid[row, col])
 
     def get_bounds(self) -> tuple[int, int, int, int]:
         """Get grid bounds (min_gx, min_gy, max_gx, max_gy)."""
@@ -277,69 +525,82 @@ class ObstacleMap:
         max_gx, max_gy = self._to_grid(info.max_x + 1, info.max_y + 1)
         return (min_gx, min_gy, max_gx, max_gy)
 
-    def get_expanded_blocked(self, radius: float) -> set[tuple[int, int]]:
+    def get_expanded_grid(self, radius: float) -> tuple[np.ndarray, tuple[int, int]]:
         """
-        Get blocked cells expanded by a radius, with caching.
+        Get the blocked grid expanded by a radius, with caching.
 
-        Uses numpy-based morphological dilation for speed.
+        Dilates the blocked grid with a disk-shaped structuring element.
 
         Args:
             radius: Expansion radius in world units (mm)
 
         Returns:
-            Set of blocked cells expanded by the given radius
+            (grid, (origin_gx, origin_gy)) with grid[gy - origin_gy, gx - origin_gx]
+            True for blocked cells
         """
         if radius <= 0:
-            return self._blocked
+            return self._grid, self._grid_origin
 
         # Convert to grid units and round to avoid floating point issues
         grid_radius = int(round(radius / self.resolution * 100))  # Use centiunits for key
 
-        if grid_radius in self._expanded_cache:
-            return self._expanded_cache[grid_radius]
+        if grid_radius in self._expanded_grid_cache:
+            return self._expanded_grid_cache[grid_radius]
 
-        if not self._blocked:
-            self._expanded_cache[grid_radius] = set()
-            return self._expanded_cache[grid_radius]
+        if not self._grid.any():
+            expanded = (self._grid, self._grid_origin)
+            self._expanded_grid_cache[grid_radius] = expanded
+            return expanded
 
-        # Get bounds of blocked cells
-        min_gx = min(c[0] for c in self._blocked)
-        max_gx = max(c[0] for c in self._blocked)
-        min_gy = min(c[1] for c in self._blocked)
-        max_gy = max(c[1] for c in self._blocked)
-
-        # Add padding for expansion
+        # Pad the grid so the dilation can grow past its edges
         actual_grid_radius = int(math.ceil(radius / self.resolution))
         pad = actual_grid_radius + 1
+        blocked_array = np.pad(self._grid, pad)
+
+        dilated = dilate_disk(blocked_array, actual_grid_radius)
+
+        origin = (self._grid_origin[0] - pad, self._grid_origin[1] - pad)
+        self._expanded_grid_cache[grid_radius] = (dilated, origin)
+        return dilated, origin
 
-        # Create numpy array (offset coordinates to start at 0)
-        width = max_gx - min_gx + 1 + 2 * pad
-        height = max_gy - min_gy + 1 + 2 * pad
+    def get_expanded_columns(self, radius: float) -> tuple[np.ndarray, tuple[int, int]]:
+        """
+        Get get_expanded_grid(radius) in x-major order, with caching.
 
-        blocked_array = np.zeros((height, width), dtype=np.uint8)
+        The searches index their blocked masks [gx, gy]; copying from this
+        layout reads whole columns instead of striding across every row.
 
-        # Fill blocked cells
-        for gx, gy in self._blocked:
-            blocked_array[gy - min_gy + pad, gx - min_gx + pad] = 1
+        Returns:
+            (columns, (origin_gx, origin_gy)) with columns[gx - origin_gx, gy - origin_gy]
+            True for blocked cells
+        """
+        grid, origin = self.get_expanded_grid(radius)
+        key = int(round(radius / self.resolution * 100)) if radius > 0 else 0
+        columns = self._expanded_columns_cache.get(key)
+        if columns is None:
+            columns = np.ascontiguousarray(grid.T)
+            self._expanded_columns_cache[key] = columns
+        return columns, origin
 
-        # Create circular structuring element for dilation
-        y, x = np.ogrid[-actual_grid_radius:actual_grid_radius + 1,
-                        -actual_grid_radius:actual_grid_radius + 1]
-        structuring_element = (x * x + y * y <= actual_grid_radius * actual_grid_radius).astype(np.uint8)
+    def get_expanded_blocked(self, radius: float) -> set[tuple[int, int]]:
+        """
+        Get blocked cells expanded by a radius, as a set (cached).
 
-        # Dilate using scipy
-        dilated = ndimage.binary_dilation(blocked_array, structure=structuring_element)
+        Args:
+            radius: Expansion radius in world units (mm)
+
+        Returns:
+            Set of blocked cells expanded by the given radius
+        """
+        if radius <= 0:
+            return self._blocked
 
-        # Convert back to set of coordinates
-        expanded: set[tuple[int, int]] = set()
-        gy_indices, gx_indices = np.where(dilated)
-        for gy_idx, gx_idx in zip(gy_indices, gx_indices):
-            gx = gx_idx + min_gx - pad
-            gy = gy_idx + min_gy - pad
-            expanded.add((gx, gy))
+        grid_radius = int(round(radius / self.resolution * 100))  # Use centiunits for key
 
-        self._expanded_cache[grid_radius] = expanded
-        return expanded
+        if grid_radius not in self._expanded_cache:
+            grid, origin = self.get_expanded_grid(radius)
+            self._expanded_cache[grid_radius] = self._grid_to_cells(grid, origin)
+        return self._expanded_cache[grid_radius]
 
 
 class ElementAwareMap:
@@ -438,13 +699,48 @@ class ElementAwareMap:
         if cached is not None:
             return cached
 
+        result = self._check_clearance(x, y, trace_radius, net_id)
+        self._blocked_cache[cache_key] = result
+        return result
+
+    def is_cell_blocked(
+        self,
+        gx: int,
+        gy: int,
+        trace_radius: float = 0,
+        net_id: Optional[int] = None
+    ) -> bool:
+        """
+        is_blocked() at the point of grid cell (gx, gy).
+
+        Searches that walk grid cells call this, so cached cells are looked
+        up without converting to world coordinates and back.
+        """
+        cache_key = (gx, gy, int(round(trace_radius * 1000)), net_id if net_id is not None else -1)
+        cached = self._blocked_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._check_clearance(
+            gx * self.resolution, gy * self.resolution, trace_radius, net_id
+        )
+        self._blocked_cache[cache_key] = result
+        return result
+
+    def _check_clearance(
+        self,
+        x: float,
+        y: float,
+        trace_radius: float,
+        net_id: Optional[int]
+    ) -> bool:
+        """Uncached is_blocked() check against the exact element geometry."""
         # Required clearance: design rule clearance + trace radius
         # Add a small buffer for grid discretization (half a grid cell)
         grid_buffer = 0.5 * self.resolution
         required_clearance = self.clearance + trace_radius + grid_buffer
 
         # Query spatial index for nearby elements (now returns IndexedElement)
-        result = False
         for indexed in self._spatial_index.query_nearby(
             x, y, required_clearance, self.layer
         ):
@@ -457,11 +753,9 @@ class ElementAwareMap:
 
             # Check clearance violation
             if distance < required_clearance:
-                result = True
-                break
+                return True
 
-        self._blocked_cache[cache_key] = result
-        return result
+        return False
 
     def _get_distance_to_indexed(self, x: float, y: float, indexed) -> float:
         """Get exact distance from point to indexed element edge."""
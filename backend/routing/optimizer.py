@@ -1,12 +1,41 @@
 """Path optimization for routed traces."""
 from __future__ import annotations
 import math
-from typing import Optional
+from typing import Optional, Sequence
+
+import numpy as np
 
 from backend.routing.hulls import Point, LineChain
 from backend.routing.hull_map import HullMap
 
 
+# Below this many points, building the coordinate array costs more than
+# the Python loops it replaces in the duplicate/colinear passes
+_VECTORIZE_MIN_POINTS = 48
+
+
+def _points_array(path: Sequence) -> np.ndarray:
+    """(N, 2) float array from a list of Points or (x, y) pairs."""
+    if path and isinstance(path[0], Point):
+        return np.array([(p.x, p.y) for p in path], dtype=np.float64)
+    return np.asarray(path, dtype=np.float64).reshape(-1, 2)
+
+
+def segments_at_45_degrees(path: Sequence, tolerance: float = 0.01) -> np.ndarray:
+    """
+    Check every segment of a path for a 45-degree-multiple direction.
+
+    Vectorized form of PathOptimizer._is_45_degree_angle over consecutive
+    points; accepts Points or (x, y) pairs.
+
+    Returns:
+        Boolean array with one entry per segment (len(path) - 1)
+    """
+    d = np.abs(np.diff(_points_array(path), axis=0))
+    adx, ady = d[:, 0], d[:, 1]
+    return (adx < tolerance) | (ady < tolerance) | (np.abs(adx - ady) < tolerance * ady)
+
+
 class PathOptimizer:
     """
     Optimizes routed paths for cleaner traces.
@@ -60,8 +89,9 @@ class PathOptimizer:
         # Convert to Points for easier manipulation
         points = [Point(x, y) for x, y in path]
 
-        # Pass 1: Remove duplicate/very close points
+        # Pass 1: Remove duplicate/very close points, then exactly colinear ones
         points = self._remove_duplicates(points)
+        points = self._simplify_dp(points)
 
         # Pass 2: Force all segments to 45-degree angles
         points = self._enforce_45_degrees(points, net_id)
@@ -100,8 +130,18 @@ class PathOptimizer:
         if len(points) < 2:
             return points
 
-        result = [points[0]]
-        for i, p in enumerate(points[1:], 1):
+        first_drop = 0
+        if len(points) >= _VECTORIZE_MIN_POINTS:
+            # Until the first point is dropped, each point is compared with its
+            # original predecessor, so that prefix is found with one array pass
+            gaps = np.hypot(*np.diff(_points_array(points), axis=0).T)
+            kept = np.append(gaps[:-1] > epsilon, gaps[-1] > 0.001)
+            if kept.all():
+                return points
+            first_drop = int(np.argmin(kept))
+
+        result = points[:first_drop + 1]
+        for i, p in enumerate(points[first_drop + 1:], first_drop + 1):
             # Always keep the last point
             if i == len(points) - 1:
                 if p.distance_to(result[-1]) > 0.001:  # Only skip true duplicates for endpoint
@@ -115,14 +155,71 @@ class PathOptimizer:
 
         return result
 
+    def _simplify_dp(self, points: list[Point], epsilon: float = 1e-6) -> list[Point]:
+        """
+        Douglas-Peucker simplification with an explicit stack.
+
+        A point is dropped when every point of its span lies within epsilon
+        of the segment joining the span's kept ends. Distances are to the
+        segment, not the infinite line, so colinear overshoots (reversals)
+        are kept for the passes that handle them. With the default epsilon
+        only points on a straight run are removed.
+        """
+        if len(points) < 3:
+            return points
+
+        xy = _points_array(points)
+        keep = np.zeros(len(points), dtype=bool)
+        keep[0] = keep[-1] = True
+
+        stack = [(0, len(points) - 1)]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo < 2:
+                continue
+            a = xy[lo]
+            ab = xy[hi] - a
+            ap = xy[lo + 1:hi] - a
+            denom = ab @ ab
+            if denom > 0:
+                t = np.clip(ap @ ab / denom, 0.0, 1.0)
+                dist = np.hypot(*(ap - t[:, None] * ab).T)
+            else:
+                dist = np.hypot(*ap.T)
+            i = int(np.argmax(dist))
+            if dist[i] > epsilon:
+                mid = lo + 1 + i
+                keep[mid] = True
+                stack.append((lo, mid))
+                stack.append((mid, hi))
+
+        if keep.all():
+            return points
+        return [p for p, k in zip(points, keep.tolist()) if k]
+
     def _merge_colinear(self, points: list[Point]) -> list[Point]:
         """Merge consecutive colinear segments."""
         if len(points) < 3:
             return points
 
-        result = [points[0]]
-
-        i = 1
+        first_merge = 1
+        if len(points) >= _VECTORIZE_MIN_POINTS:
+            # Turn angle at every interior vertex, measured between original
+            # neighbours. Until the first vertex is merged away that is exactly
+            # what the sequential pass below sees, so the prefix is kept as is.
+            d = np.diff(_points_array(points), axis=0)
+            angles = np.arctan2(d[:, 1], d[:, 0])
+            diff = angles[1:] - angles[:-1]
+            diff = np.where(diff > math.pi, diff - 2 * math.pi, diff)
+            diff = np.where(diff < -math.pi, diff + 2 * math.pi, diff)
+            keep = np.abs(diff) > self.angle_tolerance
+            if keep.all():
+                return points
+            first_merge = int(np.argmin(keep)) + 1
+
+        result = points[:first_merge]
+
+        i = first_merge
         while i < len(points) - 1:
             prev = result[-1]
             curr = points[i]
@@ -207,10 +304,20 @@ class PathOptimizer:
 
         return result
 
+    @staticmethod
+    def path_length(path: Sequence) -> float:
+        """Total length of a path of Points or (x, y) pairs."""
+        if len(path) < 2:
+            return 0.0
+        d = np.diff(_points_array(path), axis=0)
+        return float(np.hypot(d[:, 0], d[:, 1]).sum())
+
     def _path_length(self, points: list[Point]) -> float:
         """Calculate total length of a path."""
         if len(points) < 2:
             return 0.0
+        if len(points) >= _VECTORIZE_MIN_POINTS:
+            return self.path_length(points)
         total = 0.0
         for i in range(1, len(points)):
             total += points[i].distance_to(points[i-1])
@@ -531,17 +638,20 @@ class PathOptimizer:
         if len(points) < 2:
             return points
 
+        # Classify all segments up front; result[-1] is always points[i - 1]
+        # below, so each check sees the original segment
+        aligned = segments_at_45_degrees(points)
+        if aligned.all():
+            return points
+
         result = [points[0]]
 
         for i in range(1, len(points)):
             prev = result[-1]
             curr = points[i]
 
-            dx = curr.x - prev.x
-            dy = curr.y - prev.y
-
             # Check if already at 45° multiple
-            if self._is_45_degree_angle(dx, dy):
+            if aligned[i - 1]:
                 result.append(curr)
                 continue
 
@@ -568,24 +678,17 @@ class PathOptimizer:
 
     def _is_45_degree_angle(self, dx: float, dy: float, tolerance: float = 0.01) -> bool:
         """Check if a direction vector is at a 45-degree multiple."""
-        if abs(dx) < tolerance and abs(dy) < tolerance:
-            return True  # Zero-length, doesn't matter
-
         # 45° multiples: 0°, 45°, 90°, 135°, 180°, etc.
         # At these angles: |dx| == |dy| (diagonal) or dx==0 or dy==0 (orthogonal)
         adx = abs(dx)
         ady = abs(dy)
 
-        # Orthogonal (0° or 90°)
+        # Orthogonal (0° or 90°), including zero-length
         if adx < tolerance or ady < tolerance:
             return True
 
-        # Diagonal (45°)
-        ratio = adx / ady if ady > tolerance else float('inf')
-        if abs(ratio - 1.0) < tolerance:
-            return True
-
-        return False
+        # Diagonal (45°): |adx / ady - 1| < tolerance, without the division
+        return abs(adx - ady) < tolerance * ady
 
     def _compute_45_midpoint(
         self,
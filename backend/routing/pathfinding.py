@@ -3,11 +3,18 @@ import heapq
 import math
 
 import numpy as np
-from scipy import ndimage
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    numba = None
 
 from typing import Optional
-from .obstacles import ObstacleMap, ElementAwareMap
+from .obstacles import ObstacleMap, ElementAwareMap, dilate_disk
 from .geometry import GeometryChecker
+from .spatial_index import SegmentIndex
 
 
 # 8 directions: N, NE, E, SE, S, SW, W, NW (0°, 45°, 90°, etc.)
@@ -44,6 +51,70 @@ TURN_PENALTIES = {
 # Heuristic weight for weighted A* (>1 = faster but less optimal)
 HEURISTIC_WEIGHT = 1.5
 
+# Flat forms of the tables above for the compiled search kernel
+_DIRECTION_DX = tuple(dx for dx, _ in DIRECTIONS)
+_DIRECTION_DY = tuple(dy for _, dy in DIRECTIONS)
+_TURN_PENALTY_BY_DIFF = tuple(TURN_PENALTIES[diff] for diff in range(5))
+
+# Step cost plus turn penalty, by [previous direction + 1][direction];
+# row 0 is for the start node, which has no previous direction
+_MOVE_COSTS = tuple(
+    tuple(
+        DIRECTION_COSTS[d] if prev in (-1, d)
+        else DIRECTION_COSTS[d] + _TURN_PENALTY_BY_DIFF[min(abs(d - prev), 8 - abs(d - prev))]
+        for d in range(8)
+    )
+    for prev in range(-1, 8)
+)
+
+# Below this many pending segments, checking each one beats indexing them
+_PENDING_INDEX_MIN_SEGMENTS = 32
+
+
+def _dilate_grid(
+    grid: np.ndarray,
+    origin: tuple[int, int],
+    radius: float,
+    resolution: float
+) -> tuple[np.ndarray, tuple[int, int]]:
+    """
+    Dilate a (grid, origin) pair of covered cells by a radius.
+
+    The grid is padded first, so the dilation can grow past its edges.
+    """
+    grid_radius = int(math.ceil(radius / resolution)) if radius > 0 else 0
+    if grid_radius == 0:
+        return grid, origin
+    pad = grid_radius + 1
+    dilated = dilate_disk(np.pad(grid, pad), grid_radius)
+    return dilated, (origin[0] - pad, origin[1] - pad)
+
+
+def _dilate_cells(
+    cells: set[tuple[int, int]],
+    radius: float,
+    resolution: float
+) -> tuple[np.ndarray, tuple[int, int]]:
+    """
+    Rasterize a set of cells and dilate it by a radius.
+
+    Args:
+        cells: Non-empty set of grid cells
+        radius: Expansion radius in world units (mm)
+        resolution: Grid cell size (mm)
+
+    Returns:
+        (grid, (origin_gx, origin_gy)) with grid[gy - origin_gy, gx - origin_gx]
+        True for covered cells, like ObstacleMap.get_expanded_grid
+    """
+    coords = np.array(list(cells), dtype=np.int64)
+    min_gx, min_gy = coords.min(axis=0)
+    max_gx, max_gy = coords.max(axis=0)
+
+    grid = np.zeros((int(max_gy - min_gy) + 1, int(max_gx - min_gx) + 1), dtype=bool)
+    grid[coords[:, 1] - min_gy, coords[:, 0] - min_gx] = True
+    return _dilate_grid(grid, (int(min_gx), int(min_gy)), radius, resolution)
+
 
 def _expand_cells_fast(
     cells: set[tuple[int, int]],
@@ -64,43 +135,59 @@ def _expand_cells_fast(
     if not cells or radius <= 0:
         return cells
 
-    grid_radius = int(math.ceil(radius / resolution))
-    if grid_radius == 0:
-        return cells
-
-    # Get bounds
-    min_gx = min(c[0] for c in cells)
-    max_gx = max(c[0] for c in cells)
-    min_gy = min(c[1] for c in cells)
-    max_gy = max(c[1] for c in cells)
-
-    # Add padding for expansion
-    pad = grid_radius + 1
-    width = max_gx - min_gx + 1 + 2 * pad
-    height = max_gy - min_gy + 1 + 2 * pad
+    grid, (ox, oy) = _dilate_cells(cells, radius, resolution)
+    gys, gxs = np.nonzero(grid)
+    return set(zip((gxs + ox).tolist(), (gys + oy).tolist()))
 
-    # Create numpy array
-    cell_array = np.zeros((height, width), dtype=np.uint8)
-    for gx, gy in cells:
-        cell_array[gy - min_gy + pad, gx - min_gx + pad] = 1
 
-    # Create circular structuring element
-    y, x = np.ogrid[-grid_radius:grid_radius + 1,
-                    -grid_radius:grid_radius + 1]
-    structuring_element = (x * x + y * y <= grid_radius * grid_radius).astype(np.uint8)
-
-    # Dilate
-    dilated = ndimage.binary_dilation(cell_array, structure=structuring_element)
-
-    # Convert back to set
-    expanded: set[tuple[int, int]] = set()
-    gy_indices, gx_indices = np.where(dilated)
-    for gy_idx, gx_idx in zip(gy_indices, gx_indices):
-        gx = gx_idx + min_gx - pad
-        gy = gy_idx + min_gy - pad
-        expanded.add((gx, gy))
+class BucketQueue:
+    """
+    Priority queue of (f, ...) tuples bucketed by int(f).
+
+    Each bucket is a small heap, so push and pop cost log of the bucket size
+    rather than of the whole open set. Entries come out in exactly the
+    order heapq would return them: every entry in a lower bucket has a
+    lower f, and ties inside a bucket compare the full tuple. A push below
+    the cursor moves it back, since the weighted heuristic is not
+    consistent.
+    """
 
-    return expanded
+    __slots__ = ("_buckets", "_lowest", "_size")
+
+    def __init__(self):
+        self._buckets: dict[int, list[tuple]] = {}
+        self._lowest = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, entry: tuple) -> None:
+        """Add an entry; entry[0] is its priority."""
+        key = int(entry[0])
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = [entry]
+        else:
+            heapq.heappush(bucket, entry)
+        if self._size == 0 or key < self._lowest:
+            self._lowest = key
+        self._size += 1
+
+    def pop(self) -> tuple:
+        """Remove and return the smallest entry."""
+        if self._size == 0:
+            raise IndexError("pop from an empty BucketQueue")
+        buckets = self._buckets
+        key = self._lowest
+        bucket = buckets.get(key)
+        while not bucket:
+            buckets.pop(key, None)
+            key += 1
+            bucket = buckets.get(key)
+        self._lowest = key
+        self._size -= 1
+        return heapq.heappop(bucket)
 
 
 def heuristic(x1: int, y1: int, x2: int, y2: int) -> float:
@@ -110,20 +197,96 @@ def heuristic(x1: int, y1: int, x2: int, y2: int) -> float:
     return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
 
 
+def _paste_grid(
+    mask: np.ndarray,
+    columns: np.ndarray,
+    origin: tuple[int, int],
+    box_gx: int,
+    box_gy: int,
+    value: bool | None = None
+) -> None:
+    """
+    Apply an x-major grid at origin to an x-major box mask.
+
+    With value None the overlapping part of the mask is overwritten by the
+    grid; otherwise cells set in the grid are set to value.
+    """
+    ox, oy = origin
+    width, height = mask.shape
+    x0, x1 = max(box_gx, ox), min(box_gx + width, ox + columns.shape[0])
+    y0, y1 = max(box_gy, oy), min(box_gy + height, oy + columns.shape[1])
+    if x0 >= x1 or y0 >= y1:
+        return
+    window = columns[x0 - ox:x1 - ox, y0 - oy:y1 - oy]
+    target = mask[x0 - box_gx:x1 - box_gx, y0 - box_gy:y1 - box_gy]
+    if value is None:
+        target[...] = window
+    else:
+        target[window] = value
+
+
+def _blocked_mask(
+    obstacle_map: ObstacleMap,
+    trace_radius: float,
+    allowed: set[tuple[int, int]],
+    extra: set[tuple[int, int]],
+    box_gx: int,
+    box_gy: int,
+    width: int,
+    height: int,
+    extra_grid: Optional[tuple[np.ndarray, tuple[int, int]]] = None,
+    allowed_grid: Optional[tuple[np.ndarray, tuple[int, int]]] = None
+) -> np.ndarray:
+    """
+    Blocked flags for a width x height box of cells at (box_gx, box_gy).
+
+    Indexed mask[gx - box_gx, gy - box_gy]; flattened, cell (gx, gy) is at
+    (gx - box_gx) * height + (gy - box_gy). The x-major order makes packed
+    IDs sort like (gx, gy) tuples. The allowed and extra cells (and their
+    grids) are given unexpanded; they are dilated by trace_radius here.
+    """
+    mask = np.zeros((width, height), dtype=bool)
+
+    # Copy the part of the (expanded) obstacle grid that overlaps the box
+    columns, origin = obstacle_map.get_expanded_columns(trace_radius)
+    _paste_grid(mask, columns, origin, box_gx, box_gy)
+
+    # Extra and allowed cells are expanded by the trace radius like the
+    # obstacle grid (so same-net routing works), without leaving NumPy
+    resolution = obstacle_map.resolution
+    if extra:
+        grid, origin = _dilate_cells(extra, trace_radius, resolution)
+        _paste_grid(mask, grid.T, origin, box_gx, box_gy, True)
+    if extra_grid is not None:
+        grid, origin = _dilate_grid(*extra_grid, trace_radius, resolution)
+        _paste_grid(mask, grid.T, origin, box_gx, box_gy, True)
+    if allowed:
+        grid, origin = _dilate_cells(allowed, trace_radius, resolution)
+        _paste_grid(mask, grid.T, origin, box_gx, box_gy, False)
+    if allowed_grid is not None:
+        grid, origin = _dilate_grid(*allowed_grid, trace_radius, resolution)
+        _paste_grid(mask, grid.T, origin, box_gx, box_gy, False)
+    return mask
+
+
 def astar_search(
     obstacle_map: ObstacleMap,
     start_x: float, start_y: float,
     end_x: float, end_y: float,
     trace_radius: float = 0,
     allowed_cells: set[tuple[int, int]] | None = None,
-    extra_blocked: set[tuple[int, int]] | None = None
+    extra_blocked: set[tuple[int, int]] | None = None,
+    extra_grid: Optional[tuple[np.ndarray, tuple[int, int]]] = None,
+    allowed_grid: Optional[tuple[np.ndarray, tuple[int, int]]] = None
 ) -> list[tuple[float, float]]:
     """
     Find shortest path using weighted A* algorithm with 8-direction movement.
 
     Optimizations:
-    - Uses tuples instead of objects for nodes
-    - Direct access to blocked set
+    - Cells are packed into int IDs over the search box; heap entries are
+      (f, g, cell_id, direction) tuples
+    - Blocked checks index a flat bytes mask built once per search
+    - With Numba installed, the search loop runs as a compiled kernel
     - Bounded search area
     - Weighted heuristic for faster convergence
 
@@ -136,24 +299,45 @@ def astar_search(
                       (used for same-net routing)
         extra_blocked: Optional set of additional blocked cells
                       (used for pending user traces)
+        extra_grid: Optional (grid, origin) of additional blocked cells, as
+                    from PendingTraceStore.get_blocked_grid
+        allowed_grid: Optional (grid, origin) of allowed cells, like
+                      allowed_cells
 
     Returns:
         List of (x, y) waypoints in world coordinates, or empty list if no path
     """
+    path, _ = astar_search_with_status(
+        obstacle_map, start_x, start_y, end_x, end_y, trace_radius,
+        allowed_cells=allowed_cells, extra_blocked=extra_blocked,
+        extra_grid=extra_grid, allowed_grid=allowed_grid
+    )
+    return path
+
+
+def astar_search_with_status(
+    obstacle_map: ObstacleMap,
+    start_x: float, start_y: float,
+    end_x: float, end_y: float,
+    trace_radius: float = 0,
+    allowed_cells: set[tuple[int, int]] | None = None,
+    extra_blocked: set[tuple[int, int]] | None = None,
+    extra_grid: Optional[tuple[np.ndarray, tuple[int, int]]] = None,
+    allowed_grid: Optional[tuple[np.ndarray, tuple[int, int]]] = None
+) -> tuple[list[tuple[float, float]], bool]:
+    """
+    Run astar_search and also report why an empty result came back.
+
+    Returns:
+        (path, hit_iteration_limit): path as from astar_search;
+        hit_iteration_limit is True when the search gave up with nodes
+        still open, False when it found a path or exhausted the reachable
+        cells (the end is unreachable)
+    """
     resolution = obstacle_map.resolution
     allowed = allowed_cells or set()
     extra = extra_blocked or set()
 
-    # Get blocked cells (expanded by trace radius if needed)
-    # Uses cached expansion from obstacle map for speed
-    # Also expand allowed cells to match, so same-net routing works correctly
-    if trace_radius > 0:
-        blocked = obstacle_map.get_expanded_blocked(trace_radius)
-        extra = _expand_cells_fast(extra, trace_radius, resolution) if extra else set()
-        allowed = _expand_cells_fast(allowed, trace_radius, resolution) if allowed else set()
-    else:
-        blocked = obstacle_map._blocked
-
     # Convert to grid coordinates
     start_gx = int(round(start_x / resolution))
     start_gy = int(round(start_y / resolution))
@@ -163,144 +347,277 @@ def astar_search(
     # Get board bounds
     min_gx, min_gy, max_gx, max_gy = obstacle_map.get_bounds()
 
+    # Search box: the bounds, widened so the start and end cells get IDs too.
+    # Coordinates below are relative to the box corner.
+    box_gx = min(min_gx, start_gx, end_gx)
+    box_gy = min(min_gy, start_gy, end_gy)
+    width = max(max_gx, start_gx, end_gx) - box_gx + 1
+    height = max(max_gy, start_gy, end_gy) - box_gy + 1
+    lo_x, hi_x = min_gx - box_gx, max_gx - box_gx
+    lo_y, hi_y = min_gy - box_gy, max_gy - box_gy
+    end_rx, end_ry = end_gx - box_gx, end_gy - box_gy
+
+    blocked_mask = _blocked_mask(
+        obstacle_map, trace_radius, allowed, extra, box_gx, box_gy, width, height,
+        extra_grid, allowed_grid
+    )
+    start_id = (start_gx - box_gx) * height + (start_gy - box_gy)
+    end_id = end_rx * height + end_ry
+    max_iterations = 100000
+
+    if NUMBA_AVAILABLE:
+        path_ids, hit_limit = _astar_core_jit(
+            blocked_mask.ravel(), height, lo_x, hi_x, lo_y, hi_y,
+            start_id, end_id, max_iterations
+        )
+        if len(path_ids) == 0:
+            return [], bool(hit_limit)
+        xs, ys = np.divmod(path_ids, height)
+        return _simplify_path(np.column_stack((xs + box_gx, ys + box_gy)), resolution), False
+
+    blocked = blocked_mask.tobytes()
+    # (direction, dx, dy, ID offset, is diagonal) per neighbour
+    neighbours = tuple(
+        (dir_idx, dx, dy, dx * height + dy, dx != 0 and dy != 0)
+        for dir_idx, (dx, dy) in enumerate(DIRECTIONS)
+    )
+
     # A* data structures
-    # open_set entries: (f_score, g_score, x, y, direction)
-    open_set: list[tuple[float, float, int, int, int]] = []
-    closed_set: set[tuple[int, int]] = set()
-    g_scores: dict[tuple[int, int], float] = {}
-    came_from: dict[tuple[int, int], tuple[int, int]] = {}
+    # open_set entries: (f_score, g_score, cell_id, direction)
+    open_set = BucketQueue()
+    closed = bytearray(width * height)
+    g_scores: dict[int, float] = {}
+    came_from: dict[int, int] = {}
 
     # Initialize
     start_h = heuristic(start_gx, start_gy, end_gx, end_gy)
-    heapq.heappush(open_set, (start_h * HEURISTIC_WEIGHT, 0.0, start_gx, start_gy, -1))
-    g_scores[(start_gx, start_gy)] = 0.0
+    open_set.push((start_h * HEURISTIC_WEIGHT, 0.0, start_id, -1))
+    g_scores[start_id] = 0.0
 
     # Search
     iterations = 0
-    max_iterations = 100000
 
     while open_set and iterations < max_iterations:
         iterations += 1
 
-        _, g, cx, cy, c_dir = heapq.heappop(open_set)
-        pos = (cx, cy)
+        _, g, cid, c_dir = open_set.pop()
 
         # Goal check
-        if cx == end_gx and cy == end_gy:
-            return _reconstruct_path(came_from, pos, (start_gx, start_gy), resolution)
+        if cid == end_id:
+            return _reconstruct_packed_path(
+                came_from, cid, start_id, box_gx, box_gy, height, resolution
+            ), False
 
         # Skip if already processed
-        if pos in closed_set:
+        if closed[cid]:
             continue
-        closed_set.add(pos)
+        closed[cid] = 1
+        cx, cy = divmod(cid, height)
+        move_costs = _MOVE_COSTS[c_dir + 1]
 
         # Expand neighbors
-        for dir_idx in range(8):
-            dx, dy = DIRECTIONS[dir_idx]
+        for dir_idx, dx, dy, offset, diagonal in neighbours:
             nx, ny = cx + dx, cy + dy
 
             # Bounds check
-            if not (min_gx <= nx <= max_gx and min_gy <= ny <= max_gy):
+            if not (lo_x <= nx <= hi_x and lo_y <= ny <= hi_y):
                 continue
 
-            npos = (nx, ny)
+            nid = cid + offset
 
             # Skip if already processed
-            if npos in closed_set:
+            if closed[nid]:
                 continue
 
-            # Check if blocked (unless it's the goal or in allowed set)
-            is_goal = (nx == end_gx and ny == end_gy)
-            is_blocked = (npos in blocked or npos in extra) and npos not in allowed
-            if not is_goal and is_blocked:
+            # Check if blocked (unless it's the goal; allowed cells are cleared in the mask)
+            is_goal = nid == end_id
+            if not is_goal and blocked[nid]:
                 continue
 
             # For diagonal moves, check corners to prevent cutting through (skip if moving to goal)
-            if dx != 0 and dy != 0 and not is_goal:
-                c1 = (cx + dx, cy)
-                c2 = (cx, cy + dy)
-                c1_blocked = (c1 in blocked or c1 in extra) and c1 not in allowed
-                c2_blocked = (c2 in blocked or c2 in extra) and c2 not in allowed
-                if c1_blocked or c2_blocked:
+            if diagonal and not is_goal:
+                if blocked[cid + dx * height] or blocked[cid + dy]:
                     continue
 
-            # Calculate cost
-            move_cost = DIRECTION_COSTS[dir_idx]
-            if c_dir >= 0 and c_dir != dir_idx:
-                # Calculate turn angle (minimum distance in direction indices)
-                # e.g., from N(0) to E(2) = 2 steps, from N(0) to NW(7) = 1 step
-                dir_diff = abs(dir_idx - c_dir)
-                if dir_diff > 4:
-                    dir_diff = 8 - dir_diff  # Wrap around
-                move_cost += TURN_PENALTIES.get(dir_diff, 0.5)
-
-            new_g = g + move_cost
+            # Step cost plus the penalty for turning from c_dir
+            new_g = g + move_costs[dir_idx]
 
             # Check if this is a better path
-            old_g = g_scores.get(npos)
+            old_g = g_scores.get(nid)
             if old_g is not None and old_g <= new_g:
                 continue
 
-            g_scores[npos] = new_g
-            came_from[npos] = pos
+            g_scores[nid] = new_g
+            came_from[nid] = cid
 
-            h = heuristic(nx, ny, end_gx, end_gy)
+            # Octile heuristic, inlined
+            hx = nx - end_rx if nx > end_rx else end_rx - nx
+            hy = ny - end_ry if ny > end_ry else end_ry - ny
+            h = hx + (SQRT2 - 1) * hy if hx > hy else hy + (SQRT2 - 1) * hx
             new_f = new_g + h * HEURISTIC_WEIGHT
-            heapq.heappush(open_set, (new_f, new_g, nx, ny, dir_idx))
+            open_set.push((new_f, new_g, nid, dir_idx))
 
-    # No path found
-    return []
+    # No path found; nodes left open mean the iteration limit stopped the search
+    return [], bool(open_set)
+
+
+def _astar_core_loop(
+    blocked: np.ndarray,
+    height: int,
+    lo_x: int, hi_x: int,
+    lo_y: int, hi_y: int,
+    start_id: int,
+    end_id: int,
+    max_iterations: int
+) -> tuple[np.ndarray, bool]:
+    """
+    Scalar-loop form of the astar_search main loop over packed cell IDs.
+
+    Written in the subset of Python that Numba compiles; used through
+    _astar_core_jit when Numba is installed. Expands nodes in the same
+    order as astar_search.
+
+    Returns:
+        (cell IDs from start to end, or an empty array if no path was
+        found; whether the iteration limit stopped the search)
+    """
+    n = blocked.shape[0]
+    # g stays float64 so costs compare exactly as in astar_search. Parents
+    # fit int32 (boxes are far below 2**31 cells) and are only read along
+    # the found path, so they need no initialization
+    g_scores = np.full(n, np.inf)
+    came_from = np.empty(n, dtype=np.int32)
+    closed = np.zeros(n, dtype=np.uint8)
+    end_rx = end_id // height
+    end_ry = end_id - end_rx * height
+
+    sx = start_id // height
+    dx0 = abs(end_rx - sx)
+    dy0 = abs(end_ry - (start_id - sx * height))
+    start_h = max(dx0, dy0) + (SQRT2 - 1) * min(dx0, dy0)
+    open_set = [(start_h * HEURISTIC_WEIGHT, 0.0, start_id, -1)]
+    g_scores[start_id] = 0.0
+
+    iterations = 0
+    while len(open_set) > 0 and iterations < max_iterations:
+        iterations += 1
 
+        _, g, cid, c_dir = heapq.heappop(open_set)
+
+        if cid == end_id:
+            count = 1
+            node = cid
+            while node != start_id:
+                node = came_from[node]
+                count += 1
+            path = np.empty(count, dtype=np.int64)
+            node = cid
+            for i in range(count - 1, -1, -1):
+                path[i] = node
+                node = came_from[node]
+            return path, False
+
+        if closed[cid]:
+            continue
+        closed[cid] = 1
+        cx = cid // height
+        cy = cid - cx * height
+
+        for dir_idx in range(8):
+            dx = _DIRECTION_DX[dir_idx]
+            dy = _DIRECTION_DY[dir_idx]
+            nx = cx + dx
+            ny = cy + dy
+            if not (lo_x <= nx <= hi_x and lo_y <= ny <= hi_y):
+                continue
 
-def _reconstruct_path(
-    came_from: dict[tuple[int, int], tuple[int, int]],
-    end: tuple[int, int],
-    start: tuple[int, int],
+            nid = cid + dx * height + dy
+            if closed[nid]:
+                continue
+
+            is_goal = nid == end_id
+            if not is_goal and blocked[nid]:
+                continue
+            if dx != 0 and dy != 0 and not is_goal:
+                if blocked[cid + dx * height] or blocked[cid + dy]:
+                    continue
+
+            new_g = g + _MOVE_COSTS[c_dir + 1][dir_idx]
+            if g_scores[nid] <= new_g:
+                continue
+
+            g_scores[nid] = new_g
+            came_from[nid] = cid
+
+            hx = abs(end_rx - nx)
+            hy = abs(end_ry - ny)
+            h = max(hx, hy) + (SQRT2 - 1) * min(hx, hy)
+            heapq.heappush(open_set, (new_g + h * HEURISTIC_WEIGHT, new_g, nid, dir_idx))
+
+    return np.empty(0, dtype=np.int64), len(open_set) > 0
+
+
+if NUMBA_AVAILABLE:
+    # nogil: the kernel touches no Python objects, so searches started from
+    # worker threads can run in parallel
+    _astar_core_jit = numba.njit(cache=True, nogil=True)(_astar_core_loop)
+
+
+def warm_up_kernel() -> None:
+    """
+    Compile the A* kernel now, or load it from Numba's on-disk cache.
+
+    The kernel is otherwise compiled by the first search, which then takes
+    longer than the routing itself. The arguments have the types a real
+    search passes, so it is the same specialization. Without Numba this
+    does nothing.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    blocked = np.zeros(9, dtype=bool)
+    _astar_core_jit(blocked, 3, 0, 2, 0, 2, 0, 8, 100)
+
+
+def _reconstruct_packed_path(
+    came_from: dict[int, int],
+    end_id: int,
+    start_id: int,
+    box_gx: int,
+    box_gy: int,
+    height: int,
+    resolution: float
+) -> list[tuple[float, float]]:
+    """Reconstruct and simplify path from packed cell IDs."""
+    path_ids = [end_id]
+    cid = end_id
+    while cid != start_id:
+        cid = came_from[cid]
+        path_ids.append(cid)
+    xs, ys = np.divmod(np.array(path_ids[::-1]), height)
+    return _simplify_path(np.column_stack((xs + box_gx, ys + box_gy)), resolution)
+
+
+def _simplify_path(
+    raw_path: np.ndarray | list[tuple[int, int]],
     resolution: float
 ) -> list[tuple[float, float]]:
-    """Reconstruct and simplify path from A* result."""
-    # Build raw path
-    raw_path: list[tuple[int, int]] = []
-    pos = end
-    while pos != start:
-        raw_path.append(pos)
-        pos = came_from[pos]
-    raw_path.append(start)
-    raw_path.reverse()
-
-    # Simplify: remove collinear points
-    if len(raw_path) < 3:
-        return [(x * resolution, y * resolution) for x, y in raw_path]
-
-    simplified: list[tuple[int, int]] = [raw_path[0]]
-
-    for i in range(1, len(raw_path) - 1):
-        prev = simplified[-1]
-        curr = raw_path[i]
-        next_pt = raw_path[i + 1]
-
-        # Check if direction changes
-        dx1, dy1 = curr[0] - prev[0], curr[1] - prev[1]
-        dx2, dy2 = next_pt[0] - curr[0], next_pt[1] - curr[1]
-
-        # Normalize to unit direction
-        if dx1 != 0:
-            dx1 = dx1 // abs(dx1)
-        if dy1 != 0:
-            dy1 = dy1 // abs(dy1)
-        if dx2 != 0:
-            dx2 = dx2 // abs(dx2)
-        if dy2 != 0:
-            dy2 = dy2 // abs(dy2)
-
-        # If direction changes, keep this point
-        if dx1 != dx2 or dy1 != dy2:
-            simplified.append(curr)
-
-    simplified.append(raw_path[-1])
+    """
+    Remove collinear grid points and convert to world coordinates.
+
+    raw_path is a list of (gx, gy) cells or an (n, 2) array of them.
+    """
+    points = np.asarray(raw_path, dtype=np.int64).reshape(-1, 2)
+    if len(points) < 3:
+        return [(x * resolution, y * resolution) for x, y in points.tolist()]
+
+    # Keep the ends and every point where the step direction (the signs of
+    # the step; jump searches take several cells per step) changes
+    steps = np.sign(np.diff(points, axis=0))
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:-1] = (steps[1:] != steps[:-1]).any(axis=1)
 
     # Convert to world coordinates
-    return [(x * resolution, y * resolution) for x, y in simplified]
+    return [(x * resolution, y * resolution) for x, y in points[keep].tolist()]
 
 
 def astar_search_element_aware(
@@ -341,16 +658,32 @@ def astar_search_element_aware(
     # Get board bounds
     min_gx, min_gy, max_gx, max_gy = obstacle_map.get_bounds()
 
+    pending_index = None
+    if pending_traces:
+        pending_index = _index_pending_segments(
+            pending_traces, trace_radius, obstacle_map.clearance, net_id
+        )
+
+    # Search box: the bounds, grown to take in the endpoints; cells are
+    # packed as (gx - box_gx) * height + (gy - box_gy), as in astar_search
+    box_gx = min(min_gx, start_gx, end_gx)
+    box_gy = min(min_gy, start_gy, end_gy)
+    width = max(max_gx, start_gx, end_gx) - box_gx + 1
+    height = max(max_gy, start_gy, end_gy) - box_gy + 1
+    start_id = (start_gx - box_gx) * height + (start_gy - box_gy)
+    end_id = (end_gx - box_gx) * height + (end_gy - box_gy)
+
     # A* data structures
-    open_set: list[tuple[float, float, int, int, int]] = []
-    closed_set: set[tuple[int, int]] = set()
-    g_scores: dict[tuple[int, int], float] = {}
-    came_from: dict[tuple[int, int], tuple[int, int]] = {}
+    # open_set entries: (f_score, g_score, cell_id, direction)
+    open_set: list[tuple[float, float, int, int]] = []
+    closed = bytearray(width * height)
+    g_scores: dict[int, float] = {}
+    came_from: dict[int, int] = {}
 
     # Initialize
     start_h = heuristic(start_gx, start_gy, end_gx, end_gy)
-    heapq.heappush(open_set, (start_h * HEURISTIC_WEIGHT, 0.0, start_gx, start_gy, -1))
-    g_scores[(start_gx, start_gy)] = 0.0
+    heapq.heappush(open_set, (start_h * HEURISTIC_WEIGHT, 0.0, start_id, -1))
+    g_scores[start_id] = 0.0
 
     iterations = 0
     max_iterations = 100000
@@ -358,15 +691,20 @@ def astar_search_element_aware(
     while open_set and iterations < max_iterations:
         iterations += 1
 
-        _, g, cx, cy, c_dir = heapq.heappop(open_set)
-        pos = (cx, cy)
+        _, g, cid, c_dir = heapq.heappop(open_set)
 
-        if cx == end_gx and cy == end_gy:
-            return _reconstruct_path(came_from, pos, (start_gx, start_gy), resolution)
+        if cid == end_id:
+            return _reconstruct_packed_path(
+                came_from, cid, start_id, box_gx, box_gy, height, resolution
+            )
 
-        if pos in closed_set:
+        if closed[cid]:
             continue
-        closed_set.add(pos)
+        closed[cid] = 1
+        cx, cy = divmod(cid, height)
+        cx += box_gx
+        cy += box_gy
+        move_costs = _MOVE_COSTS[c_dir + 1]
 
         for dir_idx in range(8):
             dx, dy = DIRECTIONS[dir_idx]
@@ -375,20 +713,22 @@ def astar_search_element_aware(
             if not (min_gx <= nx <= max_gx and min_gy <= ny <= max_gy):
                 continue
 
-            npos = (nx, ny)
-            if npos in closed_set:
+            nid = cid + dx * height + dy
+            if closed[nid]:
                 continue
 
-            # Convert to world coordinates for geometry check
-            world_x = nx * resolution
-            world_y = ny * resolution
-
             # Check if blocked using element-aware method
-            is_goal = (nx == end_gx and ny == end_gy)
-            is_blocked = obstacle_map.is_blocked(world_x, world_y, trace_radius, net_id)
+            is_goal = nid == end_id
+            is_blocked = obstacle_map.is_cell_blocked(nx, ny, trace_radius, net_id)
 
             # Also check pending traces
-            if pending_traces and not is_blocked:
+            if pending_index is not None and not is_blocked:
+                is_blocked = _point_blocked_by_indexed_pending(
+                    nx * resolution, ny * resolution, pending_index
+                )
+            elif pending_traces and not is_blocked:
+                world_x = nx * resolution
+                world_y = ny * resolution
                 for pending in pending_traces:
                     if _point_blocked_by_pending(
                         world_x, world_y, trace_radius,
@@ -405,30 +745,59 @@ def astar_search_element_aware(
             # source and destination cells are free, the diagonal path is valid.
             # This enables routing through narrow diagonal corridors between pads.
 
-            # Calculate cost (same as before)
-            move_cost = DIRECTION_COSTS[dir_idx]
-            if c_dir >= 0 and c_dir != dir_idx:
-                dir_diff = abs(dir_idx - c_dir)
-                if dir_diff > 4:
-                    dir_diff = 8 - dir_diff
-                move_cost += TURN_PENALTIES.get(dir_diff, 0.5)
-
-            new_g = g + move_cost
+            # Step cost plus the penalty for turning from c_dir
+            new_g = g + move_costs[dir_idx]
 
-            old_g = g_scores.get(npos)
+            old_g = g_scores.get(nid)
             if old_g is not None and old_g <= new_g:
                 continue
 
-            g_scores[npos] = new_g
-            came_from[npos] = pos
+            g_scores[nid] = new_g
+            came_from[nid] = cid
 
             h = heuristic(nx, ny, end_gx, end_gy)
             new_f = new_g + h * HEURISTIC_WEIGHT
-            heapq.heappush(open_set, (new_f, new_g, nx, ny, dir_idx))
+            heapq.heappush(open_set, (new_f, new_g, nid, dir_idx))
 
     return []
 
 
+def _index_pending_segments(
+    pending_traces: list, trace_radius: float,
+    clearance: float, net_id: Optional[int]
+) -> Optional[SegmentIndex]:
+    """
+    Index the segments of different-net pending traces for point checks.
+
+    Each entry carries its required clearance. Returns None when there are
+    too few segments for the index to pay off.
+    """
+    others = [
+        pending for pending in pending_traces
+        if net_id is None or pending.net_id != net_id
+    ]
+    if sum(len(p.segments) - 1 for p in others) < _PENDING_INDEX_MIN_SEGMENTS:
+        return None
+
+    margin = clearance + trace_radius + max(p.width for p in others) / 2
+    index = SegmentIndex(margin)
+    for pending in others:
+        required_clearance = clearance + trace_radius + pending.width / 2
+        segments = pending.segments
+        for i in range(len(segments) - 1):
+            (x1, y1), (x2, y2) = segments[i], segments[i + 1]
+            index.add_segment(x1, y1, x2, y2, required_clearance)
+    return index
+
+
+def _point_blocked_by_indexed_pending(x: float, y: float, index: SegmentIndex) -> bool:
+    """Check if point is blocked by any segment in a pending segment index."""
+    for x1, y1, x2, y2, required_clearance in index.query_point(x, y):
+        if GeometryChecker._point_to_segment(x, y, x1, y1, x2, y2) < required_clearance:
+            return True
+    return False
+
+
 def _point_blocked_by_pending(
     x: float, y: float, trace_radius: float,
     pending, clearance: float,
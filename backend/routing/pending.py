@@ -1,9 +1,55 @@
 """Pending trace storage for user-created routes."""
 import json
-from dataclasses import dataclass, asdict
+import math
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+from scipy import ndimage
+
+from backend.routing.geometry import point_to_segments_distance
+
+
+def _sample_segment_cells(xy: np.ndarray, resolution: float) -> np.ndarray:
+    """
+    Grid cells of points sampled along a polyline, as an (N, 2) int array.
+
+    Each segment is sampled at about one point per grid cell, endpoints
+    included; a zero-length segment contributes its start point.
+    """
+    chunks = []
+    for (x1, y1), (x2, y2) in zip(xy[:-1].tolist(), xy[1:].tolist()):
+        length = math.hypot(x2 - x1, y2 - y1)
+        if length < 0.001:
+            chunks.append(np.array([[x1, y1]]))
+            continue
+        steps = max(int(length / resolution), 1)
+        t = (np.arange(steps + 1) / steps)[:, None]
+        chunks.append(np.array([x1, y1]) + t * np.array([x2 - x1, y2 - y1]))
+    return np.rint(np.concatenate(chunks) / resolution).astype(np.int64)
+
+
+@dataclass
+class _SegmentTable:
+    """
+    Segments of a layer's pending traces as parallel arrays, sorted by y_min.
+
+    net_id is -1 for traces without a net.
+    """
+    x1: np.ndarray
+    y1: np.ndarray
+    x2: np.ndarray
+    y2: np.ndarray
+    y_min: np.ndarray
+    y_max: np.ndarray
+    half_width: np.ndarray
+    net_id: np.ndarray
+    # Largest half width and y extent, which bound the binary search
+    max_half_width: float
+    max_height: float
+
 
 @dataclass
 class PendingTrace:
@@ -13,6 +59,11 @@ class PendingTrace:
     width: float
     layer: str
     net_id: Optional[int] = None
+    # Contiguous (N, 2) copy of segments for geometry kernels
+    xy: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.xy = np.ascontiguousarray(self.segments, dtype=np.float64).reshape(-1, 2)
 
 
 class PendingTraceStore:
@@ -23,6 +74,9 @@ class PendingTraceStore:
     as obstacles to avoid routing through already-placed user traces.
     """
 
+    # Number of blocked grids (per layer, clearance and excluded net) to keep
+    BLOCKED_GRID_CACHE_SIZE = 8
+
     def __init__(self, grid_resolution: float = 0.025, storage_path: Optional[Path] = None):
         """
         Initialize the pending trace store.
@@ -34,8 +88,18 @@ class PendingTraceStore:
         self._traces: dict[str, PendingTrace] = {}
         self._grid_resolution = grid_resolution
         self._storage_path = storage_path
-        # Cache of blocked cells per layer
-        self._blocked_cells_cache: dict[str, set[tuple[int, int]]] = {}
+        # Cache of blocked cells per (layer, clearance)
+        self._blocked_cells_cache: dict[tuple[str, float], set[tuple[int, int]]] = {}
+        # LRU cache of blocked grids per (layer, clearance, excluded net)
+        self._blocked_grid_cache: OrderedDict[
+            tuple[str, float, Optional[int]], Optional[tuple[np.ndarray, tuple[int, int]]]
+        ] = OrderedDict()
+        # Cache of traces per layer
+        self._layer_traces_cache: dict[str, list[PendingTrace]] = {}
+        # Cache of segment tables per layer, for point queries
+        self._segment_table_cache: dict[str, Optional[_SegmentTable]] = {}
+        # Incremented on every change, so dependents can detect stale results
+        self.version = 0
 
         # Load existing traces from storage
         if self._storage_path:
@@ -66,9 +130,12 @@ class PendingTraceStore:
             layer=layer,
             net_id=net_id
         )
+        replaced = self._traces.get(trace_id)
         self._traces[trace_id] = trace
-        # Invalidate cache for this layer
-        self._blocked_cells_cache.pop(layer, None)
+        # Invalidate caches for this layer (and the replaced trace's layer)
+        for changed_layer in {layer, replaced.layer if replaced else layer}:
+            self._invalidate_layer(changed_layer)
+        self.version += 1
         self._save()
 
     def remove_trace(self, trace_id: str) -> bool:
@@ -83,12 +150,21 @@ class PendingTraceStore:
         """
         trace = self._traces.pop(trace_id, None)
         if trace:
-            # Invalidate cache for this layer
-            self._blocked_cells_cache.pop(trace.layer, None)
+            # Invalidate caches for this layer
+            self._invalidate_layer(trace.layer)
+            self.version += 1
             self._save()
             return True
         return False
 
+    def _invalidate_layer(self, layer: str) -> None:
+        """Drop every cached result for a layer."""
+        self._layer_traces_cache.pop(layer, None)
+        self._segment_table_cache.pop(layer, None)
+        for cache in (self._blocked_cells_cache, self._blocked_grid_cache):
+            for key in [key for key in cache if key[0] == layer]:
+                del cache[key]
+
     def get_trace(self, trace_id: str) -> Optional[PendingTrace]:
         """Get a trace by ID."""
         return self._traces.get(trace_id)
@@ -98,13 +174,25 @@ class PendingTraceStore:
         return list(self._traces.values())
 
     def get_traces_by_layer(self, layer: str) -> list[PendingTrace]:
-        """Get all traces on a specific layer."""
-        return [t for t in self._traces.values() if t.layer == layer]
+        """Get all traces on a specific layer (a new list on each call)."""
+        return list(self._layer_traces(layer))
+
+    def _layer_traces(self, layer: str) -> list[PendingTrace]:
+        """Traces on a layer, cached until the layer's traces change; read-only."""
+        traces = self._layer_traces_cache.get(layer)
+        if traces is None:
+            traces = [t for t in self._traces.values() if t.layer == layer]
+            self._layer_traces_cache[layer] = traces
+        return traces
 
     def clear(self) -> None:
         """Remove all pending traces."""
         self._traces.clear()
         self._blocked_cells_cache.clear()
+        self._blocked_grid_cache.clear()
+        self._layer_traces_cache.clear()
+        self._segment_table_cache.clear()
+        self.version += 1
         self._save()
 
     def get_blocked_cells(
@@ -125,58 +213,108 @@ class PendingTraceStore:
             Set of (grid_x, grid_y) tuples that are blocked
         """
         # Check if we can use cached result (only if no net exclusion)
-        if exclude_net_id is None and layer in self._blocked_cells_cache:
-            return self._blocked_cells_cache[layer]
+        key = (layer, round(clearance, 6))
+        if exclude_net_id is None and key in self._blocked_cells_cache:
+            return self._blocked_cells_cache[key]
 
         cells: set[tuple[int, int]] = set()
-        resolution = self._grid_resolution
+        blocked = self.get_blocked_grid(layer, clearance, exclude_net_id)
+        if blocked is not None:
+            grid, (ox, oy) = blocked
+            gys, gxs = np.nonzero(grid)
+            cells.update(zip((gxs + ox).tolist(), (gys + oy).tolist()))
+
+        # Cache result if no net exclusion was applied
+        if exclude_net_id is None:
+            self._blocked_cells_cache[key] = cells
 
-        def to_grid(x: float, y: float) -> tuple[int, int]:
-            return (int(round(x / resolution)), int(round(y / resolution)))
+        return cells
 
-        for trace in self._traces.values():
-            if trace.layer != layer:
-                continue
+    def get_blocked_grid(
+        self,
+        layer: str,
+        clearance: float = 0.2,
+        exclude_net_id: Optional[int] = None
+    ) -> Optional[tuple[np.ndarray, tuple[int, int]]]:
+        """
+        Get the cells of get_blocked_cells() as a boolean grid (cached).
+
+        Searches can paste the grid into their blocked masks directly; a
+        few pending traces already block hundreds of thousands of cells,
+        too many to pass around as a set. The grid must not be modified.
+
+        Returns:
+            (grid, (origin_gx, origin_gy)) with grid[gy - origin_gy, gx - origin_gx]
+            True for blocked cells, or None if no pending trace blocks anything
+        """
+        key = (layer, round(clearance, 6), exclude_net_id)
+        if key in self._blocked_grid_cache:
+            self._blocked_grid_cache.move_to_end(key)
+            return self._blocked_grid_cache[key]
+
+        resolution = self._grid_resolution
+
+        # Grid points sampled along each trace, grouped by blocking radius
+        points_by_radius: dict[int, list[np.ndarray]] = {}
+        for trace in self._layer_traces(layer):
             if exclude_net_id is not None and trace.net_id == exclude_net_id:
                 continue
-
-            # Calculate blocked cells along each segment
-            segments = trace.segments
-            if len(segments) < 2:
+            if len(trace.segments) < 2:
                 continue
 
             trace_radius = trace.width / 2 + clearance
             cell_radius = int(trace_radius / resolution) + 1
+            points_by_radius.setdefault(cell_radius, []).append(
+                _sample_segment_cells(trace.xy, resolution)
+            )
+
+        blocked = None
+        if points_by_radius:
+            groups = [(r, np.concatenate(chunks)) for r, chunks in points_by_radius.items()]
+            origin = np.min([points.min(axis=0) - r for r, points in groups], axis=0)
+            extent = np.max([points.max(axis=0) + r for r, points in groups], axis=0) - origin + 1
+
+            # Block the (2r+1)x(2r+1) square around every sampled point
+            grid = np.zeros((extent[1], extent[0]), dtype=bool)
+            for cell_radius, points in groups:
+                marks = np.zeros_like(grid)
+                rel = points - origin
+                marks[rel[:, 1], rel[:, 0]] = True
+                # A square is separable, so this is two 1-D running maxima
+                grid |= ndimage.maximum_filter(marks, size=2 * cell_radius + 1)
+            blocked = (grid, (int(origin[0]), int(origin[1])))
+
+        self._blocked_grid_cache[key] = blocked
+        if len(self._blocked_grid_cache) > self.BLOCKED_GRID_CACHE_SIZE:
+            self._blocked_grid_cache.popitem(last=False)
+        return blocked
+
+    def is_cell_blocked(
+        self,
+        gx: int,
+        gy: int,
+        layer: str,
+        clearance: float = 0.2,
+        exclude_net_id: Optional[int] = None
+    ) -> bool:
+        """
+        Check if a grid cell is in get_blocked_cells(), without building the set.
 
-            for i in range(len(segments) - 1):
-                x1, y1 = segments[i]
-                x2, y2 = segments[i + 1]
-
-                # Sample points along segment
-                length = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
-                if length < 0.001:
-                    gx, gy = to_grid(x1, y1)
-                    for dx in range(-cell_radius, cell_radius + 1):
-                        for dy in range(-cell_radius, cell_radius + 1):
-                            cells.add((gx + dx, gy + dy))
-                    continue
-
-                steps = max(int(length / resolution), 1)
-                for step in range(steps + 1):
-                    t = step / steps
-                    px = x1 + t * (x2 - x1)
-                    py = y1 + t * (y2 - y1)
-                    gx, gy = to_grid(px, py)
-
-                    for dx in range(-cell_radius, cell_radius + 1):
-                        for dy in range(-cell_radius, cell_radius + 1):
-                            cells.add((gx + dx, gy + dy))
-
-        # Cache result if no net exclusion was applied
-        if exclude_net_id is None:
-            self._blocked_cells_cache[layer] = cells
+        Args:
+            gx, gy: Grid cell to check
+            layer: Layer to check
+            clearance: Clearance distance in mm
+            exclude_net_id: If provided, ignore traces with this net ID
 
-        return cells
+        Returns:
+            True if any pending trace blocks the cell
+        """
+        blocked = self.get_blocked_grid(layer, clearance, exclude_net_id)
+        if blocked is None:
+            return False
+        grid, (ox, oy) = blocked
+        row, col = gy - oy, gx - ox
+        return 0 <= row < grid.shape[0] and 0 <= col < grid.shape[1] and bool(grid[row, col])
 
     def is_point_blocked(
         self,
@@ -190,6 +328,9 @@ class PendingTraceStore:
         """
         Check if a point is blocked by any pending trace.
 
+        Only segments whose y-range can reach the point are measured; they
+        are found by binary search in the layer's segment table.
+
         Args:
             x, y: Point to check (mm)
             radius: Radius around the point to check (mm)
@@ -200,50 +341,114 @@ class PendingTraceStore:
         Returns:
             True if point would violate clearance to any pending trace
         """
+        table = self._get_segment_table(layer)
+        if table is None:
+            return False
         check_radius = radius + clearance
 
-        for trace in self._traces.values():
-            if trace.layer != layer:
-                continue
-            if exclude_net_id is not None and trace.net_id == exclude_net_id:
-                continue
+        # Segments starting (in y) at most reach + the tallest segment below y
+        reach = check_radius + table.max_half_width
+        lo = int(np.searchsorted(table.y_min, y - reach - table.max_height, side="left"))
+        hi = int(np.searchsorted(table.y_min, y + reach, side="right"))
+        if lo >= hi:
+            return False
+        candidates = slice(lo, hi)
+
+        dist = point_to_segments_distance(
+            x, y,
+            table.x1[candidates], table.y1[candidates],
+            table.x2[candidates], table.y2[candidates]
+        )
+        hit = dist <= check_radius + table.half_width[candidates]
+        if exclude_net_id is not None:
+            hit &= table.net_id[candidates] != exclude_net_id
+        return bool(hit.any())
 
-            segments = trace.segments
-            if len(segments) < 2:
-                continue
+    def are_points_blocked(
+        self,
+        points: np.ndarray,
+        radius: float,
+        layer: str,
+        clearance: float = 0.2,
+        exclude_net_id: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        is_point_blocked() for many points at once.
 
-            trace_radius = trace.width / 2
+        Only the pairs whose point lies in the segment's bounding box,
+        widened by the blocking distance, are measured.
 
-            # Check distance to each segment
-            for i in range(len(segments) - 1):
-                dist = self._point_to_segment_distance(
-                    x, y,
-                    segments[i][0], segments[i][1],
-                    segments[i + 1][0], segments[i + 1][1]
-                )
-                if dist <= check_radius + trace_radius:
-                    return True
+        Args:
+            points: (N, 2) array of points to check (mm)
+            radius: Radius around each point to check (mm)
+            layer: Layer to check
+            clearance: Minimum clearance (mm)
+            exclude_net_id: If provided, ignore traces with this net ID
 
-        return False
+        Returns:
+            (N,) boolean array, True where a point would violate clearance
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        blocked = np.zeros(len(points), dtype=bool)
+        table = self._get_segment_table(layer)
+        if table is None:
+            return blocked
+
+        reach = radius + clearance + table.half_width
+        if exclude_net_id is not None:
+            # Excluded segments can never be near
+            reach = np.where(table.net_id != exclude_net_id, reach, -np.inf)
+        px, py = points[:, 0:1], points[:, 1:2]
+        near = (
+            (px >= np.minimum(table.x1, table.x2) - reach)
+            & (px <= np.maximum(table.x1, table.x2) + reach)
+            & (py >= table.y_min - reach)
+            & (py <= table.y_max + reach)
+        )
+        pi, si = np.nonzero(near)
+        dist = point_to_segments_distance(
+            points[pi, 0], points[pi, 1],
+            table.x1[si], table.y1[si], table.x2[si], table.y2[si]
+        )
+        blocked[pi[dist <= reach[si]]] = True
+        return blocked
 
-    def _point_to_segment_distance(
-        self,
-        px: float, py: float,
-        x1: float, y1: float,
-        x2: float, y2: float
-    ) -> float:
-        """Calculate shortest distance from point to line segment."""
-        dx = x2 - x1
-        dy = y2 - y1
-        length_sq = dx * dx + dy * dy
-
-        if length_sq < 0.0001:
-            return ((px - x1) ** 2 + (py - y1) ** 2) ** 0.5
-
-        t = max(0, min(1, ((px - x1) * dx + (py - y1) * dy) / length_sq))
-        proj_x = x1 + t * dx
-        proj_y = y1 + t * dy
-        return ((px - proj_x) ** 2 + (py - proj_y) ** 2) ** 0.5
+    def _get_segment_table(self, layer: str) -> Optional[_SegmentTable]:
+        """
+        Get the segments of all pending traces on a layer, sorted by y_min (cached).
+
+        Returns None if the layer has no segments.
+        """
+        if layer in self._segment_table_cache:
+            return self._segment_table_cache[layer]
+
+        rows = []
+        for trace in self._layer_traces(layer):
+            if len(trace.segments) < 2:
+                continue
+            count = len(trace.xy) - 1
+            rows.append((
+                trace.xy[:-1], trace.xy[1:],
+                np.full(count, trace.width / 2),
+                np.full(count, -1 if trace.net_id is None else trace.net_id, dtype=np.int64),
+            ))
+
+        table = None
+        if rows:
+            starts, ends, half_widths, net_ids = (np.concatenate(col) for col in zip(*rows))
+            y_min = np.minimum(starts[:, 1], ends[:, 1])
+            order = np.argsort(y_min, kind="stable")
+            starts, ends, y_min = starts[order], ends[order], y_min[order]
+            y_max = np.maximum(starts[:, 1], ends[:, 1])
+            table = _SegmentTable(
+                x1=starts[:, 0], y1=starts[:, 1], x2=ends[:, 0], y2=ends[:, 1],
+                y_min=y_min, y_max=y_max,
+                half_width=half_widths[order], net_id=net_ids[order],
+                max_half_width=float(half_widths.max()),
+                max_height=float((y_max - y_min).max()),
+            )
+        self._segment_table_cache[layer] = table
+        return table
 
     def _save(self) -> None:
         """Save traces to storage file."""
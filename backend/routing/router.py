@@ -1,17 +1,42 @@
 """Main trace router using A* pathfinding and hull-based walkaround."""
+import math
+import os
+import pickle
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
+
+import numpy as np
 
 from backend.pcb.parser import PCBParser
 
+from .geometry import point_to_segments_distance
 from .obstacles import ObstacleMap, ElementAwareMap
-from .pathfinding import astar_search, astar_search_element_aware
+from .pathfinding import astar_search_with_status, astar_search_element_aware
+from .jps import jps_search
 from .pending import PendingTraceStore
 from .hull_map import HullMap
 from .walkaround import WalkaroundRouter
 from .optimizer import PathOptimizer
 from .hulls import Point
 
+# Router unpickled once per route_many worker process
+_worker_router: Optional["TraceRouter"] = None
+
+
+def _init_route_worker(router_state: bytes) -> None:
+    """Load the router shared with a route_many worker."""
+    global _worker_router
+    _worker_router = pickle.loads(router_state)
+
+
+def _route_in_worker(request: tuple) -> list[tuple[float, float]]:
+    """Route one route_many request in a worker process."""
+    return _worker_router.route(*request)
+
 
 class TraceRouter:
     """
@@ -27,6 +52,15 @@ class TraceRouter:
     # Copper layers to cache
     COPPER_LAYERS = ["F.Cu", "B.Cu", "In1.Cu", "In2.Cu"]
 
+    # Number of recent route() results to keep
+    ROUTE_CACHE_SIZE = 128
+
+    # Number of (layer, net) allowed-cell bitmaps to keep
+    NET_CELL_CACHE_SIZE = 32
+
+    # Number of obstacle maps built on demand (uncached layers, net-filtered) to keep
+    OBSTACLE_MAP_CACHE_SIZE = 8
+
     def __init__(
         self,
         parser: PCBParser,
@@ -35,7 +69,8 @@ class TraceRouter:
         cache_obstacles: bool = False,
         pending_traces_file: Optional[Path] = None,
         use_element_aware: bool = True,
-        use_legacy_astar: bool = False
+        use_legacy_astar: bool = False,
+        use_jump_point_search: bool = False
     ):
         """
         Initialize the router.
@@ -48,12 +83,17 @@ class TraceRouter:
             pending_traces_file: Optional path to JSON file for trace persistence
             use_element_aware: Use element-aware pathfinding with exact geometry (A* mode)
             use_legacy_astar: If True, use legacy A* routing instead of hull-based
+            use_jump_point_search: In grid A* mode (legacy, not element-aware), search
+                with Jump Point Search only. Otherwise grid mode runs A* first, which
+                is faster on short open routes, and falls back to JPS for long
+                detours that A* gives up on at its iteration limit
         """
         self.parser = parser
         self.clearance = clearance
         self.grid_resolution = grid_resolution
         self.use_element_aware = use_element_aware
         self.use_legacy_astar = use_legacy_astar
+        self.use_jump_point_search = use_jump_point_search
 
         # Cache obstacle maps per layer (legacy A*)
         self._obstacle_cache: dict[str, ObstacleMap] = {}
@@ -70,6 +110,21 @@ class TraceRouter:
             storage_path=pending_traces_file
         )
 
+        # LRU of recent route() results, keyed by the query and pending_store.version
+        self._route_cache: OrderedDict[tuple, tuple[tuple[float, float], ...]] = OrderedDict()
+
+        # Disk masks by grid radius, shared by the net cell stamps
+        self._mask_cache: dict[int, np.ndarray] = {}
+
+        # LRU of same-net allowed cells per (layer, net_id): (bitmap, min_gx, min_gy).
+        # They depend only on the board, not on pending traces.
+        self._net_cell_bitmaps: OrderedDict[
+            tuple[str, int], Optional[tuple[np.ndarray, int, int]]
+        ] = OrderedDict()
+
+        # LRU of obstacle maps built by _get_obstacle_map, keyed by (layer, net_id)
+        self._obstacle_map_lru: OrderedDict[tuple[str, Optional[int]], ObstacleMap] = OrderedDict()
+
         if cache_obstacles:
             if use_legacy_astar:
                 if use_element_aware:
@@ -84,9 +139,14 @@ class TraceRouter:
                     self._build_element_aware_cache()
 
     def _build_obstacle_cache(self) -> None:
-        """Pre-build obstacle maps for all copper layers."""
-        for layer in self.COPPER_LAYERS:
-            self._obstacle_cache[layer] = ObstacleMap(
+        """
+        Pre-build obstacle maps for all copper layers.
+
+        Layers are independent, so each one is built on its own worker
+        thread (the NumPy rasterization and grid folding release the GIL).
+        """
+        def build(layer: str) -> ObstacleMap:
+            return ObstacleMap(
                 parser=self.parser,
                 layer=layer,
                 clearance=self.clearance,
@@ -94,6 +154,10 @@ class TraceRouter:
                 allowed_net_id=None  # Block everything
             )
 
+        with ThreadPoolExecutor(max_workers=len(self.COPPER_LAYERS)) as pool:
+            maps = list(pool.map(build, self.COPPER_LAYERS))
+        self._obstacle_cache.update(zip(self.COPPER_LAYERS, maps))
+
     def _build_element_aware_cache(self) -> None:
         """Pre-build element-aware maps for all copper layers."""
         for layer in self.COPPER_LAYERS:
@@ -128,14 +192,23 @@ class TraceRouter:
         if layer in self._obstacle_cache and net_id is None:
             return self._obstacle_cache[layer]
 
+        key = (layer, net_id)
+        if key in self._obstacle_map_lru:
+            self._obstacle_map_lru.move_to_end(key)
+            return self._obstacle_map_lru[key]
+
         # Need to build a new one (with net filtering or uncached layer)
-        return ObstacleMap(
+        obstacle_map = ObstacleMap(
             parser=self.parser,
             layer=layer,
             clearance=self.clearance,
             grid_resolution=self.grid_resolution,
             allowed_net_id=net_id
         )
+        self._obstacle_map_lru[key] = obstacle_map
+        if len(self._obstacle_map_lru) > self.OBSTACLE_MAP_CACHE_SIZE:
+            self._obstacle_map_lru.popitem(last=False)
+        return obstacle_map
 
     def get_obstacle_map(self, layer: str, net_id: Optional[int] = None):
         """
@@ -178,7 +251,80 @@ class TraceRouter:
         Returns:
             List of (x, y) waypoints defining the trace path.
             Returns empty list if no valid route found.
+
+        Results are memoized per query; any change to the pending traces
+        invalidates them.
         """
+        key = (
+            round(start_x, 6), round(start_y, 6), round(end_x, 6), round(end_y, 6),
+            layer, round(width, 6), net_id,
+            self.use_legacy_astar, self.use_element_aware, self.use_jump_point_search,
+            self.pending_store.version
+        )
+        cached = self._route_cache.get(key)
+        if cached is not None:
+            self._route_cache.move_to_end(key)
+            return list(cached)
+
+        path = self._route_uncached(start_x, start_y, end_x, end_y, layer, width, net_id)
+
+        self._route_cache[key] = tuple(path)
+        if len(self._route_cache) > self.ROUTE_CACHE_SIZE:
+            self._route_cache.popitem(last=False)
+        return path
+
+    def route_many(
+        self,
+        requests: Sequence[tuple],
+        max_workers: Optional[int] = None
+    ) -> list[list[tuple[float, float]]]:
+        """
+        Route a batch of independent traces across worker processes.
+
+        Each request is a tuple of route() arguments:
+        (start_x, start_y, end_x, end_y, layer, width[, net_id]). Routing
+        does not modify the router, so requests never see each other's
+        results; commit them to the pending store afterwards if needed.
+
+        The router (board, obstacle caches, pending traces) is pickled
+        once and loaded by each worker at startup, so workers do not
+        re-parse the PCB or rebuild obstacle maps.
+
+        Args:
+            requests: route() argument tuples
+            max_workers: Worker process count (default: CPU count).
+                1 routes serially in this process.
+
+        Returns:
+            One path per request, in request order.
+        """
+        requests = [tuple(request) for request in requests]
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(requests))
+        if max_workers <= 1:
+            return [self.route(*request) for request in requests]
+
+        router_state = pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_route_worker,
+            initargs=(router_state,)
+        ) as pool:
+            chunksize = max(1, len(requests) // (max_workers * 4))
+            return list(pool.map(_route_in_worker, requests, chunksize=chunksize))
+
+    def _route_uncached(
+        self,
+        start_x: float,
+        start_y: float,
+        end_x: float,
+        end_y: float,
+        layer: str,
+        width: float,
+        net_id: Optional[int] = None
+    ) -> list[tuple[float, float]]:
+        """Dispatch a route query to the configured routing algorithm."""
         if self.use_legacy_astar:
             # Use legacy A* pathfinding
             if self.use_element_aware:
@@ -211,8 +357,6 @@ class TraceRouter:
         Produces smoother paths by following hull boundaries instead of
         grid-based pathfinding.
         """
-        import time
-        import sys
         t0 = time.time()
 
         hull_map = self._get_hull_map(layer)
@@ -329,51 +473,105 @@ class TraceRouter:
     ) -> list[tuple[float, float]]:
         """Route using legacy grid-based pathfinding."""
         # Get blocked cells from pending traces (excluding same-net traces)
-        pending_blocked = self.pending_store.get_blocked_cells(
+        pending_blocked = self.pending_store.get_blocked_grid(
             layer, self.clearance, exclude_net_id=net_id
         )
 
         # Get or build obstacle map
         if net_id is not None and layer in self._obstacle_cache:
             # Use cached map but compute allowed cells for this net
-            base_map = self._obstacle_cache[layer]
-            allowed_cells = self._get_net_cells(layer, net_id)
-            path = astar_search(
-                base_map,
-                start_x, start_y,
-                end_x, end_y,
-                width / 2,
-                allowed_cells=allowed_cells,
-                extra_blocked=pending_blocked
-            )
+            obstacle_map = self._obstacle_cache[layer]
+            allowed_grid = self._get_net_cell_grid(layer, net_id)
         else:
             obstacle_map = self._get_obstacle_map(layer, net_id)
-            path = astar_search(
-                obstacle_map,
-                start_x, start_y,
-                end_x, end_y,
-                width / 2,
-                extra_blocked=pending_blocked
+            allowed_grid = None
+
+        args = (obstacle_map, start_x, start_y, end_x, end_y, width / 2)
+        if self.use_jump_point_search:
+            return jps_search(
+                *args, allowed_grid=allowed_grid, extra_grid=pending_blocked
+            )
+
+        path, hit_limit = astar_search_with_status(
+            *args, allowed_grid=allowed_grid, extra_grid=pending_blocked
+        )
+        if hit_limit:
+            # A* is faster on the routes it finds, but gives up on long
+            # detours at its iteration limit; JPS covers those in far fewer nodes.
+            # An end that A* proved unreachable is not searched again
+            path = jps_search(
+                *args, allowed_grid=allowed_grid, extra_grid=pending_blocked
             )
 
         return path
 
+    def _disk_mask(self, r: int) -> np.ndarray:
+        """Boolean (2r+1)x(2r+1) mask of the offsets with dx² + dy² <= r²."""
+        mask = self._mask_cache.get(r)
+        if mask is None:
+            yy, xx = np.ogrid[-r:r + 1, -r:r + 1]
+            mask = (yy * yy + xx * xx) <= r * r
+            self._mask_cache[r] = mask
+        return mask
+
     def _get_net_cells(self, layer: str, net_id: int) -> set[tuple[int, int]]:
         """Get set of grid cells that belong to a specific net.
 
         For rotated pads, the allowed region is expanded to match the blocking
         radius so routes can escape. However, cells blocked by different-net
         elements are excluded to prevent clearance violations.
+
+        The cells are stored as a bitmap per (layer, net_id), so repeated
+        routes on the same net skip the rasterization.
+        """
+        entry = self._get_net_cell_grid(layer, net_id)
+        if entry is None:
+            return set()
+        allowed, (min_gx, min_gy) = entry
+        gys, gxs = np.nonzero(allowed)
+        return set(zip((gxs + min_gx).tolist(), (gys + min_gy).tolist()))
+
+    def _get_net_cell_grid(
+        self, layer: str, net_id: int
+    ) -> Optional[tuple[np.ndarray, tuple[int, int]]]:
+        """
+        Get the cells of _get_net_cells() as (bitmap, (min_gx, min_gy)).
+
+        The grid searches take this directly (allowed_grid), so a large net
+        is never turned into a set. Returns None if the net has nothing on
+        this layer; the bitmap must not be modified.
+        """
+        key = (layer, net_id)
+        if key in self._net_cell_bitmaps:
+            self._net_cell_bitmaps.move_to_end(key)
+            entry = self._net_cell_bitmaps[key]
+        else:
+            entry = self._build_net_cell_bitmap(layer, net_id)
+            self._net_cell_bitmaps[key] = entry
+            if len(self._net_cell_bitmaps) > self.NET_CELL_CACHE_SIZE:
+                self._net_cell_bitmaps.popitem(last=False)
+
+        if entry is None:
+            return None
+        allowed, min_gx, min_gy = entry
+        return allowed, (min_gx, min_gy)
+
+    def _build_net_cell_bitmap(
+        self, layer: str, net_id: int
+    ) -> Optional[tuple[np.ndarray, int, int]]:
+        """Rasterize the allowed cells of a net into (bitmap, min_gx, min_gy).
+
+        Each element is a stamp (gx, gy, rx, ry, mask) painted into a local
+        boolean grid; mask None stamps the full (2rx+1)x(2ry+1) rectangle.
+        Returns None if the net has nothing on this layer.
         """
-        import math
         resolution = self.grid_resolution
-        cells: set[tuple[int, int]] = set()
 
         def to_grid(x: float, y: float) -> tuple[int, int]:
             return (int(round(x / resolution)), int(round(y / resolution)))
 
-        # Collect cells blocked by DIFFERENT-net pads (to exclude from allowed)
-        different_net_blocked: set[tuple[int, int]] = set()
+        # Stamps blocked by DIFFERENT-net pads (to exclude from allowed)
+        different_net_stamps = []
         for pad in self.parser.pads:
             if layer not in pad.layers or pad.net_id == net_id:
                 continue  # Skip same-net or different-layer pads
@@ -384,7 +582,7 @@ class TraceRouter:
             if pad.angle != 0:
                 w = pad.width + 2 * self.clearance
                 h = pad.height + 2 * self.clearance
-                radius = math.sqrt(w * w + h * h) / 2
+                radius = math.hypot(w, h) / 2
             else:
                 # For rectangular pads, use the larger dimension as radius
                 w = pad.width + 2 * self.clearance
@@ -392,11 +590,11 @@ class TraceRouter:
                 radius = max(w, h) / 2
 
             r = int(radius / resolution) + 1
-            r_sq = r * r
-            for dx in range(-r, r + 1):
-                for dy in range(-r, r + 1):
-                    if dx * dx + dy * dy <= r_sq:
-                        different_net_blocked.add((gx + dx, gy + dy))
+            different_net_stamps.append((gx, gy, r, r, self._disk_mask(r)))
+
+        # Stamps that are always allowed, and expansions minus different-net overlap
+        core_stamps = []
+        expansion_stamps = []
 
         # Add pad cells for this net
         for pad in self.parser.pads:
@@ -404,42 +602,22 @@ class TraceRouter:
                 continue
             gx, gy = to_grid(pad.x, pad.y)
 
-            # For rotated pads, use circle with diagonal radius
             # Strategy: include cells in the expanded region (for escaping),
             # but exclude any that overlap with different-net blocking zones.
-            # Always keep a minimal core (just the pad center) for reachability.
+            # Always keep a minimal core (pad center +/- 1 cell) for reachability.
+            core_stamps.append((gx, gy, 1, 1, None))
             if pad.angle != 0:
-                # Always include minimal core (pad center +/- 1 cell)
-                for dx in range(-1, 2):
-                    for dy in range(-1, 2):
-                        cells.add((gx + dx, gy + dy))
-
-                # Add expanded region, excluding different-net overlap
+                # For rotated pads, use circle with diagonal radius
                 w = pad.width + 2 * self.clearance
                 h = pad.height + 2 * self.clearance
-                radius = math.sqrt(w * w + h * h) / 2
+                radius = math.hypot(w, h) / 2
                 r = int(radius / resolution) + 1
-                r_sq = r * r
-                for dx in range(-r, r + 1):
-                    for dy in range(-r, r + 1):
-                        if dx * dx + dy * dy <= r_sq:
-                            cell = (gx + dx, gy + dy)
-                            if cell not in different_net_blocked:
-                                cells.add(cell)
+                expansion_stamps.append((gx, gy, r, r, self._disk_mask(r)))
             else:
-                # For non-rotated pads: minimal core + expansion minus overlap
-                for dx in range(-1, 2):
-                    for dy in range(-1, 2):
-                        cells.add((gx + dx, gy + dy))
-
-                # Add clearance expansion, excluding different-net overlap
+                # For non-rotated pads: clearance expansion rectangle
                 rx = int((pad.width / 2 + self.clearance) / resolution) + 1
                 ry = int((pad.height / 2 + self.clearance) / resolution) + 1
-                for dx in range(-rx, rx + 1):
-                    for dy in range(-ry, ry + 1):
-                        cell = (gx + dx, gy + dy)
-                        if cell not in different_net_blocked:
-                            cells.add(cell)
+                expansion_stamps.append((gx, gy, rx, ry, None))
 
         # Add trace cells (only within trace geometry, no clearance)
         for trace in self.parser.get_traces_by_layer(layer):
@@ -448,22 +626,19 @@ class TraceRouter:
             # Add cells along the trace
             x1, y1 = trace.start_x, trace.start_y
             x2, y2 = trace.end_x, trace.end_y
-            length = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+            length = math.hypot(x2 - x1, y2 - y1)
             if length < 0.001:
                 gx, gy = to_grid(x1, y1)
-                cells.add((gx, gy))
+                core_stamps.append((gx, gy, 0, 0, None))
                 continue
             steps = int(length / resolution) + 1
-            for i in range(steps + 1):
-                t = i / steps
-                px = x1 + t * (x2 - x1)
-                py = y1 + t * (y2 - y1)
-                gx, gy = to_grid(px, py)
-                # Only cover the actual trace width
-                r = int((trace.width / 2) / resolution) + 1
-                for ddx in range(-r, r + 1):
-                    for ddy in range(-r, r + 1):
-                        cells.add((gx + ddx, gy + ddy))
+            t = np.arange(steps + 1) / steps
+            gxs = np.rint((x1 + t * (x2 - x1)) / resolution).astype(np.int64)
+            gys = np.rint((y1 + t * (y2 - y1)) / resolution).astype(np.int64)
+            # Only cover the actual trace width
+            r = int((trace.width / 2) / resolution) + 1
+            for gx, gy in set(zip(gxs.tolist(), gys.tolist())):
+                core_stamps.append((gx, gy, r, r, None))
 
         # Add via cells (only within via geometry, no clearance)
         for via in self.parser.vias:
@@ -472,11 +647,40 @@ class TraceRouter:
             gx, gy = to_grid(via.x, via.y)
             # Only cover the actual via area
             r = int((via.size / 2) / resolution) + 1
-            for dx in range(-r, r + 1):
-                for dy in range(-r, r + 1):
-                    cells.add((gx + dx, gy + dy))
+            core_stamps.append((gx, gy, r, r, None))
+
+        if not core_stamps:
+            return None
+
+        # Local grid covering every allowed stamp
+        allowed_stamps = core_stamps + expansion_stamps
+        min_gx = min(gx - rx for gx, _, rx, _, _ in allowed_stamps)
+        min_gy = min(gy - ry for _, gy, _, ry, _ in allowed_stamps)
+        max_gx = max(gx + rx for gx, _, rx, _, _ in allowed_stamps)
+        max_gy = max(gy + ry for _, gy, _, ry, _ in allowed_stamps)
+        height = max_gy - min_gy + 1
+        width = max_gx - min_gx + 1
+
+        def paint(stamps) -> np.ndarray:
+            grid = np.zeros((height, width), dtype=bool)
+            for gx, gy, rx, ry, mask in stamps:
+                x0 = gx - rx - min_gx
+                y0 = gy - ry - min_gy
+                cx0, cy0 = max(x0, 0), max(y0, 0)
+                cx1 = min(x0 + 2 * rx + 1, width)
+                cy1 = min(y0 + 2 * ry + 1, height)
+                if cx0 >= cx1 or cy0 >= cy1:
+                    continue
+                if mask is None:
+                    grid[cy0:cy1, cx0:cx1] = True
+                else:
+                    grid[cy0:cy1, cx0:cx1] |= mask[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0]
+            return grid
 
-        return cells
+        allowed = paint(expansion_stamps)
+        allowed &= ~paint(different_net_stamps)
+        allowed |= paint(core_stamps)
+        return allowed, min_gx, min_gy
 
     def check_via_placement(
         self,
@@ -498,35 +702,66 @@ class TraceRouter:
         Returns:
             Tuple of (valid, message). If not valid, message explains why.
         """
+        valid, messages = self.check_via_placements([x], [y], via_radius, net_id)
+        return (bool(valid[0]), messages[0])
+
+    def check_via_placements(
+        self,
+        xs,
+        ys,
+        via_radius: float,
+        net_id: Optional[int] = None
+    ) -> tuple[np.ndarray, list[str]]:
+        """
+        Check several via positions at once.
+
+        Each layer's obstacle map is resolved once for the whole batch, and
+        positions already rejected on an earlier layer are not checked again.
+
+        Args:
+            xs, ys: Via positions (mm)
+            via_radius: Via outer radius (mm)
+            net_id: Net ID to allow crossing (same net elements are OK)
+
+        Returns:
+            Tuple of (valid, messages): a boolean array with one entry per
+            position, and the reason for each rejected position ("" if valid).
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        valid = np.ones(len(xs), dtype=bool)
+        messages = [""] * len(xs)
+
         for layer in self.COPPER_LAYERS:
-            if self.use_element_aware:
-                # Use element-aware checking with exact geometry
-                if layer not in self._element_aware_cache:
-                    self._element_aware_cache[layer] = ElementAwareMap(
-                        parser=self.parser,
-                        layer=layer,
-                        clearance=self.clearance,
-                        grid_resolution=self.grid_resolution
-                    )
-                obstacle_map = self._element_aware_cache[layer]
-                if obstacle_map.is_blocked(x, y, via_radius, net_id):
-                    return (False, f"Clearance violation on {layer}")
-            else:
-                # Use cached obstacle map (legacy)
-                if layer in self._obstacle_cache:
-                    obstacle_map = self._obstacle_cache[layer]
-                    if obstacle_map.is_blocked(x, y, via_radius):
-                        # Check if blocked ONLY by same-net elements
-                        if net_id is not None and self._is_same_net_only(x, y, via_radius, layer, net_id):
-                            continue  # Same-net blocking is OK
-                        return (False, f"Clearance violation on {layer}")
-                else:
-                    # Fall back to building map (shouldn't happen with cache_obstacles=True)
-                    obstacle_map = self._get_obstacle_map(layer, net_id)
-                    if obstacle_map.is_blocked(x, y, via_radius):
-                        return (False, f"Clearance violation on {layer}")
+            is_blocked = self._via_blocked_check(layer, net_id)
+            for i in np.flatnonzero(valid):
+                if is_blocked(float(xs[i]), float(ys[i]), via_radius):
+                    valid[i] = False
+                    messages[i] = f"Clearance violation on {layer}"
+
+        return valid, messages
+
+    def _via_blocked_check(self, layer: str, net_id: Optional[int]):
+        """Return a (x, y, radius) -> bool predicate for via clearance on one layer."""
+        if self.use_element_aware:
+            # Use element-aware checking with exact geometry
+            obstacle_map = self.get_obstacle_map(layer)
+            return lambda x, y, r: obstacle_map.is_blocked(x, y, r, net_id)
+
+        if layer in self._obstacle_cache:
+            # Use cached obstacle map (legacy)
+            obstacle_map = self._obstacle_cache[layer]
+
+            def is_blocked(x: float, y: float, r: float) -> bool:
+                if not obstacle_map.is_blocked(x, y, r):
+                    return False
+                # Blocking ONLY by same-net elements is OK
+                return net_id is None or not self._is_same_net_only(x, y, r, layer, net_id)
+            return is_blocked
 
-        return (True, "")
+        # Fall back to building map (shouldn't happen with cache_obstacles=True)
+        obstacle_map = self._get_obstacle_map(layer, net_id)
+        return obstacle_map.is_blocked
 
     def _is_same_net_only(
         self,
@@ -547,54 +782,33 @@ class TraceRouter:
         for pad in self.parser.pads:
             if layer not in pad.layers:
                 continue
-            pad_radius = max(pad.width, pad.height) / 2 + self.clearance
-            dist = ((pad.x - x) ** 2 + (pad.y - y) ** 2) ** 0.5
-            if dist <= check_radius + pad_radius:
+            reach = check_radius + max(pad.width, pad.height) / 2 + self.clearance
+            dx, dy = pad.x - x, pad.y - y
+            if dx * dx + dy * dy <= reach * reach:
                 if pad.net_id != net_id:
                     return False  # Different net element is blocking
 
-        # Check traces
-        for trace in self.parser.get_traces_by_layer(layer):
-            # Point-to-line-segment distance
-            dist = self._point_to_segment_distance(
-                x, y,
-                trace.start_x, trace.start_y,
-                trace.end_x, trace.end_y
+        # Check traces (all segments on the layer at once)
+        traces = self.parser.get_trace_table(layer)
+        if len(traces):
+            dist = point_to_segments_distance(
+                x, y, traces.start_x, traces.start_y, traces.end_x, traces.end_y
             )
-            trace_radius = trace.width / 2 + self.clearance
-            if dist <= check_radius + trace_radius:
-                if trace.net_id != net_id:
-                    return False  # Different net element is blocking
+            trace_radius = traces.width / 2 + self.clearance
+            blocking = dist <= check_radius + trace_radius
+            if np.any(blocking & (traces.net_id != net_id)):
+                return False  # Different net element is blocking
 
         # Check vias (they span all layers)
         for via in self.parser.vias:
-            via_check_radius = via.size / 2 + self.clearance
-            dist = ((via.x - x) ** 2 + (via.y - y) ** 2) ** 0.5
-            if dist <= check_radius + via_check_radius:
+            reach = check_radius + via.size / 2 + self.clearance
+            dx, dy = via.x - x, via.y - y
+            if dx * dx + dy * dy <= reach * reach:
                 if via.net_id != net_id:
                     return False  # Different net element is blocking
 
         return True  # Only same-net elements are blocking
 
-    def _point_to_segment_distance(
-        self,
-        px: float, py: float,
-        x1: float, y1: float,
-        x2: float, y2: float
-    ) -> float:
-        """Calculate shortest distance from point to line segment."""
-        dx = x2 - x1
-        dy = y2 - y1
-        length_sq = dx * dx + dy * dy
-
-        if length_sq < 0.0001:
-            return ((px - x1) ** 2 + (py - y1) ** 2) ** 0.5
-
-        t = max(0, min(1, ((px - x1) * dx + (py - y1) * dy) / length_sq))
-        proj_x = x1 + t * dx
-        proj_y = y1 + t * dy
-        return ((px - proj_x) ** 2 + (py - proj_y) ** 2) ** 0.5
-
     def find_net_at_point(
         self,
         x: float,
@@ -616,22 +830,24 @@ class TraceRouter:
             Net ID if found, None otherwise
         """
         best_net_id: Optional[int] = None
-        best_dist = tolerance + 1  # Start with value beyond tolerance
+        # Compare squared distances; the ordering is the same without sqrt
+        tolerance_sq = tolerance * tolerance
+        best_dist_sq = float('inf')
 
         # Check pads - find closest one
-        for pad in self.parser.pads:
-            if layer not in pad.layers:
-                continue
-            dist = ((pad.x - x) ** 2 + (pad.y - y) ** 2) ** 0.5
-            if dist <= tolerance and dist < best_dist:
-                best_dist = dist
+        for pad in self.parser.get_pads_near(x, y, layer, tolerance):
+            dx, dy = pad.x - x, pad.y - y
+            dist_sq = dx * dx + dy * dy
+            if dist_sq <= tolerance_sq and dist_sq < best_dist_sq:
+                best_dist_sq = dist_sq
                 best_net_id = pad.net_id
 
         # Check vias - find closest one
-        for via in self.parser.vias:
-            dist = ((via.x - x) ** 2 + (via.y - y) ** 2) ** 0.5
-            if dist <= tolerance and dist < best_dist:
-                best_dist = dist
+        for via in self.parser.get_vias_near(x, y, tolerance):
+            dx, dy = via.x - x, via.y - y
+            dist_sq = dx * dx + dy * dy
+            if dist_sq <= tolerance_sq and dist_sq < best_dist_sq:
+                best_dist_sq = dist_sq
                 best_net_id = via.net_id
 
         return best_net_id
@@ -63,7 +63,7 @@ class SpatialIndex:
         """Add a pad to the index."""
         # Calculate bounding box accounting for rotation
         if pad.angle != 0:
-            diag = math.sqrt(pad.width ** 2 + pad.height ** 2) / 2
+            diag = math.hypot(pad.width, pad.height) / 2
             extent = diag + self.clearance
         else:
             extent = max(pad.width, pad.height) / 2 + self.clearance
@@ -192,3 +192,54 @@ class SpatialIndex:
             return None
         cell = self._cell_coords(x, y)
         return grid.get(cell)
+
+
+class SegmentIndex:
+    """
+    Grid-based index of line segments for point proximity queries.
+
+    Each segment is bucketed by its bounding box grown by a fixed margin,
+    so a point query only reads the one cell containing the point.
+    """
+
+    def __init__(self, margin: float, cell_size: float = 1.0):
+        """
+        Initialize segment index.
+
+        Args:
+            margin: Largest distance a query cares about (mm)
+            cell_size: Size of grid cells in mm
+        """
+        self.margin = margin
+        self.cell_size = cell_size
+        self._inv_cell_size = 1.0 / cell_size
+        self._grid: dict[tuple[int, int], list[tuple]] = {}
+        self.size = 0
+
+    def add_segment(self, x1: float, y1: float, x2: float, y2: float, data: object) -> None:
+        """Add segment (x1, y1)-(x2, y2) with an arbitrary payload."""
+        m = self.margin
+        entry = (
+            min(x1, x2) - m, max(x1, x2) + m, min(y1, y2) - m, max(y1, y2) + m,
+            x1, y1, x2, y2, data
+        )
+        inv = self._inv_cell_size
+        for cx in range(math.floor(entry[0] * inv), math.floor(entry[1] * inv) + 1):
+            for cy in range(math.floor(entry[2] * inv), math.floor(entry[3] * inv) + 1):
+                self._grid.setdefault((cx, cy), []).append(entry)
+        self.size += 1
+
+    def query_point(self, x: float, y: float) -> Iterator[tuple]:
+        """
+        Yield (x1, y1, x2, y2, data) for every segment within margin of (x, y).
+
+        Candidates are filtered by grown bounding box only; the caller does
+        the exact distance check.
+        """
+        inv = self._inv_cell_size
+        entries = self._grid.get((math.floor(x * inv), math.floor(y * inv)))
+        if entries is None:
+            return
+        for min_x, max_x, min_y, max_y, x1, y1, x2, y2, data in entries:
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                yield x1, y1, x2, y2, data
@@ -1,6 +1,8 @@
 """Walkaround routing algorithm for PCB trace routing."""
 from __future__ import annotations
 import math
+import sys
+from collections import deque
 from typing import Optional
 from dataclasses import dataclass
 
@@ -17,6 +19,9 @@ class WalkaroundResult:
     path: list[Point]
     success: bool
     iterations: int
+    # Why a failed route stopped: 'stall', 'oscillation', 'max_iterations',
+    # 'no_escape' (stuck on a revisited hull) or 'no_path' (no way around a hull)
+    bailout_reason: Optional[str] = None
 
 
 class WalkaroundRouter:
@@ -84,10 +89,19 @@ class WalkaroundRouter:
         iterations = 0
         visited_hulls: set[int] = set()
 
-        # Track progress - bail if we're not getting closer
+        # Track progress - bail if we're not getting closer. The stall window
+        # halves (down to min_stall) each time a walk moves away from the goal
+        # and resets when a walk gets at least 5% closer
         best_dist_sq = (end.x - start.x) ** 2 + (end.y - start.y) ** 2
+        prev_dist_sq = best_dist_sq
         stall_count = 0
         max_stall = 20
+        min_stall = 5
+        stall_window = max_stall
+
+        # Exit points of the last few walks. The loop state between walks is
+        # just the current point, so an A-B-A-B pattern repeats forever
+        recent_exits: deque[Point] = deque(maxlen=4)
 
         while iterations < self.max_iterations:
             iterations += 1
@@ -113,7 +127,8 @@ class WalkaroundRouter:
                     continue
                 else:
                     # Can't escape, fail
-                    return WalkaroundResult(path=path, success=False, iterations=iterations)
+                    return WalkaroundResult(path=path, success=False, iterations=iterations,
+                                            bailout_reason='no_escape')
 
             visited_hulls.add(hull_id)
 
@@ -126,32 +141,44 @@ class WalkaroundRouter:
 
             if best_path is None or len(best_path) == 0:
                 # Neither direction worked
-                return WalkaroundResult(path=path, success=False, iterations=iterations)
+                return WalkaroundResult(path=path, success=False, iterations=iterations,
+                                        bailout_reason='no_path')
 
             # Add the walkaround path (excluding entry point which is close to current)
             path.extend(best_path)
             current = best_path[-1]
 
+            recent_exits.append(current)
+            if (len(recent_exits) == 4 and recent_exits[0] == recent_exits[2]
+                    and recent_exits[1] == recent_exits[3]):
+                print(f"[Walkaround] Oscillating after {iterations} iterations", file=sys.stderr, flush=True)
+                return WalkaroundResult(path=path, success=False, iterations=iterations,
+                                        bailout_reason='oscillation')
+
             # Check if we're making progress toward the goal
             current_dist_sq = (end.x - current.x) ** 2 + (end.y - current.y) ** 2
             if current_dist_sq < best_dist_sq * 0.95:  # At least 5% closer
                 best_dist_sq = current_dist_sq
                 stall_count = 0
+                stall_window = max_stall
             else:
+                if current_dist_sq > prev_dist_sq:
+                    stall_window = max(min_stall, stall_window // 2)
                 stall_count += 1
-                if stall_count >= max_stall:
-                    import sys
-                    print(f"[Walkaround] Stalled after {iterations} iterations (no progress for {max_stall} iters)", file=sys.stderr, flush=True)
-                    return WalkaroundResult(path=path, success=False, iterations=iterations)
+                if stall_count >= stall_window:
+                    print(f"[Walkaround] Stalled after {iterations} iterations (no progress for {stall_count} iters)", file=sys.stderr, flush=True)
+                    return WalkaroundResult(path=path, success=False, iterations=iterations,
+                                            bailout_reason='stall')
+            prev_dist_sq = current_dist_sq
 
             # Clear visited hulls when we successfully navigate around one
             # This allows revisiting if we approach from a different angle
             visited_hulls.clear()
 
         # Max iterations reached
-        import sys
         print(f"[Walkaround] Max iterations ({iterations}) reached, path has {len(path)} points", file=sys.stderr, flush=True)
-        return WalkaroundResult(path=path, success=False, iterations=iterations)
+        return WalkaroundResult(path=path, success=False, iterations=iterations,
+                                bailout_reason='max_iterations')
 
     def _find_first_blocking_hull(
         self,
@@ -249,13 +276,8 @@ class WalkaroundRouter:
         Returns:
             Point offset outward from the hull
         """
-        e1, e2 = hull.get_edge(edge_idx)
-
-        # Edge direction and outward normal
-        edge_dir = (e2 - e1).normalized()
-        # For CCW polygon, outward normal is edge direction rotated 90° clockwise
-        # Rotation: (dx, dy) -> (dy, -dx)
-        outward = Point(edge_dir.y, -edge_dir.x)
+        # Outward normal of the edge, cached on the hull
+        outward = hull.edge_normals[edge_idx]
 
         return point + outward * (self.half_width + self.corner_offset)
 
@@ -271,28 +293,8 @@ class WalkaroundRouter:
         Returns:
             Point offset outward from the corner
         """
-        n = len(hull.points)
-        prev_idx = (vertex_idx - 1) % n
-        next_idx = (vertex_idx + 1) % n
-
-        prev_pt = hull.points[prev_idx]
-        next_pt = hull.points[next_idx]
-
-        # Edge directions
-        v1 = (vertex - prev_pt).normalized()  # Direction of edge before vertex
-        v2 = (next_pt - vertex).normalized()  # Direction of edge after vertex
-
-        # For CCW polygon, outward normal is edge direction rotated 90° clockwise
-        # Rotation: (dx, dy) -> (dy, -dx)
-        n1 = Point(v1.y, -v1.x)  # Outward normal for edge before vertex
-        n2 = Point(v2.y, -v2.x)  # Outward normal for edge after vertex
-
-        # Average the normals to get outward direction at vertex
-        outward = (n1 + n2).normalized()
-
-        # If outward is zero (180-degree angle), use perpendicular to edge
-        if outward.length() < 0.01:
-            outward = n1
+        # Averaged normals of the adjacent edges, cached on the hull
+        outward = hull.vertex_normals[vertex_idx]
 
         # Offset by half width + corner offset
         offset = self.half_width + self.corner_offset
@@ -35,7 +35,7 @@ def _circle_from_three_points(
     ux = ((ax*ax + ay*ay) * (by - cy) + (bx*bx + by*by) * (cy - ay) + (cx*cx + cy*cy) * (ay - by)) / d
     uy = ((ax*ax + ay*ay) * (cx - bx) + (bx*bx + by*by) * (ax - cx) + (cx*cx + cy*cy) * (bx - ax)) / d
 
-    radius = math.sqrt((ax - ux)**2 + (ay - uy)**2)
+    radius = math.hypot(ax - ux, ay - uy)
     return ux, uy, radius
 
 
@@ -1,4 +1,5 @@
 """SVG document generator for PCB visualization."""
+import math
 from xml.etree.ElementTree import Element, SubElement, tostring
 
 from backend.pcb.parser import PCBParser
@@ -17,15 +18,25 @@ DEFAULT_CLEARANCE = 0.2
 class SVGGenerator:
     """Generate SVG representation of a PCB."""
 
+    # Number of full documents (layer selections) to keep
+    DOCUMENT_CACHE_SIZE = 16
+
     def __init__(self, parser: PCBParser):
         """Initialize with a parsed PCB."""
         self.parser = parser
         self.board_info = parser.get_board_info()
+        # Serialized layer groups and shared groups (clearance, vias, drills)
+        self._fragment_cache: dict[str, str] = {}
+        # Full documents by (layers, margin)
+        self._document_cache: dict[tuple[tuple[str, ...], float], str] = {}
 
     def generate(self, layers: list[str] | None = None, margin: float = 2.0) -> str:
         """
         Generate SVG document.
 
+        Layer groups are serialized once and reused by later calls with
+        other layer selections; repeated calls return the cached document.
+
         Args:
             layers: List of layers to include, or None for all
             margin: Margin around the board (mm)
@@ -36,6 +47,17 @@ class SVGGenerator:
         if layers is None:
             layers = LAYER_ORDER
 
+        key = (tuple(layers), margin)
+        document = self._document_cache.get(key)
+        if document is None:
+            document = self._build_document(layers, margin)
+            self._document_cache[key] = document
+            if len(self._document_cache) > self.DOCUMENT_CACHE_SIZE:
+                del self._document_cache[next(iter(self._document_cache))]
+        return document
+
+    def _build_document(self, layers: list[str], margin: float) -> str:
+        """Assemble the SVG document from the root tag and cached fragments."""
         # Calculate viewBox with margin
         min_x = self.board_info.min_x - margin
         min_y = self.board_info.min_y - margin
@@ -65,54 +87,84 @@ class SVGGenerator:
             "fill": BACKGROUND_COLOR,
         })
 
+        # Serialize the root with its first children and splice the cached
+        # groups in before the closing tag
+        head = tostring(svg, encoding="unicode")
+        closing = "</svg>"
+        parts = [head[:-len(closing)]]
+
         # Add clearance layer (rendered first, behind everything)
-        clearance_group = SubElement(svg, "g", {
+        parts.append(self._fragment("Clearance", self._build_clearance_group))
+
+        # Create layer groups in render order
+        for layer in LAYER_ORDER:
+            if layer in layers:
+                parts.append(self._fragment(layer, lambda: self._build_layer_group(layer)))
+
+        # Add vias on top of traces, then drill holes on top
+        parts.append(self._fragment("vias", self._build_via_group))
+        parts.append(self._fragment("drill-holes", self._build_drill_group))
+
+        parts.append(closing)
+        return "".join(parts)
+
+    def _fragment(self, key: str, build) -> str:
+        """Serialized group for key, built by build() on first use."""
+        fragment = self._fragment_cache.get(key)
+        if fragment is None:
+            fragment = tostring(build(), encoding="unicode")
+            self._fragment_cache[key] = fragment
+        return fragment
+
+    def _build_clearance_group(self) -> Element:
+        """Group with the (initially hidden) clearance outlines."""
+        group = Element("g", {
             "id": "layer-Clearance",
             "class": "layer clearance-layer hidden",
             "data-layer": "Clearance",
         })
-        self._add_clearances(clearance_group)
-
-        # Create layer groups in render order
-        for layer in LAYER_ORDER:
-            if layer not in layers:
-                continue
-
-            group = SubElement(svg, "g", {
-                "id": f"layer-{layer.replace('.', '-')}",
-                "class": "layer",
-                "data-layer": layer,
-            })
+        self._add_clearances(group)
+        return group
+
+    def _build_layer_group(self, layer: str) -> Element:
+        """Group with the graphics, traces, pads and labels of one layer."""
+        group = Element("g", {
+            "id": f"layer-{layer.replace('.', '-')}",
+            "class": "layer",
+            "data-layer": layer,
+        })
 
-            # Add graphics for this layer
-            self._add_layer_graphics(group, layer)
+        # Add graphics for this layer
+        self._add_layer_graphics(group, layer)
 
-            # Add traces and pads for copper layers
-            if layer in COPPER_LAYERS:
-                self._add_layer_traces(group, layer)
-                self._add_layer_pads(group, layer)
+        # Add traces and pads for copper layers
+        if layer in COPPER_LAYERS:
+            self._add_layer_traces(group, layer)
+            self._add_layer_pads(group, layer)
 
-            # Add labels for the Labels layer
-            if layer == "Labels":
-                self._add_labels(group)
+        # Add labels for the Labels layer
+        if layer == "Labels":
+            self._add_labels(group)
+        return group
 
-        # Add vias on top of traces
-        via_group = SubElement(svg, "g", {
+    def _build_via_group(self) -> Element:
+        """Group with all vias."""
+        group = Element("g", {
             "id": "vias",
             "class": "via-layer",
         })
-        self._add_vias(via_group)
+        self._add_vias(group)
+        return group
 
-        # Add drill holes on top
-        drill_group = SubElement(svg, "g", {
+    def _build_drill_group(self) -> Element:
+        """Group with pad drill holes and via holes."""
+        group = Element("g", {
             "id": "drill-holes",
             "class": "drill-layer",
         })
-        self._add_drill_holes(drill_group)
-        self._add_via_holes(drill_group)
-
-        # Convert to string
-        return tostring(svg, encoding="unicode")
+        self._add_drill_holes(group)
+        self._add_via_holes(group)
+        return group
 
     def _generate_css(self) -> str:
         """Generate CSS styles for the SVG."""
@@ -301,7 +353,6 @@ class SVGGenerator:
 
             if pad.angle != 0:
                 # For rotated pads, use a polygon approximation
-                import math
                 w2, h2 = expanded_width / 2, expanded_height / 2
                 corners = [
                     (pad.x - w2, pad.y - h2),
@@ -375,8 +426,6 @@ class SVGGenerator:
         min_font_size = 0.01  # Minimum font size (text may be very small on tiny pads)
 
         for pad in self.parser.pads:
-            import math
-
             # Orient text along the longest pad dimension
             # If height > width, rotate text 90° to run along height
             text_angle = pad.angle
@@ -7,24 +7,28 @@
 #   ./run_tests.sh slow     # Run slow tests in parallel (~35s)
 #   ./run_tests.sh all      # Run all tests in parallel (~35s)
 #
-# Requires: pip install pytest-xdist
+# Requires: pip install -r requirements-dev.txt
+#
+# Tests marked with xdist_group run on one worker, so e.g. the performance
+# tests run in order on the router their module builds.
 
 set -e
 
 MODE="${1:-fast}"
+TESTS="tests/test_routing.py tests/test_routing_performance.py tests/test_u2_crossing.py tests/test_walkaround_offset.py tests/test_walkaround_stall.py"
 
 case "$MODE" in
     fast)
         echo "Running fast tests (parallel)..."
-        python -m pytest tests/test_routing.py -m "not slow" -n auto -v
+        python -m pytest $TESTS -m "not slow" -n auto --dist=loadgroup -v
         ;;
     slow)
         echo "Running slow tests (parallel)..."
-        python -m pytest tests/test_routing.py -m "slow" -n auto -v
+        python -m pytest $TESTS -m "slow" -n auto --dist=loadgroup -v
         ;;
     all)
         echo "Running all tests (parallel)..."
-        python -m pytest tests/test_routing.py -n auto -v
+        python -m pytest $TESTS -n auto --dist=loadgroup -v
         ;;
     *)
         echo "Usage: $0 [fast|slow|all]"
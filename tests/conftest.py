@@ -1,10 +1,18 @@
 """Pytest configuration for SemiRouter tests."""
+import functools
+import json
+import logging
 import pickle
 import pytest
+import signal
 from pathlib import Path
 
 from backend.pcb import PCBParser
+from backend.pcb.models import PadInfo
 from backend.routing import TraceRouter, ObstacleMap
+from backend.routing.hull_map import HullMap
+from backend.routing.hulls import warm_up_contacts_kernel
+from backend.routing.pathfinding import warm_up_kernel
 
 
 # Cache directory for pickled fixtures
@@ -18,6 +26,15 @@ def pytest_configure(config):
         "markers",
         "slow: marks tests as slow (run with -m slow or skip with -m 'not slow')"
     )
+    # Provided by pytest-xdist; with --dist=loadgroup a group runs on one worker
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): run the marked tests on the same xdist worker"
+    )
+    # Tests log diagnostics at DEBUG; they are only formatted when a level is
+    # requested, e.g. with --log-cli-level=DEBUG
+    if config.getoption("log_level") is None and config.getoption("log_cli_level") is None:
+        logging.getLogger("tests").setLevel(logging.INFO)
 
 
 def _get_cache_path(name: str) -> Path:
@@ -56,17 +73,142 @@ def _load_or_build(cache_path: Path, builder):
     return obj
 
 
+@functools.lru_cache(maxsize=1)
+def _pad_manifest() -> frozenset[tuple[str, str]]:
+    """
+    (footprint_ref, pad_name) pairs present in the test PCB.
+
+    Stored as a small JSON file next to the pickled fixtures so that
+    collection-time skip checks don't need to parse the board.
+    """
+    cache_path = CACHE_DIR / "pad_manifest.json"
+    if _is_cache_valid(cache_path):
+        try:
+            with open(cache_path) as f:
+                return frozenset(tuple(entry) for entry in json.load(f))
+        except Exception:
+            pass  # Rebuild on any error
+
+    pcb = PCBParser(PCB_FILE)
+    manifest = frozenset((pad.footprint_ref, pad.name) for pad in pcb.pads)
+
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(sorted(manifest), f)
+    except Exception:
+        pass  # Don't fail if we can't cache
+
+    return manifest
+
+
+def has_pads(*pads: tuple[str, str]) -> bool:
+    """Check whether all (footprint_ref, pad_name) pairs exist in the test PCB."""
+    return set(pads) <= _pad_manifest()
+
+
+def requires_pads(*pads: tuple[str, str]):
+    """skipif marker that skips at collection time when pads are missing."""
+    names = ", ".join(f"{ref}:{name}" for ref, name in pads)
+    return pytest.mark.skipif(not has_pads(*pads), reason=f"Required pads {names} not found")
+
+
+def with_timeout(seconds: float):
+    """
+    Decorator that fails the test if its body runs longer than seconds.
+
+    Uses SIGALRM, so it works without pytest-timeout; fixtures are not
+    covered, and a compiled kernel is only interrupted once it returns.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            def on_alarm(signum, frame):
+                pytest.fail(f"Test timed out after {seconds}s", pytrace=False)
+
+            previous = signal.signal(signal.SIGALRM, on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, seconds)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous)
+        return wrapper
+    return decorator
+
+
+@pytest.fixture(scope="session")
+def pad_presence() -> frozenset[tuple[str, str]]:
+    """Set of (footprint_ref, pad_name) pairs present in the test PCB."""
+    return _pad_manifest()
+
+
 @pytest.fixture(scope="session")
 def parser():
     """Load the test PCB file (cached for entire test session)."""
-    cache_path = _get_cache_path("parser")
-    return _load_or_build(cache_path, lambda: PCBParser(PCB_FILE))
+    CACHE_DIR.mkdir(exist_ok=True)
+    return PCBParser(PCB_FILE, cache_dir=CACHE_DIR)
+
+
+@pytest.fixture(scope="session")
+def compiled_kernels():
+    """
+    Compile the A* and hull contacts kernels up front, not inside the
+    first (timed) routing test. The routing and hull fixtures depend on
+    this, so parser- or render-only runs skip the compilation.
+    """
+    warm_up_kernel()
+    warm_up_contacts_kernel()
+
+
+@pytest.fixture(scope="session")
+def pad_index(parser) -> dict[tuple[str, str], PadInfo]:
+    """First pad of each (footprint_ref, pad_name) pair in the test PCB."""
+    index: dict[tuple[str, str], PadInfo] = {}
+    for pad in parser.pads:
+        index.setdefault((pad.footprint_ref, pad.name), pad)
+    return index
+
+
+@pytest.fixture(scope="session")
+def router(parser, compiled_kernels):
+    """Default (hull walkaround) router shared by the whole test session."""
+    return TraceRouter(parser, clearance=0.2, cache_obstacles=True)
+
+
+@pytest.fixture(scope="session")
+def hull_map(parser, compiled_kernels):
+    """
+    Hull map for F.Cu layer shared by the whole test session.
+
+    WalkaroundRouter only queries it; pending hulls are only added by
+    TraceRouter, which builds its own hull maps.
+    """
+    return HullMap(parser, 'F.Cu', clearance=0.2)
+
+
+@pytest.fixture(scope="session")
+def obstacle_map_factory(parser, compiled_kernels):
+    """
+    Memoized factory for ObstacleMap(parser, layer, clearance, allowed_net_id).
+
+    Tests only read the maps, so each distinct argument set is built once.
+    """
+    @functools.lru_cache(maxsize=32)
+    def get_map(
+        layer: str = "F.Cu", clearance: float = 0.2, allowed_net_id: int | None = None
+    ) -> ObstacleMap:
+        return ObstacleMap(
+            parser, layer=layer, clearance=clearance, allowed_net_id=allowed_net_id
+        )
+
+    return get_map
 
 
 @pytest.fixture(scope="session")
-def cached_obstacle_map_fcu(parser):
+def cached_obstacle_map_fcu(parser, compiled_kernels):
     """Create a cached obstacle map for F.Cu layer with pre-expanded cells."""
-    cache_path = _get_cache_path("obstacle_map_fcu_v2")
+    cache_path = _get_cache_path("obstacle_map_fcu_v9")
 
     # Check if we can load from cache
     if _is_cache_valid(cache_path):
@@ -82,7 +224,7 @@ def cached_obstacle_map_fcu(parser):
     obs_map = ObstacleMap(parser, layer="F.Cu", clearance=0.2)
 
     # Pre-expand for common trace radii (0.125mm for 0.25mm trace)
-    obs_map.get_expanded_blocked(0.125)
+    obs_map.get_expanded_columns(0.125)
 
     # Save to cache
     try:
@@ -97,9 +239,9 @@ def cached_obstacle_map_fcu(parser):
 
 
 @pytest.fixture(scope="session")
-def cached_router(parser):
+def cached_router(parser, compiled_kernels):
     """Create a router with cached obstacle maps and pre-expanded cells."""
-    cache_path = _get_cache_path("router_obstacles_v2")
+    cache_path = _get_cache_path("router_obstacles_v9")
 
     # Check if we can load obstacle cache from pickle
     obstacle_cache = None
@@ -123,7 +265,7 @@ def cached_router(parser):
 
         # Pre-expand for common trace radii (saves ~10s per search)
         for obs_map in router._obstacle_cache.values():
-            obs_map.get_expanded_blocked(0.125)  # For 0.25mm trace
+            obs_map.get_expanded_columns(0.125)  # For 0.25mm trace
 
         # Save to pickle
         try:
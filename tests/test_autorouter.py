@@ -1,4 +1,5 @@
 """Tests for the AutoRouter class."""
+import numpy as np
 import pytest
 from unittest.mock import MagicMock, patch
 
@@ -17,6 +18,13 @@ def mock_trace_router():
     return router
 
 
+def via_checks(valid: bool, message: str = ""):
+    """Fake check_via_placements that accepts or rejects every position."""
+    def check(xs, ys, via_radius, net_id=None):
+        return np.full(len(xs), valid), [message] * len(xs)
+    return check
+
+
 @pytest.fixture
 def auto_router(mock_trace_router):
     """Create an AutoRouter with mock dependencies."""
@@ -98,7 +106,7 @@ class TestAutoRouterUnit:
             return []
 
         mock_trace_router.route.side_effect = route_side_effect
-        mock_trace_router.check_via_placement.return_value = (True, "")
+        mock_trace_router.check_via_placements.side_effect = via_checks(True)
 
         result = auto_router.auto_route(
             start_x=0, start_y=0,
@@ -119,7 +127,7 @@ class TestAutoRouterUnit:
         # All direct routes blocked
         mock_trace_router.route.return_value = []
         # Via placement blocked
-        mock_trace_router.check_via_placement.return_value = (False, "Clearance violation")
+        mock_trace_router.check_via_placements.side_effect = via_checks(False, "Clearance violation")
 
         result = auto_router.auto_route(
             start_x=0, start_y=0,
@@ -132,11 +140,14 @@ class TestAutoRouterUnit:
 
         assert not result.success
         assert "blocked" in result.message.lower()
+        # Blocked vias are rejected in one batch, before any via routing
+        mock_trace_router.check_via_placements.assert_called_once()
+        assert mock_trace_router.route.call_count == len(AutoRouter.COPPER_LAYERS)
 
     def test_all_paths_blocked(self, auto_router, mock_trace_router):
         """Test failure when all paths are blocked."""
         mock_trace_router.route.return_value = []
-        mock_trace_router.check_via_placement.return_value = (True, "")
+        mock_trace_router.check_via_placements.side_effect = via_checks(True)
 
         result = auto_router.auto_route(
             start_x=0, start_y=0,
@@ -170,6 +181,40 @@ class TestViaCandidateGeneration:
         offset_candidates = [c for c in candidates if abs(c[1]) > 0.5]
         assert len(offset_candidates) > 0
 
+    def test_via_candidates_order_and_positions(self, auto_router, mock_trace_router):
+        """Test the exact candidate layout: on-path points first, then offset pairs."""
+        candidates = auto_router._generate_via_candidates(0, 0, 0, 20)
+
+        # 20mm path -> 2mm offset; perpendicular of +Y is -X
+        expected = [
+            (0, 5), (0, 10), (0, 15),
+            (-2, 10), (2, 10),
+            (-2, 5), (2, 5),
+            (-2, 15), (2, 15),
+        ]
+        assert len(candidates) == len(expected)
+        for actual, want in zip(candidates, expected):
+            assert actual == pytest.approx(want)
+        assert all(isinstance(c, tuple) for c in candidates)
+
+    def test_candidate_layout_in_each_axis_direction(self, auto_router, mock_trace_router):
+        """Paths along +-X and +-Y get the same layout, offset to the left of the path."""
+        for start, end, perp in [
+            ((0, 0), (20, 0), (0, 1)),
+            ((0, 0), (-20, 0), (0, -1)),
+            ((5, 5), (5, 25), (-1, 0)),
+            ((5, 5), (5, -15), (1, 0)),
+        ]:
+            candidates = auto_router._generate_via_candidates(*start, *end)
+            expected = []
+            for t, side in [(0.25, 0), (0.5, 0), (0.75, 0), (0.5, 1), (0.5, -1),
+                            (0.25, 1), (0.25, -1), (0.75, 1), (0.75, -1)]:
+                expected.append((
+                    start[0] + t * (end[0] - start[0]) + side * 2 * perp[0],
+                    start[1] + t * (end[1] - start[1]) + side * 2 * perp[1],
+                ))
+            assert candidates == expected
+
     def test_via_candidates_short_path(self, auto_router, mock_trace_router):
         """Test via candidates for very short paths."""
         candidates = auto_router._generate_via_candidates(0, 0, 0.001, 0)
@@ -230,14 +275,10 @@ class TestAutoRouterIntegration:
     def test_auto_route_returns_result_structure(self, real_auto_router, parser):
         """Test that auto-route returns proper result structure."""
         # Find any pad to start from
-        pad = None
-        for p in parser.pads:
-            if "F.Cu" in p.layers and p.net_id > 0:
-                pad = p
-                break
-
-        if not pad:
+        rows = parser.select_pads(layer="F.Cu", connected=True)
+        if len(rows) == 0:
             pytest.skip("No suitable pad found")
+        pad = parser.pads[rows[0]]
 
         result = real_auto_router.auto_route(
             start_x=pad.x,
@@ -1,24 +1,16 @@
 """Tests for trace clearance to other-net pads."""
+import logging
 import pytest
 import math
+import numpy as np
 
-from backend.pcb.parser import PCBParser
-from backend.routing import TraceRouter, ObstacleMap, GeometryChecker
-from backend.routing.hulls import Point
+from backend.pcb.models import PadInfo
+from backend.routing import GeometryChecker
+from backend.routing.hulls import HullGenerator, Point
 from backend.routing.hull_map import HullMap
-from backend.config import DEFAULT_PCB_FILE
+from tests.conftest import requires_pads
 
-
-@pytest.fixture
-def parser():
-    """Load the test PCB."""
-    return PCBParser(DEFAULT_PCB_FILE)
-
-
-@pytest.fixture
-def router(parser):
-    """Create a router with obstacle caching."""
-    return TraceRouter(parser, clearance=0.2, cache_obstacles=True)
+logger = logging.getLogger(__name__)
 
 
 def segment_to_pad_min_distance(x1, y1, x2, y2, pad, num_samples=50):
@@ -28,44 +20,76 @@ def segment_to_pad_min_distance(x1, y1, x2, y2, pad, num_samples=50):
     Samples points along the segment and uses GeometryChecker for accurate
     distance calculation that handles rotated pads correctly.
     """
-    length = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    length = math.hypot(x2 - x1, y2 - y1)
     if length < 0.001:
         return GeometryChecker.point_to_pad_distance(x1, y1, pad)
 
-    min_dist = float('inf')
-    for i in range(num_samples + 1):
-        t = i / num_samples
-        px = x1 + t * (x2 - x1)
-        py = y1 + t * (y2 - y1)
-        dist = GeometryChecker.point_to_pad_distance(px, py, pad)
-        min_dist = min(min_dist, dist)
+    t = np.linspace(0.0, 1.0, num_samples + 1)
+    dists = GeometryChecker.points_to_pad_distance(
+        x1 + t * (x2 - x1), y1 + t * (y2 - y1), pad
+    )
+    return float(dists.min())
 
-    return min_dist
 
+class PadCandidates:
+    """
+    Other-net pad candidates per (layer, exclude_net_id), built on demand.
 
-def check_path_clearance_to_pads(path, trace_width, layer, pads, exclude_net_id, clearance):
+    Each entry is (pads, bboxes) where bboxes is an (N, 4) array of
+    [min_x, min_y, max_x, max_y] rows. Boxes use the pad half-diagonal so
+    they bound the pad at any rotation.
+    """
+
+    def __init__(self, parser):
+        self.parser = parser
+        self._cache = {}
+
+    def get(self, layer, exclude_net_id):
+        key = (layer, exclude_net_id)
+        if key not in self._cache:
+            pads = [p for p in self.parser.get_pads_by_layer(layer) if p.net_id != exclude_net_id]
+            cx = np.array([p.x for p in pads], dtype=np.float64)
+            cy = np.array([p.y for p in pads], dtype=np.float64)
+            r = np.array([math.hypot(p.width, p.height) / 2 for p in pads], dtype=np.float64)
+            bboxes = np.column_stack([cx - r, cy - r, cx + r, cy + r]).reshape(-1, 4)
+            self._cache[key] = (pads, bboxes)
+        return self._cache[key]
+
+
+@pytest.fixture(scope="module")
+def pad_candidates(parser):
+    """Shared per-layer/per-net pad candidate index for clearance checks."""
+    return PadCandidates(parser)
+
+
+def check_path_clearance_to_pads(path, trace_width, candidates, clearance):
     """
     Check that a path maintains clearance to all pads of other nets.
 
-    Uses GeometryChecker for accurate distance calculation that handles
-    rotated pads correctly (not just bounding circle approximation).
+    candidates is a (pads, bboxes) entry from PadCandidates.get(); only pads
+    whose bounding box overlaps a segment's clearance envelope are checked
+    with exact geometry. Uses GeometryChecker for accurate distance
+    calculation that handles rotated pads correctly (not just bounding
+    circle approximation).
 
     Returns list of violations: [(segment_idx, pad_id, net_id, actual_clearance, required_clearance)]
     """
     trace_radius = trace_width / 2
+    margin = trace_radius + clearance
+    pads, bboxes = candidates
     violations = []
 
-    for pad in pads:
-        # Skip if pad not on this layer or same net
-        if layer not in pad.layers:
-            continue
-        if pad.net_id == exclude_net_id:
-            continue
+    for i in range(len(path) - 1):
+        x1, y1 = path[i]
+        x2, y2 = path[i + 1]
+
+        hits = np.flatnonzero(
+            (bboxes[:, 0] <= max(x1, x2) + margin) & (bboxes[:, 2] >= min(x1, x2) - margin) &
+            (bboxes[:, 1] <= max(y1, y2) + margin) & (bboxes[:, 3] >= min(y1, y2) - margin)
+        )
 
-        # Check each segment of the path
-        for i in range(len(path) - 1):
-            x1, y1 = path[i]
-            x2, y2 = path[i + 1]
+        for k in hits:
+            pad = pads[k]
 
             # Distance from trace segment to pad edge (using exact geometry)
             dist_to_pad_edge = segment_to_pad_min_distance(x1, y1, x2, y2, pad)
@@ -88,7 +112,7 @@ def check_path_clearance_to_pads(path, trace_width, layer, pads, exclude_net_id,
 class TestTraceClearance:
     """Test that routed traces maintain clearance to other-net pads."""
 
-    def test_route_avoids_other_net_pads(self, router, parser):
+    def test_route_avoids_other_net_pads(self, router, parser, pad_candidates):
         """
         Route between two points and verify the path doesn't get too close
         to pads of other nets.
@@ -104,7 +128,7 @@ class TestTraceClearance:
         end_pad = None
         for p in gnd_pads:
             if p.pad_id != start_pad.pad_id and layer in p.layers:
-                dist = math.sqrt((p.x - start_pad.x)**2 + (p.y - start_pad.y)**2)
+                dist = math.hypot(p.x - start_pad.x, p.y - start_pad.y)
                 if dist > 5:  # At least 5mm away
                     end_pad = p
                     break
@@ -127,22 +151,46 @@ class TestTraceClearance:
 
         # Check clearance to all pads
         violations = check_path_clearance_to_pads(
-            path, trace_width, layer, parser.pads,
-            exclude_net_id=start_pad.net_id,
+            path, trace_width, pad_candidates.get(layer, start_pad.net_id),
             clearance=router.clearance
         )
 
         if violations:
-            print(f"\nClearance violations found:")
+            logger.debug("Clearance violations found:")
             for seg_idx, pad_id, net_id, actual, required in violations:
                 net_name = parser.nets.get(net_id, f"net_{net_id}")
-                print(f"  Segment {seg_idx}: pad {pad_id} (net: {net_name})")
-                print(f"    Actual clearance: {actual:.4f}mm, required: {required:.4f}mm")
+                logger.debug("  Segment %s: pad %s (net: %s)", seg_idx, pad_id, net_name)
+                logger.debug("    Actual clearance: %.4fmm, required: %.4fmm", actual, required)
 
         assert not violations, f"Found {len(violations)} clearance violations"
 
+    def test_pad_candidates_prefilter_finds_violations(self, parser, pad_candidates):
+        """Bounding-box prefilter reports the same violations as a brute-force scan."""
+        layer = 'F.Cu'
+        layer_pads = parser.get_pads_by_layer(layer)
+        # A path that runs straight through a handful of pad centers
+        path = [(p.x, p.y) for p in layer_pads[:6]]
+        net_id = layer_pads[0].net_id
+
+        violations = check_path_clearance_to_pads(
+            path, 0.25, pad_candidates.get(layer, net_id), clearance=0.2
+        )
+        assert violations, "Path through pad centers should violate clearance"
+
+        brute_force = set()
+        for pad in layer_pads:
+            if pad.net_id == net_id:
+                continue
+            for i in range(len(path) - 1):
+                dist = segment_to_pad_min_distance(*path[i], *path[i + 1], pad)
+                if dist - 0.125 < 0.2 - 0.001:
+                    brute_force.add((i, f"{pad.footprint_ref}:{pad.name}"))
+
+        assert {(v[0], v[1]) for v in violations} == brute_force
+
     @pytest.mark.skip(reason="Known routing limitation: router violates clearances in dense areas (C6, C14 pads)")
-    def test_route_near_ic_pins(self, router, parser):
+    @requires_pads(('C5', '1'), ('U2', '8'))
+    def test_route_near_ic_pins(self, router, parser, pad_candidates, pad_index):
         """
         Test routing to an IC pin from a nearby component on the same net.
 
@@ -150,17 +198,8 @@ class TestTraceClearance:
         near the closely spaced U2 pins 7, 8, 9 without violating clearances.
         """
         # Find the specific pads we need
-        c5_pad1 = None
-        u2_pad8 = None
-
-        for pad in parser.pads:
-            if pad.footprint_ref == 'C5' and pad.name == '1':
-                c5_pad1 = pad
-            elif pad.footprint_ref == 'U2' and pad.name == '8':
-                u2_pad8 = pad
-
-        if c5_pad1 is None or u2_pad8 is None:
-            pytest.skip("Required pads C5:1 or U2:8 not found")
+        c5_pad1 = pad_index.get(('C5', '1'))
+        u2_pad8 = pad_index.get(('U2', '8'))
 
         # Verify they're on the same net (GND)
         if c5_pad1.net_id != u2_pad8.net_id:
@@ -183,21 +222,20 @@ class TestTraceClearance:
 
         # Check clearance to all other-net pads
         violations = check_path_clearance_to_pads(
-            path, trace_width, layer, parser.pads,
-            exclude_net_id=c5_pad1.net_id,
+            path, trace_width, pad_candidates.get(layer, c5_pad1.net_id),
             clearance=router.clearance
         )
 
         if violations:
-            print(f"\nClearance violations routing C5->U2:8:")
+            logger.debug("Clearance violations routing C5->U2:8:")
             for seg_idx, pad_id, net_id, actual, required in violations:
                 net_name = parser.nets.get(net_id, f"net_{net_id}")
-                print(f"  Segment {seg_idx}: pad {pad_id} (net: {net_name})")
-                print(f"    Actual clearance: {actual:.4f}mm, required: {required:.4f}mm")
+                logger.debug("  Segment %s: pad %s (net: %s)", seg_idx, pad_id, net_name)
+                logger.debug("    Actual clearance: %.4fmm, required: %.4fmm", actual, required)
 
         assert not violations, f"Found {len(violations)} clearance violations near IC pins"
 
-    def test_trace_width_affects_clearance(self, router, parser):
+    def test_trace_width_affects_clearance(self, router, parser, pad_candidates):
         """
         Verify that wider traces require more clearance.
         This specifically tests that trace_radius is being used.
@@ -215,7 +253,7 @@ class TestTraceClearance:
             if len(pads) >= 2 and net_id != 0:
                 # Check distance
                 p1, p2 = pads[0], pads[1]
-                dist = math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
+                dist = math.hypot(p1.x - p2.x, p1.y - p2.y)
                 if dist > 3:
                     test_pads = (p1, p2)
                     break
@@ -243,13 +281,13 @@ class TestTraceClearance:
 
         # Check violations for each
         narrow_violations = check_path_clearance_to_pads(
-            narrow_path, 0.15, layer, parser.pads,
-            exclude_net_id=p1.net_id, clearance=router.clearance
+            narrow_path, 0.15, pad_candidates.get(layer, p1.net_id),
+            clearance=router.clearance
         )
 
         wide_violations = check_path_clearance_to_pads(
-            wide_path, 0.5, layer, parser.pads,
-            exclude_net_id=p1.net_id, clearance=router.clearance
+            wide_path, 0.5, pad_candidates.get(layer, p1.net_id),
+            clearance=router.clearance
         )
 
         # Neither should have violations
@@ -260,7 +298,7 @@ class TestTraceClearance:
 class TestObstacleMapCorrectness:
     """Test that obstacle maps correctly block other-net elements."""
 
-    def test_other_net_pads_are_blocked(self, parser):
+    def test_other_net_pads_are_blocked(self, parser, obstacle_map_factory):
         """Verify that pads from other nets are blocked in the obstacle map."""
         # Build obstacle map for a specific net
         gnd_pads = [p for p in parser.pads if 'GND' in parser.nets.get(p.net_id, '')]
@@ -270,18 +308,10 @@ class TestObstacleMapCorrectness:
         layer = 'F.Cu'
 
         # Create obstacle map allowing only GND net
-        obstacle_map = ObstacleMap(
-            parser=parser,
-            layer=layer,
-            clearance=0.2,
-            grid_resolution=0.025,
-            allowed_net_id=gnd_net_id
-        )
+        obstacle_map = obstacle_map_factory(layer, allowed_net_id=gnd_net_id)
 
         # Check that other-net pads are blocked
-        for pad in parser.pads:
-            if layer not in pad.layers:
-                continue
+        for pad in parser.get_pads_by_layer(layer):
             if pad.net_id == gnd_net_id:
                 # Same net pads should NOT be blocked
                 # (allowing routing through them)
@@ -290,10 +320,10 @@ class TestObstacleMapCorrectness:
             # Other net pads SHOULD be blocked
             is_blocked = obstacle_map.is_blocked(pad.x, pad.y, radius=0)
             if not is_blocked:
-                print(f"WARNING: Pad {pad.footprint_ref}:{pad.name} (net {pad.net_id}) "
-                      f"at ({pad.x:.2f}, {pad.y:.2f}) is not blocked!")
+                logger.debug("WARNING: Pad %s:%s (net %s) at (%.2f, %.2f) is not blocked!",
+                             pad.footprint_ref, pad.name, pad.net_id, pad.x, pad.y)
 
-    def test_blocked_with_trace_radius(self, parser):
+    def test_blocked_with_trace_radius(self, parser, obstacle_map_factory):
         """
         Verify that is_blocked correctly accounts for trace radius.
 
@@ -303,13 +333,7 @@ class TestObstacleMapCorrectness:
         layer = 'F.Cu'
 
         # Create obstacle map with no allowed net (blocks everything)
-        obstacle_map = ObstacleMap(
-            parser=parser,
-            layer=layer,
-            clearance=0.2,
-            grid_resolution=0.025,
-            allowed_net_id=None
-        )
+        obstacle_map = obstacle_map_factory(layer, allowed_net_id=None)
 
         # Find any pad on this layer
         test_pad = None
@@ -341,20 +365,21 @@ class TestObstacleMapCorrectness:
         trace_radius = 0.125  # 0.25mm wide trace
         blocked_with_radius = obstacle_map.is_blocked(outside_x, test_pad.y, radius=trace_radius)
 
-        print(f"\nPad {test_pad.footprint_ref}:{test_pad.name}")
-        print(f"  Pad radius: {pad_radius:.3f}mm, clearance: {obstacle_map.clearance:.3f}mm")
-        print(f"  Boundary: {boundary_dist:.3f}mm, test point: {outside_dist:.3f}mm from center")
-        print(f"  Blocked without trace radius: {blocked_no_radius}")
-        print(f"  Blocked with trace_radius={trace_radius}mm: {blocked_with_radius}")
+        logger.debug("Pad %s:%s", test_pad.footprint_ref, test_pad.name)
+        logger.debug("  Pad radius: %.3fmm, clearance: %.3fmm", pad_radius, obstacle_map.clearance)
+        logger.debug("  Boundary: %.3fmm, test point: %.3fmm from center",
+                     boundary_dist, outside_dist)
+        logger.debug("  Blocked without trace radius: %s", blocked_no_radius)
+        logger.debug("  Blocked with trace_radius=%smm: %s", trace_radius, blocked_with_radius)
 
         # The key test: when trace has width, is_blocked should catch more cases
         # This verifies the radius parameter is being used correctly
         if not blocked_no_radius and blocked_with_radius:
-            print("  SUCCESS: trace radius correctly expands blocking check")
+            logger.debug("  SUCCESS: trace radius correctly expands blocking check")
         elif blocked_no_radius and blocked_with_radius:
-            print("  INFO: point is blocked regardless of trace radius (dense board)")
+            logger.debug("  INFO: point is blocked regardless of trace radius (dense board)")
         else:
-            print("  WARNING: unexpected behavior")
+            logger.debug("  WARNING: unexpected behavior")
 
         # At minimum, the pad center must be blocked
         assert obstacle_map.is_blocked(test_pad.x, test_pad.y, radius=trace_radius), \
@@ -364,7 +389,8 @@ class TestObstacleMapCorrectness:
 class TestHullGeneration:
     """Test that hulls are correctly generated for various pad shapes."""
 
-    def test_rotated_oval_pad_hull_bounds(self, parser):
+    @requires_pads(('J4', '2'))
+    def test_rotated_oval_pad_hull_bounds(self, parser, pad_index):
         """
         Test that rotated oval pads have correct hull dimensions.
 
@@ -375,14 +401,7 @@ class TestHullGeneration:
         - Y: center ± (1.7/2 + 0.2) = center ± 1.05mm
         """
         # Find J4 pad 2
-        j4_pad2 = None
-        for pad in parser.pads:
-            if pad.footprint_ref == 'J4' and pad.name == '2':
-                j4_pad2 = pad
-                break
-
-        if j4_pad2 is None:
-            pytest.skip("J4 pad 2 not found in test PCB")
+        j4_pad2 = pad_index.get(('J4', '2'))
 
         # Verify it's a rotated oval
         assert j4_pad2.shape == 'oval', f"Expected oval, got {j4_pad2.shape}"
@@ -418,13 +437,13 @@ class TestHullGeneration:
         # Allow small tolerance for hull approximation
         tolerance = 0.05
 
-        print(f"\nJ4 pad 2: center=({j4_pad2.x:.3f}, {j4_pad2.y:.3f})")
-        print(f"  Original: {j4_pad2.width}x{j4_pad2.height}mm, angle={j4_pad2.angle}°")
-        print(f"  Effective after rotation: {eff_width}x{eff_height}mm")
-        print(f"  Expected hull X: [{expected_min_x:.3f}, {expected_max_x:.3f}]")
-        print(f"  Actual hull X:   [{j4_hull.min_x:.3f}, {j4_hull.max_x:.3f}]")
-        print(f"  Expected hull Y: [{expected_min_y:.3f}, {expected_max_y:.3f}]")
-        print(f"  Actual hull Y:   [{j4_hull.min_y:.3f}, {j4_hull.max_y:.3f}]")
+        logger.debug("J4 pad 2: center=(%.3f, %.3f)", j4_pad2.x, j4_pad2.y)
+        logger.debug("  Original: %sx%smm, angle=%s°", j4_pad2.width, j4_pad2.height, j4_pad2.angle)
+        logger.debug("  Effective after rotation: %sx%smm", eff_width, eff_height)
+        logger.debug("  Expected hull X: [%.3f, %.3f]", expected_min_x, expected_max_x)
+        logger.debug("  Actual hull X:   [%.3f, %.3f]", j4_hull.min_x, j4_hull.max_x)
+        logger.debug("  Expected hull Y: [%.3f, %.3f]", expected_min_y, expected_max_y)
+        logger.debug("  Actual hull Y:   [%.3f, %.3f]", j4_hull.min_y, j4_hull.max_y)
 
         # Check X bounds
         assert abs(j4_hull.min_x - expected_min_x) < tolerance, \
@@ -444,7 +463,6 @@ class TestHullGeneration:
 
         The caps should extend the full radius beyond the segment endpoints.
         """
-        from backend.routing.hulls import HullGenerator, Point
 
         # Create a horizontal segment hull
         start = Point(0, 0)
@@ -456,15 +474,13 @@ class TestHullGeneration:
         chain = HullGenerator.segment_hull(start, end, width, clearance)
 
         # Find the extreme X points (should be at caps)
-        min_x = min(p.x for p in chain.points)
-        max_x = max(p.x for p in chain.points)
-        min_y = min(p.y for p in chain.points)
-        max_y = max(p.y for p in chain.points)
+        min_x, min_y, max_x, max_y = chain.bounds()
 
-        print(f"\nSegment hull: ({start.x}, {start.y}) to ({end.x}, {end.y})")
-        print(f"  Width: {width}mm, clearance: {clearance}mm, half_width: {half_width}mm")
-        print(f"  Hull X bounds: [{min_x:.3f}, {max_x:.3f}]")
-        print(f"  Hull Y bounds: [{min_y:.3f}, {max_y:.3f}]")
+        logger.debug("Segment hull: (%s, %s) to (%s, %s)", start.x, start.y, end.x, end.y)
+        logger.debug("  Width: %smm, clearance: %smm, half_width: %smm",
+                     width, clearance, half_width)
+        logger.debug("  Hull X bounds: [%.3f, %.3f]", min_x, max_x)
+        logger.debug("  Hull Y bounds: [%.3f, %.3f]", min_y, max_y)
 
         # Caps should extend half_width beyond endpoints
         tolerance = 0.01
@@ -479,7 +495,8 @@ class TestHullGeneration:
         assert abs(max_y - half_width) < tolerance, \
             f"Hull max_y {max_y:.3f} != expected {half_width:.3f}"
 
-    def test_rotated_roundrect_pad_hull_bounds(self, parser):
+    @requires_pads(('J4', '1'))
+    def test_rotated_roundrect_pad_hull_bounds(self, parser, pad_index):
         """
         Test that rotated roundrect pads have correct hull dimensions.
 
@@ -490,14 +507,7 @@ class TestHullGeneration:
         - Y: center ± (1.7/2 + 0.2) = center ± 1.05mm
         """
         # Find J4 pad 1
-        j4_pad1 = None
-        for pad in parser.pads:
-            if pad.footprint_ref == 'J4' and pad.name == '1':
-                j4_pad1 = pad
-                break
-
-        if j4_pad1 is None:
-            pytest.skip("J4 pad 1 not found in test PCB")
+        j4_pad1 = pad_index.get(('J4', '1'))
 
         # Verify it's a rotated roundrect
         assert j4_pad1.shape == 'roundrect', f"Expected roundrect, got {j4_pad1.shape}"
@@ -533,13 +543,13 @@ class TestHullGeneration:
         # Allow small tolerance for hull approximation
         tolerance = 0.05
 
-        print(f"\nJ4 pad 1: center=({j4_pad1.x:.3f}, {j4_pad1.y:.3f})")
-        print(f"  Original: {j4_pad1.width}x{j4_pad1.height}mm, angle={j4_pad1.angle}°")
-        print(f"  Effective after rotation: {eff_width}x{eff_height}mm")
-        print(f"  Expected hull X: [{expected_min_x:.3f}, {expected_max_x:.3f}]")
-        print(f"  Actual hull X:   [{j4_hull.min_x:.3f}, {j4_hull.max_x:.3f}]")
-        print(f"  Expected hull Y: [{expected_min_y:.3f}, {expected_max_y:.3f}]")
-        print(f"  Actual hull Y:   [{j4_hull.min_y:.3f}, {j4_hull.max_y:.3f}]")
+        logger.debug("J4 pad 1: center=(%.3f, %.3f)", j4_pad1.x, j4_pad1.y)
+        logger.debug("  Original: %sx%smm, angle=%s°", j4_pad1.width, j4_pad1.height, j4_pad1.angle)
+        logger.debug("  Effective after rotation: %sx%smm", eff_width, eff_height)
+        logger.debug("  Expected hull X: [%.3f, %.3f]", expected_min_x, expected_max_x)
+        logger.debug("  Actual hull X:   [%.3f, %.3f]", j4_hull.min_x, j4_hull.max_x)
+        logger.debug("  Expected hull Y: [%.3f, %.3f]", expected_min_y, expected_max_y)
+        logger.debug("  Actual hull Y:   [%.3f, %.3f]", j4_hull.min_y, j4_hull.max_y)
 
         # Check X bounds
         assert abs(j4_hull.min_x - expected_min_x) < tolerance, \
@@ -588,14 +598,14 @@ class TestAllRotatedPadShapes:
                 elif 45 < abs(pad.angle) % 180 < 135:
                     rotated_pads[shape] = pad
 
-        print(f"\nTesting {len(rotated_pads)} rotated pad shapes")
+        logger.debug("Testing %s rotated pad shapes", len(rotated_pads))
 
         hull_map = HullMap(parser, layer, clearance=clearance)
 
         for shape, pad in rotated_pads.items():
-            print(f"\n{shape}: {pad.footprint_ref}:{pad.name}")
-            print(f"  Position: ({pad.x:.3f}, {pad.y:.3f})")
-            print(f"  Size: {pad.width}x{pad.height}mm, angle={pad.angle}°")
+            logger.debug("%s: %s:%s", shape, pad.footprint_ref, pad.name)
+            logger.debug("  Position: (%.3f, %.3f)", pad.x, pad.y)
+            logger.debug("  Size: %sx%smm, angle=%s°", pad.width, pad.height, pad.angle)
 
             # Find hull for this pad
             pad_hull = None
@@ -628,10 +638,10 @@ class TestAllRotatedPadShapes:
             expected_min_y = pad.y - exp_half_y
             expected_max_y = pad.y + exp_half_y
 
-            print(f"  Expected X: [{expected_min_x:.3f}, {expected_max_x:.3f}]")
-            print(f"  Actual X:   [{pad_hull.min_x:.3f}, {pad_hull.max_x:.3f}]")
-            print(f"  Expected Y: [{expected_min_y:.3f}, {expected_max_y:.3f}]")
-            print(f"  Actual Y:   [{pad_hull.min_y:.3f}, {pad_hull.max_y:.3f}]")
+            logger.debug("  Expected X: [%.3f, %.3f]", expected_min_x, expected_max_x)
+            logger.debug("  Actual X:   [%.3f, %.3f]", pad_hull.min_x, pad_hull.max_x)
+            logger.debug("  Expected Y: [%.3f, %.3f]", expected_min_y, expected_max_y)
+            logger.debug("  Actual Y:   [%.3f, %.3f]", pad_hull.min_y, pad_hull.max_y)
 
             # Check bounds - hull should at least cover expected area
             assert pad_hull.min_x <= expected_min_x + tolerance, \
@@ -643,7 +653,7 @@ class TestAllRotatedPadShapes:
             assert pad_hull.max_y >= expected_max_y - tolerance, \
                 f"{shape} hull max_y {pad_hull.max_y:.3f} < expected {expected_max_y:.3f}"
 
-            print(f"  ✓ Hull bounds correct")
+            logger.debug("  ✓ Hull bounds correct")
 
     def test_routing_clearance_all_rotated_shapes(self, router, parser):
         """
@@ -667,13 +677,13 @@ class TestAllRotatedPadShapes:
                     rotated_by_shape[pad.shape] = []
                 rotated_by_shape[pad.shape].append(pad)
 
-        print(f"\nTesting routing clearance for {len(rotated_by_shape)} pad shapes")
+        logger.debug("Testing routing clearance for %s pad shapes", len(rotated_by_shape))
         all_violations = []
 
         for shape, pads in rotated_by_shape.items():
             # Test 2 pads of each shape
             test_pads = pads[:2]
-            print(f"\n{shape}: testing {len(test_pads)} pads")
+            logger.debug("%s: testing %s pads", shape, len(test_pads))
 
             for target_pad in test_pads:
                 # Find a nearby pad on a different net to route from
@@ -681,7 +691,7 @@ class TestAllRotatedPadShapes:
                 min_dist = float('inf')
                 for p in parser.pads:
                     if p.net_id != target_pad.net_id and layer in p.layers:
-                        dist = math.sqrt((p.x - target_pad.x)**2 + (p.y - target_pad.y)**2)
+                        dist = math.hypot(p.x - target_pad.x, p.y - target_pad.y)
                         if 2 < dist < 8 and dist < min_dist:
                             source_pad = p
                             min_dist = dist
@@ -720,7 +730,7 @@ class TestAllRotatedPadShapes:
                         x2, y2 = path[i + 1]
 
                         # Sample along segment
-                        seg_len = math.sqrt((x2-x1)**2 + (y2-y1)**2)
+                        seg_len = math.hypot(x2 - x1, y2 - y1)
                         if seg_len < 0.001:
                             continue
 
@@ -745,18 +755,20 @@ class TestAllRotatedPadShapes:
                                     'required_dist': required_dist
                                 }
                                 all_violations.append(violation)
-                                print(f"  VIOLATION: {shape} {target_pad.footprint_ref}:{target_pad.name} "
-                                      f"({direction}) - dist {dist:.3f}mm < {required_dist - grid_tolerance:.3f}mm")
+                                logger.debug("  VIOLATION: %s %s:%s (%s) - dist %.3fmm < %.3fmm",
+                                             shape, target_pad.footprint_ref, target_pad.name,
+                                             direction, dist, required_dist - grid_tolerance)
                                 break
                         else:
                             continue
                         break  # Only report first violation per route
 
         if all_violations:
-            print(f"\nFound {len(all_violations)} clearance violations:")
+            logger.debug("Found %s clearance violations:", len(all_violations))
             for v in all_violations:
-                print(f"  {v['shape']} {v['pad']} @ {v['angle']}° ({v['direction']}): "
-                      f"{v['actual_dist']:.3f}mm < {v['required_dist']:.3f}mm")
+                logger.debug("  %s %s @ %s° (%s): %.3fmm < %.3fmm",
+                             v['shape'], v['pad'], v['angle'], v['direction'],
+                             v['actual_dist'], v['required_dist'])
 
         # Check for severe violations (trace center inside pad)
         severe = [v for v in all_violations if v['actual_dist'] < 0]
@@ -777,7 +789,7 @@ class TestAllRotatedPadShapes:
         1. Point at pad center returns negative distance (inside)
         2. Point along rotated edge direction returns correct distance
         """
-        print("\nTesting GeometryChecker distance calculations")
+        logger.debug("Testing GeometryChecker distance calculations")
 
         # Find rotated pads of each shape - prefer ~90° rotations for simpler testing
         rotated_pads = {}
@@ -793,14 +805,14 @@ class TestAllRotatedPadShapes:
                     rotated_pads[pad.shape] = pad
 
         for shape, pad in rotated_pads.items():
-            print(f"\n{shape}: {pad.footprint_ref}:{pad.name}")
-            print(f"  Size: {pad.width}x{pad.height}mm, angle={pad.angle}°")
+            logger.debug("%s: %s:%s", shape, pad.footprint_ref, pad.name)
+            logger.debug("  Size: %sx%smm, angle=%s°", pad.width, pad.height, pad.angle)
 
             # Test point at center - should be inside (negative distance)
             dist_center = GeometryChecker.point_to_pad_distance(pad.x, pad.y, pad)
             assert dist_center < 0, \
                 f"{shape}: center distance {dist_center:.3f}mm should be negative"
-            print(f"  Center distance: {dist_center:.3f}mm (inside)")
+            logger.debug("  Center distance: %.3fmm (inside)", dist_center)
 
             # For rotated pads, test along the rotated edge direction
             angle_rad = math.radians(pad.angle)
@@ -813,7 +825,7 @@ class TestAllRotatedPadShapes:
             edge_y = pad.y + half_w * sin_a
 
             dist_edge = GeometryChecker.point_to_pad_distance(edge_x, edge_y, pad)
-            print(f"  Rotated right edge ({edge_x:.3f}, {edge_y:.3f}): {dist_edge:.3f}mm")
+            logger.debug("  Rotated right edge (%.3f, %.3f): %.3fmm", edge_x, edge_y, dist_edge)
 
             # For rect/roundrect, edge distance should be ~0
             if shape in ['rect', 'roundrect']:
@@ -826,14 +838,60 @@ class TestAllRotatedPadShapes:
             outside_y = pad.y + (half_w + clearance) * sin_a
 
             dist_outside = GeometryChecker.point_to_pad_distance(outside_x, outside_y, pad)
-            print(f"  Outside rotated right ({outside_x:.3f}, {outside_y:.3f}): "
-                  f"{dist_outside:.3f}mm (expected ~{clearance}mm)")
+            logger.debug("  Outside rotated right (%.3f, %.3f): %.3fmm (expected ~%smm)",
+                         outside_x, outside_y, dist_outside, clearance)
 
             # Verify outside point is approximately at clearance distance
             assert abs(dist_outside - clearance) < 0.1, \
                 f"{shape}: outside distance {dist_outside:.3f}mm != expected {clearance}mm"
 
-    def test_j4_pad1_routing_clearance_all_directions(self, router, parser):
+    def test_geometry_checker_shape_dispatch(self):
+        """Each pad shape dispatches to its own distance kernel."""
+
+        def make_pad(shape):
+            return PadInfo(
+                footprint_ref="T1", name="1", x=0.0, y=0.0,
+                width=2.0, height=1.0, shape=shape, angle=0.0, layers=["F.Cu"],
+                net_id=1, net_name="N", roundrect_ratio=0.5,
+            )
+
+        # Point 1.5mm out on the local X axis: all shapes extend to x=1
+        # except circle, which uses the smaller half-dimension (0.5)
+        expected = {'rect': 0.5, 'roundrect': 0.5, 'oval': 0.5, 'circle': 1.0}
+        for shape, dist in expected.items():
+            actual = GeometryChecker.point_to_pad_distance(1.5, 0.0, make_pad(shape))
+            assert abs(actual - dist) < 1e-9, f"{shape}: {actual} != {dist}"
+
+        # Corner region distinguishes rect from roundrect
+        rect_corner = GeometryChecker.point_to_pad_distance(1.0, 0.5, make_pad('rect'))
+        round_corner = GeometryChecker.point_to_pad_distance(1.0, 0.5, make_pad('roundrect'))
+        assert abs(rect_corner) < 1e-9
+        assert round_corner > 0
+
+        # Unknown shapes fall back to rectangle distance
+        assert GeometryChecker.point_to_pad_distance(1.5, 0.0, make_pad('custom')) == \
+            pytest.approx(0.5)
+
+    def test_points_to_pad_distance_matches_scalar(self, parser):
+        """Vectorized pad distance agrees with point_to_pad_distance."""
+        xs = np.linspace(-1.5, 1.5, 31)
+        ys = np.linspace(-1.0, 1.0, 21)
+        grid_x, grid_y = np.meshgrid(xs, ys)
+
+        shapes_seen = set()
+        for pad in parser.pads:
+            if pad.shape in shapes_seen and pad.angle == 0:
+                continue
+            shapes_seen.add(pad.shape)
+
+            px = (grid_x + pad.x).ravel()
+            py = (grid_y + pad.y).ravel()
+            vectorized = GeometryChecker.points_to_pad_distance(px, py, pad)
+            scalar = [GeometryChecker.point_to_pad_distance(x, y, pad) for x, y in zip(px, py)]
+            np.testing.assert_allclose(vectorized, scalar, atol=1e-9)
+
+    @requires_pads(('J4', '1'), ('U3', '38'))
+    def test_j4_pad1_routing_clearance_all_directions(self, router, pad_index):
         """
         Specific test for J4 pad 1 - a rotated roundrect pad.
 
@@ -850,22 +908,14 @@ class TestAllRotatedPadShapes:
         required_dist = clearance + trace_radius
 
         # Find J4 pad 1 and U3 pad 38
-        j4_pad1 = None
-        u3_pad38 = None
-        for pad in parser.pads:
-            if pad.footprint_ref == 'J4' and pad.name == '1':
-                j4_pad1 = pad
-            if pad.footprint_ref == 'U3' and pad.name == '38':
-                u3_pad38 = pad
+        j4_pad1 = pad_index.get(('J4', '1'))
+        u3_pad38 = pad_index.get(('U3', '38'))
 
-        if j4_pad1 is None or u3_pad38 is None:
-            pytest.skip("Required pads not found")
-
-        print(f"\nJ4 pad 1: {j4_pad1.shape} at ({j4_pad1.x:.3f}, {j4_pad1.y:.3f})")
-        print(f"  Size: {j4_pad1.width}x{j4_pad1.height}mm, angle={j4_pad1.angle}°")
-        print(f"  Net: {j4_pad1.net_id} ({j4_pad1.net_name})")
-        print(f"U3 pad 38: ({u3_pad38.x:.3f}, {u3_pad38.y:.3f})")
-        print(f"  Net: {u3_pad38.net_id} ({u3_pad38.net_name})")
+        logger.debug("J4 pad 1: %s at (%.3f, %.3f)", j4_pad1.shape, j4_pad1.x, j4_pad1.y)
+        logger.debug("  Size: %sx%smm, angle=%s°", j4_pad1.width, j4_pad1.height, j4_pad1.angle)
+        logger.debug("  Net: %s (%s)", j4_pad1.net_id, j4_pad1.net_name)
+        logger.debug("U3 pad 38: (%.3f, %.3f)", u3_pad38.x, u3_pad38.y)
+        logger.debug("  Net: %s (%s)", u3_pad38.net_id, u3_pad38.net_name)
 
         # Test routing to points around J4 pad 1 from all 4 directions
         directions = [
@@ -889,32 +939,37 @@ class TestAllRotatedPadShapes:
             )
 
             if not path or len(path) < 2:
-                print(f"  {direction}: No path found")
+                logger.debug("  %s: No path found", direction)
                 continue
 
-            # Check minimum distance to J4 pad 1
-            min_dist = float('inf')
-            min_point = None
+            # Sample all segments into one array, then find the closest point
+            xs, ys = [], []
             for i in range(len(path) - 1):
                 x1, y1 = path[i]
                 x2, y2 = path[i + 1]
 
-                seg_len = math.sqrt((x2-x1)**2 + (y2-y1)**2)
+                seg_len = math.hypot(x2 - x1, y2 - y1)
                 if seg_len < 0.001:
                     continue
 
                 n_samples = max(2, int(seg_len / 0.01))
-                for j in range(n_samples + 1):
-                    t = j / n_samples
-                    px = x1 + t * (x2 - x1)
-                    py = y1 + t * (y2 - y1)
+                t = np.linspace(0.0, 1.0, n_samples + 1)
+                xs.append(x1 + t * (x2 - x1))
+                ys.append(y1 + t * (y2 - y1))
+
+            if not xs:
+                logger.debug("  %s: Degenerate path", direction)
+                continue
 
-                    dist = GeometryChecker.point_to_pad_distance(px, py, j4_pad1)
-                    if dist < min_dist:
-                        min_dist = dist
-                        min_point = (px, py)
+            xs = np.concatenate(xs)
+            ys = np.concatenate(ys)
+            dists = GeometryChecker.points_to_pad_distance(xs, ys, j4_pad1)
+            closest = int(dists.argmin())
+            min_dist = float(dists[closest])
+            min_point = (float(xs[closest]), float(ys[closest]))
 
-            print(f"  {direction}: min dist {min_dist:.3f}mm at ({min_point[0]:.3f}, {min_point[1]:.3f})")
+            logger.debug("  %s: min dist %.3fmm at (%.3f, %.3f)",
+                         direction, min_dist, min_point[0], min_point[1])
 
             if min_dist < 0:
                 violations.append((direction, min_dist, min_point, "INSIDE PAD"))
@@ -922,9 +977,10 @@ class TestAllRotatedPadShapes:
                 violations.append((direction, min_dist, min_point, "TOO CLOSE"))
 
         if violations:
-            print(f"\nViolations:")
+            logger.debug("Violations:")
             for direction, dist, point, reason in violations:
-                print(f"  {direction}: {reason} - dist {dist:.3f}mm at ({point[0]:.3f}, {point[1]:.3f})")
+                logger.debug("  %s: %s - dist %.3fmm at (%.3f, %.3f)",
+                             direction, reason, dist, point[0], point[1])
 
         # Assert no trace goes inside the pad
         inside_pad = [v for v in violations if v[3] == "INSIDE PAD"]
@@ -1,21 +1,8 @@
 """Test routing behavior when endpoint is on a different net."""
+import logging
 import pytest
-from backend.pcb import PCBParser
-from backend.routing import TraceRouter
 
-PCB_FILE = "BLDriver.kicad_pcb"
-
-
-@pytest.fixture(scope="module")
-def parser():
-    """Load PCB parser once for all tests."""
-    return PCBParser(PCB_FILE)
-
-
-@pytest.fixture(scope="module")
-def router(parser):
-    """Create router with caching for performance."""
-    return TraceRouter(parser, clearance=0.2, cache_obstacles=True)
+logger = logging.getLogger(__name__)
 
 
 class TestDifferentNetRouting:
@@ -24,7 +11,7 @@ class TestDifferentNetRouting:
     def test_find_different_net_pads(self, parser):
         """Find two adjacent pads on different nets for testing."""
         # Find U3 which should have GND and NC pads close together
-        u3_pads = [p for p in parser.pads if p.footprint_ref == "U3"]
+        u3_pads = parser.get_pads_by_footprint_ref("U3")
         assert len(u3_pads) > 0, "U3 footprint not found"
 
         # Find pads on different nets
@@ -37,10 +24,10 @@ class TestDifferentNetRouting:
         # We should have pads on multiple different nets
         assert len(net_groups) > 1, "U3 should have pads on different nets"
 
-        print(f"\nU3 has pads on {len(net_groups)} different nets")
+        logger.debug("U3 has pads on %s different nets", len(net_groups))
         for net_id, pads in list(net_groups.items())[:3]:
             net_name = parser.nets.get(net_id, "unknown")
-            print(f"  Net {net_id} ({net_name}): {len(pads)} pads")
+            logger.debug("  Net %s (%s): %s pads", net_id, net_name, len(pads))
 
     def test_find_net_at_point_detects_pad(self, router, parser):
         """Test that find_net_at_point correctly detects pad nets."""
@@ -58,7 +45,8 @@ class TestDifferentNetRouting:
 
         # Should find the pad's net (or possibly another pad if they overlap)
         assert found_net is not None, f"Should find net at pad position ({pad.x}, {pad.y})"
-        print(f"\nPad at ({pad.x:.2f}, {pad.y:.2f}) is net {pad.net_id}, find_net_at_point returned {found_net}")
+        logger.debug("Pad at (%.2f, %.2f) is net %s, find_net_at_point returned %s",
+                     pad.x, pad.y, pad.net_id, found_net)
 
     def test_route_to_different_net_blocked_by_endpoint_check(self, router, parser):
         """Test that routing from one net to a different net pad is detected.
@@ -81,15 +69,17 @@ class TestDifferentNetRouting:
         start_pad = pads_by_net[net_ids[0]][0]
         end_pad = pads_by_net[net_ids[1]][0]
 
-        print(f"\nStart pad: net {start_pad.net_id} at ({start_pad.x:.2f}, {start_pad.y:.2f})")
-        print(f"End pad: net {end_pad.net_id} at ({end_pad.x:.2f}, {end_pad.y:.2f})")
+        logger.debug("Start pad: net %s at (%.2f, %.2f)",
+                     start_pad.net_id, start_pad.x, start_pad.y)
+        logger.debug("End pad: net %s at (%.2f, %.2f)", end_pad.net_id, end_pad.x, end_pad.y)
 
         # The endpoint net detection should find the different net
         end_net = router.find_net_at_point(end_pad.x, end_pad.y, "F.Cu")
         assert end_net is not None, "Should find net at end pad"
         assert end_net != start_pad.net_id, "End net should be different from start net"
 
-        print(f"Endpoint net detection: {end_net} (different from start net {start_pad.net_id})")
+        logger.debug("Endpoint net detection: %s (different from start net %s)",
+                     end_net, start_pad.net_id)
 
     def test_route_succeeds_to_same_net_pad(self, router, parser):
         """Test that routing to a same-net pad succeeds."""
@@ -114,17 +104,17 @@ class TestDifferentNetRouting:
         start_pad = pads[0]
         end_pad = pads[1]
 
-        print(f"\nSame-net routing test:")
-        print(f"  Net: {multi_pad_net} ({parser.nets.get(multi_pad_net, 'unknown')})")
-        print(f"  Start: ({start_pad.x:.2f}, {start_pad.y:.2f})")
-        print(f"  End: ({end_pad.x:.2f}, {end_pad.y:.2f})")
+        logger.debug("Same-net routing test:")
+        logger.debug("  Net: %s (%s)", multi_pad_net, parser.nets.get(multi_pad_net, 'unknown'))
+        logger.debug("  Start: (%.2f, %.2f)", start_pad.x, start_pad.y)
+        logger.debug("  End: (%.2f, %.2f)", end_pad.x, end_pad.y)
 
         # Endpoint net check should pass (same net)
         end_net = router.find_net_at_point(end_pad.x, end_pad.y, "F.Cu")
         if end_net is not None:
             # End pad detected - should be same net
             assert end_net == multi_pad_net, f"End net {end_net} should match start net {multi_pad_net}"
-            print(f"  Endpoint net check passed: {end_net} == {multi_pad_net}")
+            logger.debug("  Endpoint net check passed: %s == %s", end_net, multi_pad_net)
 
     def test_route_to_empty_space_succeeds(self, router, parser):
         """Test that routing to empty space (no pad) succeeds."""
@@ -144,17 +134,17 @@ class TestDifferentNetRouting:
         # Endpoint should not be on any pad
         end_net = router.find_net_at_point(end_x, end_y, "F.Cu", tolerance=0.3)
 
-        print(f"\nRouting to empty space:")
-        print(f"  Start: ({start_pad.x:.2f}, {start_pad.y:.2f}) net {start_pad.net_id}")
-        print(f"  End: ({end_x:.2f}, {end_y:.2f}) net {end_net}")
+        logger.debug("Routing to empty space:")
+        logger.debug("  Start: (%.2f, %.2f) net %s", start_pad.x, start_pad.y, start_pad.net_id)
+        logger.debug("  End: (%.2f, %.2f) net %s", end_x, end_y, end_net)
 
         # If end_net is None, there's no pad there - good
         # If end_net matches start net, that's also fine (same-net element)
         # Only a problem if end_net is different from start
         if end_net is not None and end_net != start_pad.net_id:
-            print(f"  WARNING: End point is on different net {end_net}")
+            logger.debug("  WARNING: End point is on different net %s", end_net)
         else:
-            print(f"  End point is clear or same-net")
+            logger.debug("  End point is clear or same-net")
 
         # Try the actual route
         path = router.route(
@@ -168,8 +158,8 @@ class TestDifferentNetRouting:
         )
 
         # Path may or may not exist depending on obstacles
-        print(f"  Route result: {len(path)} waypoints")
+        logger.debug("  Route result: %s waypoints", len(path))
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v", "-s"])
+    pytest.main([__file__, "-v", "--log-cli-level=DEBUG"])
@@ -0,0 +1,98 @@
+"""Tests for vectorized geometry helpers."""
+import math
+import numpy as np
+import pytest
+
+from backend.routing import hulls
+from backend.routing.geometry import closest_point_on_segment, point_to_segments_distance
+from backend.routing.hulls import Point
+
+
+class TestPointToSegmentsDistance:
+    """Tests for point_to_segments_distance."""
+
+    def test_matches_scalar_projection(self):
+        """Vectorized distances agree with closest_point_on_segment."""
+        rng = np.random.default_rng(0)
+        x1, y1, x2, y2 = rng.uniform(-5, 5, size=(4, 200))
+        px, py = 0.3, -0.7
+
+        dists = point_to_segments_distance(px, py, x1, y1, x2, y2)
+
+        for i in range(len(x1)):
+            cx, cy, _ = closest_point_on_segment(px, py, x1[i], y1[i], x2[i], y2[i])
+            assert dists[i] == pytest.approx(math.hypot(px - cx, py - cy))
+
+    def test_zero_length_segment(self):
+        """Degenerate segments measure distance to their start point."""
+        dists = point_to_segments_distance(
+            3.0, 4.0, np.array([0.0]), np.array([0.0]), np.array([0.0]), np.array([0.0])
+        )
+        assert dists[0] == pytest.approx(5.0)
+
+
+class TestSegmentEdgeKernels:
+    """Tests for the hull edge kernels in backend.routing.hulls."""
+
+    def test_match_per_edge_helpers(self):
+        """Vectorized crossings and distances agree with the per-edge Point helpers."""
+        rng = np.random.default_rng(1)
+        x1, y1, x2, y2 = rng.uniform(-5, 5, size=(4, 200))
+        p1, p2 = Point(-4.0, 1.5), Point(3.5, -2.0)
+
+        edges, xs, ys = hulls.segment_edge_intersections(p1, p2, x1, y1, x2, y2)
+        dist_sq, near_x, near_y = hulls.segment_edge_distances(p1, p2, x1, y1, x2, y2)
+
+        crossings = {}
+        for i in range(len(x1)):
+            e1, e2 = Point(x1[i], y1[i]), Point(x2[i], y2[i])
+            pt = hulls.segment_segment_intersection(p1, p2, e1, e2)
+            if pt is not None:
+                crossings[i] = pt
+            expected = min(
+                (hulls.point_to_segment_distance(p1, e1, e2), 0),
+                (hulls.point_to_segment_distance(p2, e1, e2), 1),
+                (hulls.point_to_segment_distance(e1, p1, p2), 2),
+                (hulls.point_to_segment_distance(e2, p1, p2), 3),
+            )[0]
+            assert math.sqrt(dist_sq[i]) == pytest.approx(expected)
+            closest, _ = hulls.closest_point_on_segment(Point(near_x[i], near_y[i]), e1, e2)
+            assert closest.distance_to(Point(near_x[i], near_y[i])) == pytest.approx(0, abs=1e-9)
+
+        assert edges.tolist() == sorted(crossings)
+        for i, x, y in zip(edges, xs, ys):
+            assert (x, y) == pytest.approx(crossings[i].to_tuple())
+
+    def test_hull_contacts_loop_kernel_matches_vectorized(self, monkeypatch):
+        """The Numba-compatible loop kernel agrees exactly with the NumPy path."""
+        rng = np.random.default_rng(2)
+        counts = np.array([6, 1, 12, 4, 9])
+        edges = rng.uniform(-3, 3, size=(4, counts.sum()))
+        edges[2:, 3] = edges[:2, 3]  # include a zero-length edge
+
+        monkeypatch.setattr(hulls, "NUMBA_AVAILABLE", False)
+        for sx, sy, ex, ey in rng.uniform(-4, 4, size=(50, 4)):
+            p1, p2 = Point(sx, sy), Point(ex, ey)
+            expected = hulls.segment_hull_contacts(p1, p2, edges, counts)
+            got = hulls._segment_hull_contacts_loop(*edges, counts, sx, sy, ex, ey)
+            for column, expected_column in zip(got, expected):
+                np.testing.assert_array_equal(column, expected_column)
+
+    def test_contacts_warm_up_matches_query_argument_types(self, hull_map, monkeypatch):
+        """warm_up_contacts_kernel calls the kernel with the argument types of a real query."""
+        calls = []
+
+        def record(*args):
+            calls.append(tuple(
+                (type(arg), arg.dtype, arg.ndim) if isinstance(arg, np.ndarray) else type(arg)
+                for arg in args
+            ))
+            return hulls._segment_hull_contacts_loop(*args)
+
+        monkeypatch.setattr(hulls, "NUMBA_AVAILABLE", True)
+        monkeypatch.setattr(hulls, "_segment_hull_contacts_jit", record, raising=False)
+        hulls.warm_up_contacts_kernel()
+        assert hull_map.get_blocking_hulls(Point(150, 95.5), Point(158, 95.5), 0.25)
+
+        assert len(calls) == 2
+        assert calls[0] == calls[1]
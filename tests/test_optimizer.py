@@ -1,9 +1,13 @@
 """Tests for path optimizer."""
+import logging
 import pytest
 import math
-from backend.routing.optimizer import PathOptimizer
+import numpy as np
+from backend.routing.optimizer import PathOptimizer, segments_at_45_degrees
 from backend.routing.hulls import Point
 
+logger = logging.getLogger(__name__)
+
 
 class TestPathOptimizer:
     """Test path optimization passes."""
@@ -29,6 +33,43 @@ class TestPathOptimizer:
         assert result[0] == (0, 0)
         assert result[-1] == (3, 3)
 
+    def test_long_path_duplicate_and_colinear_passes(self, optimizer):
+        """Long paths (array prefix scan) reduce the same way as short ones."""
+        zigzag = [Point(float(i), float(i % 2)) for i in range(80)]
+        assert optimizer._remove_duplicates(zigzag) == zigzag
+        assert optimizer._merge_colinear(zigzag) == zigzag
+
+        # A straight run appended to the zigzag collapses to its endpoint
+        straight = zigzag + [Point(80.0 + i, 1.0) for i in range(20)]
+        merged = optimizer._merge_colinear(straight)
+        assert merged == zigzag + [straight[-1]]
+
+        # Near-duplicates late in the path are dropped, the endpoint is kept
+        noisy = zigzag + [Point(79.01, 1.0), Point(79.02, 1.0), Point(79.5, 1.0)]
+        assert optimizer._remove_duplicates(noisy) == zigzag + [Point(79.5, 1.0)]
+
+    def test_simplify_dp_drops_only_straight_run_points(self, optimizer):
+        """Douglas-Peucker pre-pass collapses straight runs, keeps corners and reversals."""
+        run = [Point(i * 0.1, 0.0) for i in range(10001)]
+        assert optimizer._simplify_dp(run) == [run[0], run[-1]]
+
+        zigzag = [Point(float(i), float(i % 2)) for i in range(20)]
+        assert optimizer._simplify_dp(zigzag) == zigzag
+
+        # An overshoot along the same line is a reversal, not a straight run
+        reversal = [Point(0, 0), Point(1, 0), Point(3, 0), Point(2, 0)]
+        assert optimizer._simplify_dp(reversal) == [Point(0, 0), Point(3, 0), Point(2, 0)]
+
+    def test_path_length_accepts_points_and_pairs(self, optimizer):
+        """path_length sums segment lengths for tuples and Points alike."""
+        pairs = [(0, 0), (3, 4), (3, 10), (4, 11)]
+        expected = 5 + 6 + math.sqrt(2)
+        assert PathOptimizer.path_length(pairs) == pytest.approx(expected)
+        points = [Point(x, y) for x, y in pairs]
+        assert PathOptimizer.path_length(points) == pytest.approx(expected)
+        assert optimizer._path_length(points) == pytest.approx(expected)
+        assert PathOptimizer.path_length(pairs[:1]) == 0.0
+
     def test_enforce_45_degrees(self, optimizer):
         """Non-45-degree segments should be converted to 45-degree segments."""
         # Path at ~30 degrees (not 45)
@@ -39,11 +80,31 @@ class TestPathOptimizer:
         assert len(result) >= 2
 
         # Check all segments are at 45° multiples
-        for i in range(1, len(result)):
-            dx = result[i][0] - result[i-1][0]
-            dy = result[i][1] - result[i-1][1]
-            assert optimizer._is_45_degree_angle(dx, dy), \
-                f"Segment {i} at angle {math.degrees(math.atan2(dy, dx))}° is not 45° multiple"
+        invalid = (np.flatnonzero(~segments_at_45_degrees(result)) + 1).tolist()
+        assert not invalid, f"Segments {invalid} are not at 45° multiples: {result}"
+
+    def test_is_45_degree_angle_classification(self, optimizer):
+        """Orthogonal and diagonal directions pass; the diagonal test is relative."""
+        assert optimizer._is_45_degree_angle(0, 0)
+        assert optimizer._is_45_degree_angle(5, 0.005)
+        assert optimizer._is_45_degree_angle(-0.005, 5)
+        assert optimizer._is_45_degree_angle(-3, 3)
+        # Within 1% of |dy| counts as diagonal, beyond does not
+        assert optimizer._is_45_degree_angle(10.09, 10)
+        assert not optimizer._is_45_degree_angle(10.11, 10)
+        assert not optimizer._is_45_degree_angle(3, 1)
+
+    def test_segments_at_45_degrees_matches_scalar_check(self, optimizer):
+        """The vectorized check agrees with _is_45_degree_angle per segment."""
+        path = [(0, 0), (5, 0), (8, 3), (8.005, 9), (10, 12), (0, 2.1), (-4, 6.04), (-4, 6.04)]
+
+        expected = [
+            optimizer._is_45_degree_angle(b[0] - a[0], b[1] - a[1])
+            for a, b in zip(path, path[1:])
+        ]
+        assert segments_at_45_degrees(path).tolist() == expected
+        assert segments_at_45_degrees([Point(*p) for p in path]).tolist() == expected
+        assert segments_at_45_degrees([(1, 1)]).tolist() == []
 
     def test_preserve_endpoints(self, optimizer):
         """Start and end points should be preserved."""
@@ -59,16 +120,8 @@ class TestPathOptimizer:
         path = [(0, 0), (5, 5)]
         result = optimizer.optimize(path)
 
-        def path_length(pts):
-            total = 0
-            for i in range(1, len(pts)):
-                dx = pts[i][0] - pts[i-1][0]
-                dy = pts[i][1] - pts[i-1][1]
-                total += math.sqrt(dx*dx + dy*dy)
-            return total
-
-        orig_len = path_length(path)
-        opt_len = path_length(result)
+        orig_len = PathOptimizer.path_length(path)
+        opt_len = PathOptimizer.path_length(result)
 
         # Optimized path should be within 10% of original
         assert opt_len <= orig_len * 1.1, \
@@ -114,23 +167,14 @@ class TestPathOptimizerWithHullMap:
         # The optimizer should find a more direct path
         # Original: 4 segments
         # Optimized: should be fewer segments
-        print(f"Original: {len(path)} points, Optimized: {len(result)} points")
-        print(f"Original path: {path}")
-        print(f"Optimized path: {result}")
+        logger.debug("Original: %s points, Optimized: %s points", len(path), len(result))
+        logger.debug("Original path: %s", path)
+        logger.debug("Optimized path: %s", result)
 
-        # Calculate lengths
-        def path_length(pts):
-            total = 0
-            for i in range(1, len(pts)):
-                dx = pts[i][0] - pts[i-1][0]
-                dy = pts[i][1] - pts[i-1][1]
-                total += math.sqrt(dx*dx + dy*dy)
-            return total
+        orig_len = PathOptimizer.path_length(path)
+        opt_len = PathOptimizer.path_length(result)
 
-        orig_len = path_length(path)
-        opt_len = path_length(result)
-
-        print(f"Original length: {orig_len:.3f}, Optimized length: {opt_len:.3f}")
+        logger.debug("Original length: %.3f, Optimized length: %.3f", orig_len, opt_len)
 
         # The optimized path should preserve endpoints
         assert result[0] == path[0]
@@ -146,8 +190,6 @@ class TestBacktrackRemoval:
 
         A path going from bottom to top should not have segments going downward.
         """
-        from backend.routing.optimizer import PathOptimizer
-        from backend.routing.hulls import Point
 
         # Create a path that goes up overall but has a downward segment
         # Path: (0,0) -> (1,2) -> (2,1) -> (3,3)
@@ -165,7 +207,7 @@ class TestBacktrackRemoval:
         # But we can test the detection logic
         assert optimizer._detect_backtrack(points[0], points[1], points[2])
 
-    def test_route_should_not_go_left_between_j4_pads(self):
+    def test_route_should_not_go_left_between_j4_pads(self, router):
         """
         Route from (150.8, 100.75) to (155.887, 91.826) should not go left.
 
@@ -175,11 +217,6 @@ class TestBacktrackRemoval:
         J4 pads are at x=154.6, y=93.0 and y=95.5.
         The route should pass to the right of these pads, not go left towards them.
         """
-        from backend.pcb import PCBParser
-        from backend.routing import TraceRouter
-
-        parser = PCBParser("BLDriver.kicad_pcb")
-        router = TraceRouter(parser, clearance=0.2, cache_obstacles=True)
 
         path = router.route(
             start_x=150.8,
@@ -206,8 +243,8 @@ class TestBacktrackRemoval:
                 )
             max_x_seen = max(max_x_seen, x)
 
-        print(f"\nRoute has {len(path)} waypoints, no significant leftward movement")
-        print(f"Path: {[(f'{p[0]:.2f}', f'{p[1]:.2f}') for p in path]}")
+        logger.debug("Route has %s waypoints, no significant leftward movement", len(path))
+        logger.debug("Path: %s", [(f'{p[0]:.2f}', f'{p[1]:.2f}') for p in path])
 
 
 class TestShortSegmentRemoval:
@@ -224,7 +261,6 @@ class TestShortSegmentRemoval:
 
         The small diagonal segment (point 2 to 3) should be merged.
         """
-        from backend.routing.hulls import Point
 
         # Recreate the problematic path (simplified)
         # The jitter is a small segment that causes a direction change
@@ -244,25 +280,25 @@ class TestShortSegmentRemoval:
         for i in range(1, len(path)):
             dx = path[i][0] - path[i-1][0]
             dy = path[i][1] - path[i-1][1]
-            length = math.sqrt(dx*dx + dy*dy)
+            length = math.hypot(dx, dy)
             segments.append((i-1, i, length))
 
-        print(f"\nOriginal path segments:")
+        logger.debug("Original path segments:")
         for start, end, length in segments:
-            print(f"  {start}->{end}: {length:.3f}mm")
+            logger.debug("  %s->%s: %.3fmm", start, end, length)
 
         # Identify short segments (< 0.2mm)
         short_segments = [s for s in segments if s[2] < 0.2]
-        print(f"\nShort segments (< 0.2mm): {len(short_segments)}")
+        logger.debug("Short segments (< 0.2mm): %s", len(short_segments))
         for start, end, length in short_segments:
-            print(f"  {start}->{end}: {length:.3f}mm")
+            logger.debug("  %s->%s: %.3fmm", start, end, length)
 
         # Optimization without hull_map won't remove short segments
         # but we can verify the detection works
         result = optimizer.optimize(path)
 
-        print(f"\nOptimized: {len(path)} -> {len(result)} points")
-        print(f"Result: {result}")
+        logger.debug("Optimized: %s -> %s points", len(path), len(result))
+        logger.debug("Result: %s", result)
 
         # The optimizer should preserve endpoints
         assert abs(result[0][0] - path[0][0]) < 0.001
@@ -270,7 +306,7 @@ class TestShortSegmentRemoval:
         assert abs(result[-1][0] - path[-1][0]) < 0.001
         assert abs(result[-1][1] - path[-1][1]) < 0.001
 
-    def test_short_segment_removal_with_routing(self):
+    def test_short_segment_removal_with_routing(self, router):
         """
         Integration test: short segments should be removed during routing.
 
@@ -278,11 +314,6 @@ class TestShortSegmentRemoval:
         around complex hull boundaries. This test verifies that simple routes
         don't have unnecessary jitter, not that all routes are fully optimized.
         """
-        from backend.pcb import PCBParser
-        from backend.routing import TraceRouter
-
-        parser = PCBParser("BLDriver.kicad_pcb")
-        router = TraceRouter(parser, clearance=0.2, cache_obstacles=True)
 
         # Simple diagonal route that shouldn't need complex walkaround
         path = router.route(
@@ -303,12 +334,12 @@ class TestShortSegmentRemoval:
         for i in range(1, len(path)):
             dx = path[i][0] - path[i-1][0]
             dy = path[i][1] - path[i-1][1]
-            length = math.sqrt(dx*dx + dy*dy)
+            length = math.hypot(dx, dy)
             min_length = min(min_length, length)
 
-        print(f"\nRoute has {len(path)} waypoints")
-        print(f"Minimum segment length: {min_length:.3f}mm")
-        print(f"Path: {[(f'{p[0]:.2f}', f'{p[1]:.2f}') for p in path]}")
+        logger.debug("Route has %s waypoints", len(path))
+        logger.debug("Minimum segment length: %.3fmm", min_length)
+        logger.debug("Path: %s", [(f'{p[0]:.2f}', f'{p[1]:.2f}') for p in path])
 
         # For simple routes, segments should be reasonably sized
         # The optimizer removes jitter < 0.2mm for simple paths
@@ -316,4 +347,4 @@ class TestShortSegmentRemoval:
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v", "-s"])
+    pytest.main([__file__, "-v", "--log-cli-level=DEBUG"])
@@ -9,17 +9,44 @@ from backend.pcb import PCBParser, BoardInfo
 PCB_FILE = Path(__file__).parent.parent / "BLDriver.kicad_pcb"
 
 
-@pytest.fixture
-def parser():
-    """Load the test PCB file."""
-    return PCBParser(PCB_FILE)
-
-
 def test_parser_loads_file(parser):
     """Test that the parser loads the file without errors."""
     assert parser.board is not None
 
 
+def test_parser_cache_dir_skips_reparse(tmp_path, monkeypatch):
+    """A second load of the same file comes from the pickle cache."""
+    first = PCBParser(PCB_FILE, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("board was re-parsed")
+
+    monkeypatch.setattr("backend.pcb.parser.Board.from_file", fail)
+    cached = PCBParser(PCB_FILE, cache_dir=tmp_path)
+
+    assert cached.pcb_path == Path(PCB_FILE)
+    assert [(p.pad_id, p.x, p.y) for p in cached.pads] == [
+        (p.pad_id, p.x, p.y) for p in first.pads
+    ]
+    assert cached.get_net_id("GND") == first.get_net_id("GND")
+    assert cached.get_board_info() == first.get_board_info()
+
+
+def test_parser_cache_write_uses_private_temp_file(parser, tmp_path, monkeypatch):
+    """Cache writes go through a per-process temp file that never lingers."""
+    cache_path = tmp_path / "board.pkl"
+    parser._save_cache(cache_path)
+    assert [p.name for p in tmp_path.iterdir()] == ["board.pkl"]
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("backend.pcb.parser.pickle.dump", fail)
+    parser._save_cache(tmp_path / "other.pkl")
+    assert [p.name for p in tmp_path.iterdir()] == ["board.pkl"]
+
+
 def test_parser_extracts_footprints(parser):
     """Test that footprints are extracted."""
     assert len(parser.footprints) > 0
@@ -68,6 +95,20 @@ def test_pad_positions_are_absolute(parser):
         assert 40 < pad.y < 120, f"Pad {pad.pad_id} y={pad.y} out of expected range"
 
 
+def test_transform_pad_positions_matches_per_pad_transform():
+    """The per-footprint array transform matches transform_pad_position exactly."""
+    from backend.pcb.transform import transform_pad_position, transform_pad_positions
+
+    offsets = [(0.775, 0.0), (-0.775, 0.1), (1.3, -2.45)]
+    for fp_angle in (0.0, 45.0, 90.0, 180.0, -30.0):
+        batch = transform_pad_positions(offsets, 167.0, 57.675, fp_angle).tolist()
+        expected = [
+            list(transform_pad_position(x, y, 0.0, 167.0, 57.675, fp_angle)[:2])
+            for x, y in offsets
+        ]
+        assert batch == expected
+
+
 def test_get_pads_by_net(parser):
     """Test getting pads by net."""
     # GND should have many pads
@@ -85,6 +126,135 @@ def test_get_pads_by_layer(parser):
     assert len(front_pads) > len(back_pads)
 
 
+def test_get_pads_by_layer_matches_layer_filter(parser):
+    """Test that the per-layer pad index matches a direct layer filter."""
+    for layer in parser.COPPER_LAYERS:
+        expected = [p for p in parser.pads if layer in p.layers]
+        assert parser.get_pads_by_layer(layer) == expected
+
+    assert parser.get_pads_by_layer("Nonexistent.Cu") == []
+
+
+def test_select_pads_matches_list_filter(parser):
+    """Pad table filters agree with filtering the PadInfo list."""
+    table = parser.get_pad_table()
+    assert len(table) == len(parser.pads)
+    assert table.x.tolist() == [p.x for p in parser.pads]
+    assert table.net_id.tolist() == [p.net_id for p in parser.pads]
+
+    for layer in parser.COPPER_LAYERS:
+        expected = [
+            i for i, p in enumerate(parser.pads) if layer in p.layers and p.net_id > 0
+        ]
+        assert parser.select_pads(layer=layer, connected=True).tolist() == expected
+    assert len(parser.select_pads()) == len(parser.pads)
+    assert len(parser.select_pads(layer="F.SilkS")) == 0
+
+
+def test_get_pads_by_footprint_ref(parser):
+    """Test that the footprint reference index matches a direct filter."""
+    assert parser.get_pads_by_footprint_ref("U3") == [
+        p for p in parser.pads if p.footprint_ref == "U3"
+    ]
+    assert len(parser.get_pads_by_footprint_ref("U3")) > 0
+    assert parser.get_pads_by_footprint_ref("NOPE99") == []
+
+
+def test_pad_index_getters_return_copies(parser):
+    """Mutating a returned pad list must not change the parser's indexes."""
+    front_count = len(parser.get_pads_by_layer("F.Cu"))
+    parser.get_pads_by_layer("F.Cu").clear()
+    assert len(parser.get_pads_by_layer("F.Cu")) == front_count
+
+    u3_count = len(parser.get_pads_by_footprint_ref("U3"))
+    parser.get_pads_by_footprint_ref("U3").append(None)
+    assert len(parser.get_pads_by_footprint_ref("U3")) == u3_count
+
+    parser.get_pads_by_layer("Nonexistent.Cu").append(None)
+    assert parser.get_pads_by_layer("Nonexistent.Cu") == []
+
+
+def test_get_pads_near_matches_linear_scan(parser):
+    """Test that KD-tree pad lookups match a linear distance scan."""
+    front_pads = parser.get_pads_by_layer("F.Cu")
+    for pad in front_pads[::25]:
+        for radius in (0.0, 0.5, 2.0):
+            x, y = pad.x + 0.1, pad.y - 0.05
+            expected = [
+                p for p in front_pads
+                if (p.x - x) ** 2 + (p.y - y) ** 2 <= radius * radius
+            ]
+            assert parser.get_pads_near(x, y, "F.Cu", radius) == expected
+
+    # Exact centers are found even with a zero radius
+    pad = front_pads[0]
+    assert pad in parser.get_pads_near(pad.x, pad.y, "F.Cu", 0.0)
+    assert parser.get_pads_near(pad.x, pad.y, "Nonexistent.Cu", 1.0) == []
+
+
+def test_get_vias_near_matches_linear_scan(parser):
+    """Test that KD-tree via lookups match a linear distance scan."""
+    assert len(parser.vias) > 0
+    for via in parser.vias[::10]:
+        for radius in (0.0, 0.5, 3.0):
+            x, y = via.x - 0.1, via.y + 0.05
+            expected = [
+                v for v in parser.vias
+                if (v.x - x) ** 2 + (v.y - y) ** 2 <= radius * radius
+            ]
+            assert parser.get_vias_near(x, y, radius) == expected
+
+    via = parser.vias[0]
+    assert via in parser.get_vias_near(via.x, via.y, 0.0)
+
+
+def test_pad_presence_manifest_matches_parser(parser, pad_presence):
+    """Test that the collection-time pad manifest matches the parsed pads."""
+    assert pad_presence == {(p.footprint_ref, p.name) for p in parser.pads}
+
+
+def test_trace_table_matches_trace_list(parser):
+    """Test that the per-layer TraceTable columns mirror the TraceInfo list."""
+    for layer in parser.COPPER_LAYERS:
+        traces = parser.get_traces_by_layer(layer)
+        table = parser.get_trace_table(layer)
+
+        assert len(table) == len(traces)
+        assert list(table.iter_records()) == traces
+        for i, trace in enumerate(traces):
+            assert table.start_x[i] == trace.start_x
+            assert table.end_y[i] == trace.end_y
+            assert table.net_id[i] == trace.net_id
+
+    assert len(parser.get_trace_table("Nonexistent.Cu")) == 0
+
+
+def test_trace_table_select(parser):
+    """Test selecting a sub-table by net mask."""
+    table = parser.get_trace_table("F.Cu")
+    net_id = int(table.net_id[0])
+
+    net_table = table.select(table.net_id == net_id)
+
+    assert len(net_table) > 0
+    assert all(t.net_id == net_id for t in net_table.traces)
+    assert (net_table.net_id == net_id).all()
+
+
+def test_group_traces_by_net(parser):
+    """Test that trace groups cover every trace exactly once, in board order."""
+    table = parser.get_trace_table("F.Cu")
+    groups = parser.group_traces_by_net("F.Cu")
+
+    assert len(groups) > 0
+    assert sum(len(rows) for rows in groups.values()) == len(table)
+    for net_id, rows in groups.items():
+        assert (table.net_id[rows] == net_id).all()
+        assert list(rows) == sorted(rows)
+
+    assert parser.group_traces_by_net("F.Cu") is groups
+
+
 def test_known_nets_exist(parser):
     """Test that known nets from the plan exist."""
     net_names = list(parser.nets.values())
@@ -94,5 +264,25 @@ def test_known_nets_exist(parser):
     assert "3V3" in net_names
 
 
+def test_get_net_id(parser):
+    """Test looking up net IDs by name."""
+    gnd_net_id = parser.get_net_id("GND")
+    assert gnd_net_id is not None
+    assert parser.nets[gnd_net_id] == "GND"
+    assert parser.get_net_id("NO_SUCH_NET") is None
+
+
+def test_build_all_layer_indexes(parser):
+    """All per-net endpoint indexes are built and cached for every layer."""
+    parser.build_all_layer_indexes(n_workers=2)
+
+    for layer in parser.COPPER_LAYERS:
+        for net_id, rows in parser.group_traces_by_net(layer).items():
+            assert (layer, net_id) in parser._trace_endpoint_indexes
+            index = parser.get_trace_endpoint_index(layer, net_id)
+            assert len(index.table) == len(rows)
+            assert parser._trace_endpoint_indexes[(layer, net_id)] is index
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
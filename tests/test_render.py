@@ -1,24 +1,20 @@
 """Tests for SVG rendering and pad orientation verification."""
+import logging
 import math
 from pathlib import Path
 
 import pytest
 
-from backend.pcb import PCBParser
 from backend.svg import SVGGenerator, render_svg_to_png, render_pcb_to_png
 
+logger = logging.getLogger(__name__)
+
 
 # Path to test PCB file
 PCB_FILE = Path(__file__).parent.parent / "BLDriver.kicad_pcb"
 OUTPUT_DIR = Path(__file__).parent / "output"
 
 
-@pytest.fixture
-def parser():
-    """Load the test PCB file."""
-    return PCBParser(PCB_FILE)
-
-
 @pytest.fixture
 def output_dir():
     """Ensure output directory exists."""
@@ -64,6 +60,19 @@ def test_render_single_layer(parser, output_dir):
         assert image is not None
 
 
+def test_generate_reuses_cached_fragments(parser):
+    """Repeated and per-layer generate() calls reuse serialized groups."""
+    generator = SVGGenerator(parser)
+    full = generator.generate()
+    assert generator.generate() is full
+
+    single = generator.generate(layers=["F.Cu"])
+    assert single == SVGGenerator(parser).generate(layers=["F.Cu"])
+    fragment = generator._fragment_cache["F.Cu"]
+    assert fragment in full and fragment in single
+    assert 'data-layer="B.Cu"' not in single
+
+
 def test_rotated_footprint_pad_positions(parser):
     """
     Verify that pad positions are correctly transformed for rotated footprints.
@@ -120,7 +129,7 @@ def test_45_degree_rotation(parser):
     for pad in u2.pads:
         dx = pad.x - u2.x
         dy = pad.y - u2.y
-        dist = math.sqrt(dx*dx + dy*dy)
+        dist = math.hypot(dx, dy)
         pad_distances.append(dist)
 
     # All pads should be at similar distances from center (QFN package)
@@ -196,8 +205,8 @@ def test_render_high_resolution(parser, output_dir):
     assert image.width > 600
     assert image.height > 800
 
-    print(f"\nHigh-res image saved: {output_dir / 'pcb_highres.png'}")
-    print(f"Size: {image.width} x {image.height} pixels")
+    logger.debug("High-res image saved: %s", output_dir / 'pcb_highres.png')
+    logger.debug("Size: %s x %s pixels", image.width, image.height)
 
 
 if __name__ == "__main__":
@@ -1,75 +1,46 @@
 """Test route API to diagnose timeout issue."""
+import logging
 import pytest
-import signal
 import time
 from backend.pcb import PCBParser
 from backend.routing import TraceRouter, ObstacleMap
+from tests.conftest import with_timeout
 
-
-class TimeoutError(Exception):
-    pass
-
-
-def timeout_handler(signum, frame):
-    raise TimeoutError("Test timed out!")
-
-
-def with_timeout(seconds):
-    """Decorator to add timeout to a function."""
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(seconds)
-            try:
-                result = func(*args, **kwargs)
-            finally:
-                signal.alarm(0)
-            return result
-        return wrapper
-    return decorator
+logger = logging.getLogger(__name__)
 
 PCB_FILE = "BLDriver.kicad_pcb"
 
 
 @with_timeout(10)
-def test_obstacle_map_creation():
+def test_obstacle_map_creation(parser):
     """Test that obstacle map can be created without hanging."""
-    parser = PCBParser(PCB_FILE)
-
     start = time.time()
     obs_map = ObstacleMap(parser, layer="F.Cu", clearance=0.2)
     elapsed = time.time() - start
 
-    print(f"\nObstacle map created in {elapsed:.2f}s")
-    print(f"Blocked cells: {len(obs_map._blocked)}")
+    logger.debug("Obstacle map created in %.2fs", elapsed)
+    logger.debug("Blocked cells: %s", len(obs_map._blocked))
     assert elapsed < 30, f"Obstacle map creation took too long: {elapsed:.2f}s"
 
 
 @with_timeout(10)
-def test_router_creation():
+def test_router_creation(parser):
     """Test that router can be created without hanging."""
-    parser = PCBParser(PCB_FILE)
-
     start = time.time()
     router = TraceRouter(parser, clearance=0.2, cache_obstacles=True)
     elapsed = time.time() - start
 
-    print(f"\nRouter created in {elapsed:.2f}s")
+    logger.debug("Router created in %.2fs", elapsed)
     assert elapsed < 120, f"Router creation took too long: {elapsed:.2f}s"
 
 
 @with_timeout(10)
-def test_get_net_cells():
+def test_get_net_cells(parser):
     """Test that _get_net_cells doesn't hang."""
-    parser = PCBParser(PCB_FILE)
     router = TraceRouter(parser, clearance=0.2, cache_obstacles=False)
 
     # Find GND net
-    gnd_net_id = None
-    for net_id, name in parser.nets.items():
-        if name == "GND":
-            gnd_net_id = net_id
-            break
+    gnd_net_id = parser.get_net_id("GND")
 
     assert gnd_net_id is not None
 
@@ -77,16 +48,13 @@ def test_get_net_cells():
     allowed = router._get_net_cells("F.Cu", gnd_net_id)
     elapsed = time.time() - start
 
-    print(f"\n_get_net_cells returned {len(allowed)} cells in {elapsed:.2f}s")
+    logger.debug("_get_net_cells returned %s cells in %.2fs", len(allowed), elapsed)
     assert elapsed < 10, f"_get_net_cells took too long: {elapsed:.2f}s"
 
 
 @with_timeout(10)
-def test_simple_route():
+def test_simple_route(router):
     """Test a simple route without net_id."""
-    parser = PCBParser(PCB_FILE)
-    router = TraceRouter(parser, clearance=0.2, cache_obstacles=True)
-
     start = time.time()
     path = router.route(
         start_x=120.0, start_y=45.0,
@@ -97,24 +65,17 @@ def test_simple_route():
     )
     elapsed = time.time() - start
 
-    print(f"\nRoute without net_id: {len(path)} points in {elapsed:.2f}s")
+    logger.debug("Route without net_id: %s points in %.2fs", len(path), elapsed)
     assert elapsed < 30, f"Route took too long: {elapsed:.2f}s"
 
 
 @with_timeout(10)
-def test_route_with_net_id():
+def test_route_with_net_id(parser, router):
     """Test route with net_id (the problematic case)."""
-    parser = PCBParser(PCB_FILE)
-    router = TraceRouter(parser, clearance=0.2, cache_obstacles=True)
-
     # Find GND net
-    gnd_net_id = None
-    for net_id, name in parser.nets.items():
-        if name == "GND":
-            gnd_net_id = net_id
-            break
+    gnd_net_id = parser.get_net_id("GND")
 
-    print(f"\nGND net_id: {gnd_net_id}")
+    logger.debug("GND net_id: %s", gnd_net_id)
 
     start = time.time()
     path = router.route(
@@ -126,52 +87,55 @@ def test_route_with_net_id():
     )
     elapsed = time.time() - start
 
-    print(f"Route with net_id: {len(path)} points in {elapsed:.2f}s")
+    logger.debug("Route with net_id: %s points in %.2fs", len(path), elapsed)
     assert elapsed < 30, f"Route with net_id took too long: {elapsed:.2f}s"
 
 
-def test_obstacle_map_bounds():
+def test_obstacle_map_bounds(cached_obstacle_map_fcu):
     """Check obstacle map size to understand performance."""
-    parser = PCBParser(PCB_FILE)
-    obs = ObstacleMap(parser, layer='F.Cu', clearance=0.2)
+    obs = cached_obstacle_map_fcu
 
     min_gx = min(c[0] for c in obs._blocked)
     max_gx = max(c[0] for c in obs._blocked)
     min_gy = min(c[1] for c in obs._blocked)
     max_gy = max(c[1] for c in obs._blocked)
 
-    print(f'\nGrid bounds: x=[{min_gx}, {max_gx}], y=[{min_gy}, {max_gy}]')
-    print(f'Grid size: {max_gx - min_gx} x {max_gy - min_gy}')
-    print(f'Blocked cells: {len(obs._blocked)}')
-    print(f'Resolution: {obs.resolution}mm')
-    print(f'World bounds: x=[{min_gx * obs.resolution:.1f}, {max_gx * obs.resolution:.1f}]mm')
-    print(f'World bounds: y=[{min_gy * obs.resolution:.1f}, {max_gy * obs.resolution:.1f}]mm')
+    logger.debug("Grid bounds: x=[%s, %s], y=[%s, %s]", min_gx, max_gx, min_gy, max_gy)
+    logger.debug("Grid size: %s x %s", max_gx - min_gx, max_gy - min_gy)
+    logger.debug("Blocked cells: %s", len(obs._blocked))
+    logger.debug("Resolution: %smm", obs.resolution)
+    logger.debug("World bounds: x=[%.1f, %.1f]mm", min_gx * obs.resolution, max_gx * obs.resolution)
+    logger.debug("World bounds: y=[%.1f, %.1f]mm", min_gy * obs.resolution, max_gy * obs.resolution)
 
     # Calculate expansion cost
     trace_radius = 0.125  # 0.25mm trace
     grid_radius = int(trace_radius / obs.resolution) + 1
     expansion_ops = len(obs._blocked) * (2 * grid_radius + 1) ** 2
-    print(f'\nExpansion grid radius: {grid_radius}')
-    print(f'Expansion operations: {expansion_ops:,}')
+    logger.debug("Expansion grid radius: %s", grid_radius)
+    logger.debug("Expansion operations: %d", expansion_ops)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+    parser = PCBParser(PCB_FILE)
+
     print("Testing obstacle map creation...")
-    test_obstacle_map_creation()
+    test_obstacle_map_creation(parser)
 
     print("\nTesting obstacle map bounds...")
-    test_obstacle_map_bounds()
+    test_obstacle_map_bounds(ObstacleMap(parser, layer="F.Cu", clearance=0.2))
 
     print("\nTesting _get_net_cells...")
-    test_get_net_cells()
+    test_get_net_cells(parser)
 
     print("\nTesting router creation...")
-    test_router_creation()
+    test_router_creation(parser)
 
     print("\nTesting simple route...")
-    test_simple_route()
+    router = TraceRouter(parser, clearance=0.2, cache_obstacles=True)
+    test_simple_route(router)
 
     print("\nTesting route with net_id...")
-    test_route_with_net_id()
+    test_route_with_net_id(parser, router)
 
     print("\nAll tests passed!")
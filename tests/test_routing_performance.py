@@ -1,16 +1,16 @@
 """Test routing performance - first route should be fast."""
+import logging
 import time
+import numpy as np
 import pytest
-from backend.pcb import PCBParser
 from backend.routing import TraceRouter
 
-PCB_FILE = "BLDriver.kicad_pcb"
+logger = logging.getLogger(__name__)
 
 
 @pytest.fixture(scope="module")
-def fresh_router():
+def fresh_router(parser, compiled_kernels):
     """Create a fresh router with caching (simulates server startup)."""
-    parser = PCBParser(PCB_FILE)
     start = time.perf_counter()
     router = TraceRouter(
         parser,
@@ -18,10 +18,11 @@ def fresh_router():
         cache_obstacles=True
     )
     elapsed = time.perf_counter() - start
-    print(f"\nRouter initialization took {elapsed*1000:.1f}ms")
+    logger.debug("Router initialization took %.1fms", elapsed * 1000)
     return router
 
 
+@pytest.mark.xdist_group("router_perf")
 class TestRoutingPerformance:
     """Test that routing is fast, especially the first route."""
 
@@ -43,24 +44,18 @@ class TestRoutingPerformance:
         )
         elapsed = time.perf_counter() - start
 
-        print(f"\nFirst route took {elapsed*1000:.1f}ms, {len(path)} waypoints")
+        logger.debug("First route took %.1fms, %s waypoints", elapsed * 1000, len(path))
 
         assert path, "Route should succeed"
         assert len(path) >= 2, "Route should have at least 2 waypoints"
         assert elapsed < 0.5, f"First route took {elapsed*1000:.1f}ms, should be < 500ms"
 
     def test_subsequent_routes_are_fast(self, fresh_router):
-        """Subsequent routes should be very fast (<100ms)."""
+        """Subsequent routes should be fast (95th percentile < 500ms)."""
         start_x, start_y = 152.5118, 81.4500
 
-        times = []
-        successful = 0
-        for i in range(5):
-            # Use smaller offsets to avoid obstacles
-            end_x = start_x + 1.0 + i * 0.3
-
-            start = time.perf_counter()
-            path = fresh_router.route(
+        def route(end_x):
+            return fresh_router.route(
                 start_x=start_x,
                 start_y=start_y,
                 end_x=end_x,
@@ -69,19 +64,32 @@ class TestRoutingPerformance:
                 width=0.25,
                 net_id=83
             )
-            elapsed = time.perf_counter() - start
-            times.append(elapsed)
+
+        # Warm up the layer's caches; the timed routes all have new endpoints,
+        # so none of them is answered from the route cache
+        route(start_x + 3.0)
+
+        times_ns = []
+        successful = 0
+        for i in range(20):
+            # Use smaller offsets to avoid obstacles
+            end_x = start_x + 1.0 + i * 0.15
+
+            start = time.perf_counter_ns()
+            path = route(end_x)
+            times_ns.append(time.perf_counter_ns() - start)
 
             if path:
                 successful += 1
 
-        avg_time = sum(times) / len(times)
-        max_time = max(times)
-        print(f"\nSubsequent routes: avg={avg_time*1000:.1f}ms, max={max_time*1000:.1f}ms, {successful}/5 succeeded")
+        times = np.array(times_ns) / 1e9
+        p50, p95 = np.percentile(times, [50, 95])
+        logger.debug("Subsequent routes: p50=%.1fms, p95=%.1fms, max=%.1fms, %s/20 succeeded",
+                     p50 * 1000, p95 * 1000, times.max() * 1000, successful)
 
-        assert successful >= 3, f"At least 3 routes should succeed, got {successful}"
-        # Allow up to 1 second for complex routes that may need A* fallback
-        assert max_time < 1.0, f"Max route time {max_time*1000:.1f}ms should be < 1000ms"
+        assert successful >= 12, f"At least 12 routes should succeed, got {successful}"
+        # A few routes need the slower A* fallback; one outlier should not fail the test
+        assert p95 < 0.5, f"95th percentile route time {p95*1000:.1f}ms should be < 500ms"
 
     def test_blocked_endpoint_is_fast(self, fresh_router):
         """Route to blocked endpoint should fail fast (not try expensive routing)."""
@@ -101,7 +109,7 @@ class TestRoutingPerformance:
         )
         elapsed = time.perf_counter() - start
 
-        print(f"\nBlocked endpoint route took {elapsed*1000:.1f}ms")
+        logger.debug("Blocked endpoint route took %.1fms", elapsed * 1000)
 
         # Route should fail (blocked endpoint) but should be fast
         # Note: The router itself doesn't do the early return - that's in main.py
@@ -126,11 +134,12 @@ class TestRoutingPerformance:
             )
             elapsed = time.perf_counter() - start
 
-            print(f"\n{layer}: {elapsed*1000:.1f}ms, {len(path) if path else 0} waypoints")
+            logger.debug("%s: %.1fms, %s waypoints",
+                         layer, elapsed * 1000, len(path) if path else 0)
 
             # Each layer should be fast (cache pre-built)
             assert elapsed < 0.5, f"{layer} route took {elapsed*1000:.1f}ms, should be < 500ms"
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v", "-s"])
+    pytest.main([__file__, "-v", "--log-cli-level=DEBUG"])
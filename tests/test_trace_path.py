@@ -0,0 +1,176 @@
+"""Tests for trace path reconstruction helpers."""
+import math
+import pytest
+
+from backend.pcb.models import TraceInfo, TraceTable
+from backend.pcb.trace_path import (
+    TraceEndpointIndex, build_connected_path, find_closest_trace
+)
+
+
+def make_trace(start_x, start_y, end_x, end_y, net_id=1, layer="F.Cu"):
+    return TraceInfo(
+        start_x=start_x, start_y=start_y, end_x=end_x, end_y=end_y,
+        width=0.25, layer=layer, net_id=net_id
+    )
+
+
+class TestFindClosestTrace:
+    """Tests for find_closest_trace."""
+
+    def test_closest_by_endpoint(self):
+        """The trace with the nearest endpoint wins."""
+        traces = [
+            make_trace(0, 0, 10, 0),
+            make_trace(20, 0, 30, 0),
+            make_trace(0, 10, 0, 15),
+        ]
+
+        trace, dist = find_closest_trace(traces, 3, 4)
+
+        assert trace is traces[0]
+        assert dist == pytest.approx(5.0)
+
+    def test_end_point_considered(self):
+        """Distance to the end point counts as well as the start point."""
+        traces = [
+            make_trace(0, 0, 10, 0),
+            make_trace(50, 50, 12, 0),
+        ]
+
+        trace, dist = find_closest_trace(traces, 12, 1)
+
+        assert trace is traces[1]
+        assert dist == pytest.approx(1.0)
+
+    def test_empty(self):
+        """No traces returns None and infinite distance."""
+        trace, dist = find_closest_trace([], 0, 0)
+
+        assert trace is None
+        assert math.isinf(dist)
+
+    def test_matches_linear_scan(self, parser):
+        """Vectorized search agrees with a straightforward scan on the real board."""
+        traces = parser.get_traces_by_layer("F.Cu")
+        assert traces
+
+        for x, y in [(140.0, 80.0), (155.0, 95.0), (170.0, 60.0)]:
+            expected = min(
+                traces,
+                key=lambda t: min(math.hypot(t.start_x - x, t.start_y - y),
+                                  math.hypot(t.end_x - x, t.end_y - y))
+            )
+            trace, _ = find_closest_trace(traces, x, y)
+            assert trace is expected
+
+
+class TestTraceEndpointIndex:
+    """Tests for the trace endpoint index."""
+
+    @pytest.fixture
+    def index(self):
+        traces = [
+            make_trace(0, 0, 10, 0),
+            make_trace(10, 0, 10, 10),
+            make_trace(20, 20, 10, 0),
+            make_trace(30, 30, 40, 40),
+        ]
+        return TraceEndpointIndex(TraceTable.from_traces(traces))
+
+    def test_connected_reports_start_and_end_matches(self, index):
+        """Traces starting or ending at a point are found in table order."""
+        assert index.connected(10, 0) == [(0, False), (1, True), (2, False)]
+
+    def test_connected_respects_tolerance(self, index):
+        """Endpoints outside the tolerance box are not connected."""
+        assert index.connected(10.005, 0.005) == [(0, False), (1, True), (2, False)]
+        assert index.connected(10.02, 0) == []
+
+    def test_connected_uses_index_tolerance(self):
+        """The tolerance set at construction bounds connectivity lookups."""
+        table = TraceTable.from_traces([make_trace(0, 0, 10, 0), make_trace(10.3, 0, 20, 0)])
+
+        assert TraceEndpointIndex(table).connected(10, 0) == [(0, False)]
+        assert TraceEndpointIndex(table, tolerance=0.5).connected(10, 0) == [(0, False), (1, True)]
+
+    def test_connected_across_cell_boundaries(self):
+        """Matches are found when query and endpoint fall in adjacent cells."""
+        table = TraceTable.from_traces([make_trace(-0.004, 0.019, 5, 5)])
+        index = TraceEndpointIndex(table)
+
+        assert index.connected(0.004, 0.021) == [(0, True)]
+        assert index.connected(0.007, 0.021) == []
+
+    def test_connected_with_negative_coordinates(self):
+        """Cell keys stay distinct and adjacent across the origin."""
+        traces = [
+            make_trace(-0.005, -0.005, -5, -5),
+            make_trace(0.005, 0.005, 5, 5),
+            make_trace(-0.005, 0.005, -5, 5),
+            make_trace(0.5, -0.5, 5, -5),
+        ]
+        index = TraceEndpointIndex(TraceTable.from_traces(traces))
+
+        assert index.connected(0, 0) == [(0, True), (1, True), (2, True)]
+        assert index.connected(-5, 5) == [(2, False)]
+        assert index.connected(0.5, -0.5) == [(3, True)]
+
+    def test_closest_prefers_first_trace_on_tie(self, index):
+        """Shared endpoints resolve to the first trace, like find_closest_trace."""
+        trace, dist = index.closest(10.5, 0)
+
+        assert trace is index.table.traces[0]
+        assert dist == pytest.approx(0.5)
+
+    def test_empty_index(self):
+        """An index without traces finds nothing."""
+        index = TraceEndpointIndex(TraceTable.from_traces([]))
+
+        assert index.closest(0, 0) == (None, float('inf'))
+        assert index.connected(0, 0) == []
+
+    def test_parser_index_matches_linear_scan(self, parser):
+        """Parser-cached indexes agree with a linear tolerance scan."""
+        layer = "F.Cu"
+        for net_id in list(parser.group_traces_by_net(layer))[:10]:
+            index = parser.get_trace_endpoint_index(layer, net_id)
+            traces = index.table.traces
+            assert traces and all(t.net_id == net_id for t in traces)
+
+            for t in traces:
+                expected = []
+                for row, other in enumerate(traces):
+                    if abs(other.start_x - t.end_x) < 0.01 and abs(other.start_y - t.end_y) < 0.01:
+                        expected.append((row, True))
+                    elif abs(other.end_x - t.end_x) < 0.01 and abs(other.end_y - t.end_y) < 0.01:
+                        expected.append((row, False))
+                assert index.connected(t.end_x, t.end_y) == expected
+
+            assert parser.get_trace_endpoint_index(layer, net_id) is index
+
+
+class TestBuildConnectedPath:
+    """Tests for build_connected_path."""
+
+    def test_walks_both_directions_with_mixed_orientation(self):
+        """Reversed segments are flipped so the path reads end to end."""
+        traces = [
+            make_trace(10, 0, 20, 0),
+            make_trace(0, 0, 10, 0),
+            make_trace(20, 10, 20, 0),
+            make_trace(50, 50, 60, 60),
+        ]
+        index = TraceEndpointIndex(TraceTable.from_traces(traces))
+
+        path = build_connected_path(index, traces[0])
+
+        assert path == [(0, 0), (10, 0), (20, 0), (20, 10)]
+        assert all(type(p) is tuple for p in path)
+
+    def test_single_trace(self):
+        """A lone trace yields its two endpoints."""
+        trace = make_trace(1, 2, 3, 4)
+        index = TraceEndpointIndex(TraceTable.from_traces([trace]))
+
+        assert build_connected_path(index, trace) == [(1, 2), (3, 4)]
@@ -1,115 +1,131 @@
 """Test for route crossing U2 pad 9 issue."""
+import logging
 import math
+import numpy as np
 import pytest
-from pathlib import Path
 
-from backend.pcb import PCBParser
-from backend.routing import TraceRouter, ObstacleMap
+from backend.routing import ObstacleMap
 
-PCB_FILE = Path(__file__).parent.parent / "BLDriver.kicad_pcb"
+logger = logging.getLogger(__name__)
 
 
-def point_to_rotated_rect_distance(
-    px: float, py: float,
+def _rect_local_frame(
     rect_cx: float, rect_cy: float,
     rect_width: float, rect_height: float,
     rect_angle_deg: float
-) -> float:
+) -> tuple[float, float, float, float, float, float]:
     """
-    Calculate the minimum distance from a point to the edge of a rotated rectangle.
+    Center, rotation by -angle and half dimensions of a rotated rectangle.
 
-    Returns negative if point is inside the rectangle, positive if outside.
+    Returns:
+        (cx, cy, cos_a, sin_a, half_w, half_h)
     """
-    # Translate point to rectangle's local coordinate system
-    dx = px - rect_cx
-    dy = py - rect_cy
-
-    # Rotate point to align with rectangle axes (rotate by -angle)
     angle_rad = math.radians(-rect_angle_deg)
-    cos_a = math.cos(angle_rad)
-    sin_a = math.sin(angle_rad)
+    return (
+        rect_cx, rect_cy,
+        math.cos(angle_rad), math.sin(angle_rad),
+        rect_width / 2, rect_height / 2
+    )
+
 
-    local_x = dx * cos_a - dy * sin_a
-    local_y = dx * sin_a + dy * cos_a
+def _point_to_box_distance(x: float, y: float, half_w: float, half_h: float) -> float:
+    """Distance from a point outside or on [-half_w, half_w] x [-half_h, half_h] to the box."""
+    return math.hypot(max(abs(x) - half_w, 0.0), max(abs(y) - half_h, 0.0))
 
-    # Half dimensions
-    half_w = rect_width / 2
-    half_h = rect_height / 2
 
-    # Find distance to rectangle in local coordinates
-    # For a point, find the closest point on the rectangle boundary
-    if abs(local_x) <= half_w and abs(local_y) <= half_h:
-        # Point is inside - return negative distance to nearest edge
-        dist_to_x_edge = half_w - abs(local_x)
-        dist_to_y_edge = half_h - abs(local_y)
-        return -min(dist_to_x_edge, dist_to_y_edge)
+def _point_to_segment_distance(
+    px: float, py: float, ax: float, ay: float, bx: float, by: float
+) -> float:
+    """Distance from a point to the segment from A to B."""
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else ((px - ax) * dx + (py - ay) * dy) / length_sq
+    t = max(0.0, min(1.0, t))
+    return math.hypot(ax + t * dx - px, ay + t * dy - py)
 
-    # Point is outside - find closest point on boundary
-    closest_x = max(-half_w, min(half_w, local_x))
-    closest_y = max(-half_h, min(half_h, local_y))
 
-    return math.sqrt((local_x - closest_x)**2 + (local_y - closest_y)**2)
+def _to_rect_frame(
+    points: np.ndarray, frame: tuple[float, float, float, float, float, float]
+) -> np.ndarray:
+    """Move (N, 2) points into the local coordinate system of a _rect_local_frame."""
+    cx, cy, cos_a, sin_a, _, _ = frame
+    rotation = np.array([[cos_a, sin_a], [-sin_a, cos_a]])
+    return (np.asarray(points, dtype=float) - (cx, cy)) @ rotation
 
 
-def segment_to_rotated_rect_min_distance(
-    x1: float, y1: float, x2: float, y2: float,
-    rect_cx: float, rect_cy: float,
-    rect_width: float, rect_height: float,
-    rect_angle_deg: float
+def segment_to_box_distance(
+    ax: float, ay: float, bx: float, by: float, half_w: float, half_h: float
 ) -> float:
     """
     Calculate minimum distance from a line segment to a rotated rectangle edge.
 
-    Samples along the segment for a conservative estimate.
+    The segment is given in the rectangle's frame (see _to_rect_frame), where
+    the rectangle is [-half_w, half_w] x [-half_h, half_h]. Returns the
+    negative depth of the deepest point if the segment enters the rectangle.
     """
-    # Sample the segment
-    length = math.sqrt((x2-x1)**2 + (y2-y1)**2)
-    if length < 0.001:
-        return point_to_rotated_rect_distance(
-            x1, y1, rect_cx, rect_cy, rect_width, rect_height, rect_angle_deg
+    dx, dy = bx - ax, by - ay
+
+    # Clip the segment to the box (Liang-Barsky)
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, ax + half_w), (dx, half_w - ax), (-dy, ay + half_h), (dy, half_h - ay)):
+        if p == 0:
+            if q < 0:
+                t0, t1 = 1.0, 0.0
+                break
+        elif p < 0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+
+    if t0 > t1:
+        # Outside: the closest pair has an endpoint or a box corner in it
+        return min(
+            [_point_to_box_distance(ax, ay, half_w, half_h),
+             _point_to_box_distance(bx, by, half_w, half_h)]
+            + [
+                _point_to_segment_distance(sx * half_w, sy * half_h, ax, ay, bx, by)
+                for sx in (-1, 1) for sy in (-1, 1)
+            ]
         )
 
-    num_samples = max(10, int(length / 0.01))  # Sample every 0.01mm
-    min_dist = float('inf')
-
-    for i in range(num_samples + 1):
-        t = i / num_samples
-        px = x1 + t * (x2 - x1)
-        py = y1 + t * (y2 - y1)
-        dist = point_to_rotated_rect_distance(
-            px, py, rect_cx, rect_cy, rect_width, rect_height, rect_angle_deg
-        )
-        min_dist = min(min_dist, dist)
-
-    return min_dist
+    # Inside: depth min(half_w - |x|, half_h - |y|) is piecewise linear
+    # along the segment, so its maximum is at a clip end or where the
+    # segment crosses an axis or a diagonal |x| - |y| = half_w - half_h
+    candidates = [t0, t1]
+    for nx, ny, offset in (
+        (1, 0, 0), (0, 1, 0),
+        (1, -1, half_w - half_h), (1, -1, half_h - half_w),
+        (1, 1, half_w - half_h), (1, 1, half_h - half_w),
+    ):
+        rate = nx * dx + ny * dy
+        if rate != 0:
+            t = (offset - nx * ax - ny * ay) / rate
+            if t0 < t < t1:
+                candidates.append(t)
+    depth = max(
+        min(half_w - abs(ax + t * dx), half_h - abs(ay + t * dy)) for t in candidates
+    )
+    return -depth
 
 
-def test_route_c5_to_u2_pad8_avoids_u2_pad9():
+def test_route_c5_to_u2_pad8_avoids_u2_pad9(parser, router, pad_index):
     """Test that route from C5 pad 1 to U2 pad 8 avoids U2 pad 9."""
-    parser = PCBParser(PCB_FILE)
-    router = TraceRouter(parser, clearance=0.2, cache_obstacles=True)
-
     # Find the pads
-    c5_pad1 = None
-    u2_pad8 = None
-    u2_pad9 = None
-
-    for pad in parser.pads:
-        if pad.footprint_ref == 'C5' and pad.name == '1':
-            c5_pad1 = pad
-        elif pad.footprint_ref == 'U2' and pad.name == '8':
-            u2_pad8 = pad
-        elif pad.footprint_ref == 'U2' and pad.name == '9':
-            u2_pad9 = pad
+    c5_pad1 = pad_index.get(('C5', '1'))
+    u2_pad8 = pad_index.get(('U2', '8'))
+    u2_pad9 = pad_index.get(('U2', '9'))
 
     assert c5_pad1 is not None, "C5 pad 1 not found"
     assert u2_pad8 is not None, "U2 pad 8 not found"
     assert u2_pad9 is not None, "U2 pad 9 not found"
 
-    print(f"\nC5 pad 1: ({c5_pad1.x}, {c5_pad1.y}), net={c5_pad1.net_id} ({parser.nets.get(c5_pad1.net_id)})")
-    print(f"U2 pad 8: ({u2_pad8.x}, {u2_pad8.y}), net={u2_pad8.net_id} ({parser.nets.get(u2_pad8.net_id)})")
-    print(f"U2 pad 9: ({u2_pad9.x}, {u2_pad9.y}), net={u2_pad9.net_id} ({parser.nets.get(u2_pad9.net_id)})")
-    print(f"U2 pad 9 size: {u2_pad9.width} x {u2_pad9.height}, angle={u2_pad9.angle}")
+    logger.debug("C5 pad 1: (%s, %s), net=%s (%s)",
+                 c5_pad1.x, c5_pad1.y, c5_pad1.net_id, parser.nets.get(c5_pad1.net_id))
+    logger.debug("U2 pad 8: (%s, %s), net=%s (%s)",
+                 u2_pad8.x, u2_pad8.y, u2_pad8.net_id, parser.nets.get(u2_pad8.net_id))
+    logger.debug("U2 pad 9: (%s, %s), net=%s (%s)",
+                 u2_pad9.x, u2_pad9.y, u2_pad9.net_id, parser.nets.get(u2_pad9.net_id))
+    logger.debug("U2 pad 9 size: %s x %s, angle=%s", u2_pad9.width, u2_pad9.height, u2_pad9.angle)
 
     # Route from C5 to U2 pad 8 (both GND)
     path = router.route(
@@ -120,7 +136,7 @@ def test_route_c5_to_u2_pad8_avoids_u2_pad9():
     )
 
     assert path, "Route should be found"
-    print(f"\nRoute has {len(path)} waypoints")
+    logger.debug("Route has %s waypoints", len(path))
 
     trace_radius = 0.125  # Half of 0.25mm trace
     clearance = 0.2
@@ -129,16 +145,20 @@ def test_route_c5_to_u2_pad8_avoids_u2_pad9():
     min_clearance = float('inf')
     violation_segment = None
 
+    # The whole path in pad 9's frame, in one transform
+    pad9_frame = _rect_local_frame(
+        u2_pad9.x, u2_pad9.y, u2_pad9.width, u2_pad9.height, u2_pad9.angle
+    )
+    local = _to_rect_frame(path, pad9_frame).tolist()
+    half_w, half_h = pad9_frame[4:]
+
     for i in range(len(path) - 1):
         x1, y1 = path[i]
         x2, y2 = path[i + 1]
 
         # Distance from segment to pad 9's actual geometry
-        dist_to_pad_edge = segment_to_rotated_rect_min_distance(
-            x1, y1, x2, y2,
-            u2_pad9.x, u2_pad9.y,
-            u2_pad9.width, u2_pad9.height,
-            u2_pad9.angle
+        dist_to_pad_edge = segment_to_box_distance(
+            *local[i], *local[i + 1], half_w, half_h
         )
 
         # Actual clearance = distance to pad edge - trace radius
@@ -148,13 +168,13 @@ def test_route_c5_to_u2_pad8_avoids_u2_pad9():
             min_clearance = actual_clearance
             violation_segment = (i, x1, y1, x2, y2, dist_to_pad_edge)
 
-    print(f"\nMinimum clearance to U2 pad 9 (actual rotated geometry): {min_clearance:.4f}mm")
-    print(f"Required clearance: {clearance:.4f}mm")
+    logger.debug("Minimum clearance to U2 pad 9 (actual rotated geometry): %.4fmm", min_clearance)
+    logger.debug("Required clearance: %.4fmm", clearance)
 
     if violation_segment:
         i, x1, y1, x2, y2, dist = violation_segment
-        print(f"Closest segment {i}: ({x1:.3f},{y1:.3f}) to ({x2:.3f},{y2:.3f})")
-        print(f"  Distance to pad edge: {dist:.4f}mm")
+        logger.debug("Closest segment %s: (%.3f,%.3f) to (%.3f,%.3f)", i, x1, y1, x2, y2)
+        logger.debug("  Distance to pad edge: %.4fmm", dist)
 
     # Check that minimum clearance is at least the required clearance
     # Allow small tolerance (0.01mm = 10um) for grid discretization effects
@@ -6,24 +6,9 @@ away from hull boundaries, ensuring proper clearance to obstacles.
 import pytest
 import math
 
-from backend.pcb.parser import PCBParser
-from backend.routing.hull_map import HullMap
 from backend.routing.walkaround import WalkaroundRouter
 from backend.routing.hulls import Point, LineChain
 from backend.routing.geometry import GeometryChecker
-from backend.config import DEFAULT_PCB_FILE
-
-
-@pytest.fixture
-def parser():
-    """Load the test PCB."""
-    return PCBParser(DEFAULT_PCB_FILE)
-
-
-@pytest.fixture
-def hull_map(parser):
-    """Create hull map for F.Cu layer."""
-    return HullMap(parser, 'F.Cu', clearance=0.2)
 
 
 class TestWalkaroundVertexOffset:
@@ -158,7 +143,7 @@ class TestWalkaroundEdgeOffset:
 class TestWalkaroundClearance:
     """Tests for clearance during walkaround routing."""
 
-    def test_j4_pad1_clearance(self, parser, hull_map):
+    def test_j4_pad1_clearance(self, hull_map, pad_index):
         """
         Regression test: Route near J4 pad 1 maintains clearance.
 
@@ -167,11 +152,7 @@ class TestWalkaroundClearance:
         vertex offset direction calculation.
         """
         # Find J4 pad 1
-        j4_pad1 = None
-        for pad in parser.pads:
-            if pad.footprint_ref == 'J4' and pad.name == '1':
-                j4_pad1 = pad
-                break
+        j4_pad1 = pad_index.get(('J4', '1'))
 
         assert j4_pad1 is not None, "J4 pad 1 not found"
 
@@ -205,18 +186,14 @@ class TestWalkaroundClearance:
                 f"actual={actual_clearance:.3f}mm, required={required_clearance}mm"
             )
 
-    def test_route_around_rotated_pad_all_directions(self, parser, hull_map):
+    def test_route_around_rotated_pad_all_directions(self, hull_map, pad_index):
         """
         Test routing around a rotated pad from all directions.
 
         Routes should maintain clearance regardless of approach angle.
         """
         # Find J4 pad 1 (rotated roundrect)
-        j4_pad1 = None
-        for pad in parser.pads:
-            if pad.footprint_ref == 'J4' and pad.name == '1':
-                j4_pad1 = pad
-                break
+        j4_pad1 = pad_index.get(('J4', '1'))
 
         assert j4_pad1 is not None
 